@@ -0,0 +1,10 @@
+"""
+数据源解析器基准测试
+
+payloads: 合成的上游响应数据，按 realistic / extreme 两档规模生成
+parsers: 对各数据源的纯 Python 解析函数计时并统计内存分配
+
+用法:
+    python -m external_api.benchmarks.parsers --size realistic --output before.json
+    python -m external_api.benchmarks.parsers --size extreme --baseline before.json
+"""
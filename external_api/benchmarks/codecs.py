@@ -0,0 +1,87 @@
+"""
+JSON 解码器基准测试
+
+对每个数据源的典型响应体，比较原来的解码路径(aiohttp response.json(): 先解码为文本再 json.loads)
+和各个已安装解码器直接解码字节的耗时。
+
+用法:
+    python -m external_api.benchmarks.codecs [--size realistic|extreme] [--repeat N]
+"""
+
+import argparse
+import json
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+from external_api.benchmarks import payloads
+from external_api.data_sources.codec import available_codecs, get_decoder
+
+
+def response_bodies(size: Dict[str, int]) -> Dict[str, bytes]:
+    """Raw response bodies as the proxy returns them, keyed by source method"""
+    documents: Dict[str, Any] = {
+        "booking.search_hotel_details": {
+            "status": True,
+            "message": "Success",
+            "data": payloads.hotel_detail(size["hotel_rooms"], size["room_photos"]),
+        },
+        "booking.search_flights": {"status": True, "data": {"flightOffers": payloads.flight_offers(size["flight_offers"])}},
+        "twitter.search_tweets": {"results": payloads.tweets(size["tweets"]), "continuation_token": "DAACCgACGQ"},
+        "tripadvisor.get_location_reviews": payloads.reviews(size["reviews"]),
+        "tripadvisor.get_location_details": payloads.location_details(size["ancestors"]),
+        "pinterest.search_pins": payloads.pins(size["pins"]),
+        "yahoo_finance.get_stock_price": {"chart": {"result": [payloads.chart(size["bars"])], "error": None}},
+        "yahoo_finance.get_financial_data": payloads.financial_data(size["statements"]),
+    }
+    return {name: json.dumps(document, ensure_ascii=False).encode("utf-8") for name, document in documents.items()}
+
+
+def _time(decode: Callable[[], Any], repeat: int) -> float:
+    decode()  # warm up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        decode()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def run(size_name: str = "realistic", repeat: int = 20) -> Dict[str, Dict[str, Any]]:
+    """
+    Returns:
+        Dict[str, Dict[str, Any]]: Per source method, the body size and median decode time in ms of the
+            old text path ("aiohttp") and each available codec
+    """
+    results = {}
+    for name, body in response_bodies(payloads.SIZES[size_name]).items():
+        result: Dict[str, Any] = {"kb": round(len(body) / 1024, 1)}
+        result["aiohttp"] = round(_time(lambda: json.loads(body.strip().decode("utf-8")), repeat) * 1000, 3)
+        for codec in available_codecs():
+            decoder = get_decoder(codec)
+            result[codec] = round(_time(lambda: decoder(body.strip()), repeat) * 1000, 3)
+        results[name] = result
+    return results
+
+
+def report(results: Dict[str, Dict[str, Any]]) -> str:
+    columns: List[str] = ["aiohttp"] + available_codecs()
+    lines = [f"{'source method':<36}{'KB':>10}" + "".join(f"{column + ' ms':>16}" for column in columns) + f"{'speedup':>10}"]
+    for name, result in results.items():
+        best = min(result[codec] for codec in available_codecs())
+        speedup = result["aiohttp"] / best if best else 0.0
+        cells = "".join(f"{result[column]:>16}" for column in columns)
+        lines.append(f"{name:<36}{result['kb']:>10}{cells}{speedup:>9.1f}x")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark JSON decoding of source responses")
+    parser.add_argument("--size", choices=sorted(payloads.SIZES), default="realistic")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    print(report(run(args.size, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
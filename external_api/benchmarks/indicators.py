@@ -0,0 +1,163 @@
+"""
+技术指标基准测试
+
+比较在 get_stock_price 默认输出(每根K线一个字典)上用 Python 循环逐个股票计算指标的常见写法，
+和 indicators 模块在列式K线上对所有股票一起向量化计算的耗时，并校验两者结果一致。
+
+用法:
+    python -m external_api.benchmarks.indicators [--symbols N] [--bars N] [--repeat N]
+"""
+
+import argparse
+import math
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from external_api.benchmarks import payloads
+from external_api.data_sources.client import config
+from external_api.data_sources.indicators import compute_indicators
+from external_api.data_sources.price_bars import price_arrays
+from external_api.data_sources.yahoo_source import YahooFinanceSource
+
+INDICATORS = ("sma_20", "sma_50", "ema_12", "ema_26", "rsi_14", "returns_1", "volatility_20")
+
+
+def _loop_sma(closes: List[float], window: int) -> List[Optional[float]]:
+    return [sum(closes[i - window + 1 : i + 1]) / window if i >= window - 1 else None for i in range(len(closes))]
+
+
+def _loop_ema(closes: List[float], span: int) -> List[float]:
+    alpha = 2 / (span + 1)
+    values = []
+    for close in closes:
+        values.append(close if not values else alpha * close + (1 - alpha) * values[-1])
+    return values
+
+
+def _loop_rsi(closes: List[float], period: int) -> List[Optional[float]]:
+    values: List[Optional[float]] = [None]
+    average_gain = average_loss = 0.0
+    for i in range(1, len(closes)):
+        change = closes[i] - closes[i - 1]
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        if i == 1:
+            average_gain, average_loss = gain, loss
+        else:
+            average_gain += (gain - average_gain) / period
+            average_loss += (loss - average_loss) / period
+        if i < period:
+            values.append(None)
+        elif average_loss == 0:
+            values.append(100.0)
+        else:
+            values.append(100 - 100 / (1 + average_gain / average_loss))
+    return values
+
+
+def _loop_volatility(closes: List[float], window: int) -> List[Optional[float]]:
+    log_returns = [None] + [math.log(closes[i] / closes[i - 1]) for i in range(1, len(closes))]
+    values: List[Optional[float]] = []
+    for i in range(len(closes)):
+        if i < window:
+            values.append(None)
+            continue
+        sample = log_returns[i - window + 1 : i + 1]
+        mean = sum(sample) / window
+        values.append(math.sqrt(sum((value - mean) ** 2 for value in sample) / (window - 1)))
+    return values
+
+
+def loop_indicators(bars: List[Dict[str, Any]]) -> Dict[str, List[Optional[float]]]:
+    """Indicators of one symbol computed the ad-hoc way, over the dict bars of get_stock_price"""
+    closes = [bar["close"] for bar in bars if bar["close"] is not None]
+    return {
+        "sma_20": _loop_sma(closes, 20),
+        "sma_50": _loop_sma(closes, 50),
+        "ema_12": _loop_ema(closes, 12),
+        "ema_26": _loop_ema(closes, 26),
+        "rsi_14": _loop_rsi(closes, 14),
+        "returns_1": [None] + [closes[i] / closes[i - 1] - 1 for i in range(1, len(closes))],
+        "volatility_20": _loop_volatility(closes, 20),
+    }
+
+
+def _time(run: Callable[[], Any], repeat: int) -> float:
+    run()  # warm up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def run(symbols: int = 50, bars: int = 2520, repeat: int = 5) -> Dict[str, Any]:
+    """
+    Returns:
+        Dict[str, Any]: Median ms of the loop and vectorized paths (each with and without building the
+            bars from the response), the speedup and the largest difference between their results
+    """
+    source = YahooFinanceSource(config)
+    charts = {f"S{seed}": payloads.chart(bars, seed=seed) for seed in range(symbols)}
+    dict_bars = {symbol: source._parse_price_bars(chart) for symbol, chart in charts.items()}
+    columns = {symbol: price_arrays(chart) for symbol, chart in charts.items()}
+
+    loop_ms = _time(lambda: {symbol: loop_indicators(prices) for symbol, prices in dict_bars.items()}, repeat) * 1000
+    vector_ms = _time(lambda: compute_indicators(columns, INDICATORS), repeat) * 1000
+    loop_total_ms = _time(
+        lambda: {symbol: loop_indicators(source._parse_price_bars(chart)) for symbol, chart in charts.items()}, repeat
+    ) * 1000
+    vector_total_ms = _time(
+        lambda: compute_indicators({symbol: price_arrays(chart) for symbol, chart in charts.items()}, INDICATORS), repeat
+    ) * 1000
+
+    expected = {symbol: loop_indicators(prices) for symbol, prices in dict_bars.items()}
+    actual = compute_indicators(columns, INDICATORS)
+    max_difference = 0.0
+    for symbol, indicators in expected.items():
+        for name, values in indicators.items():
+            reference = np.array([np.nan if value is None else value for value in values])
+            computed = actual[symbol][name]
+            # 循环写法的 EMA 从第一个值开始，向量化结果相同; 只比较两边都有值的位置
+            both = ~np.isnan(reference) & ~np.isnan(computed)
+            if both.any():
+                max_difference = max(max_difference, float(np.max(np.abs(reference[both] - computed[both]))))
+    return {
+        "symbols": symbols,
+        "bars": bars,
+        "loop_ms": round(loop_ms, 3),
+        "vectorized_ms": round(vector_ms, 3),
+        "speedup": round(loop_ms / vector_ms, 1) if vector_ms else 0.0,
+        "loop_with_parse_ms": round(loop_total_ms, 3),
+        "vectorized_with_parse_ms": round(vector_total_ms, 3),
+        "speedup_with_parse": round(loop_total_ms / vector_total_ms, 1) if vector_total_ms else 0.0,
+        "max_difference": max_difference,
+    }
+
+
+def report(result: Dict[str, Any]) -> str:
+    lines = [f"{result['symbols']} symbols x {result['bars']} bars, indicators: {', '.join(INDICATORS)}"]
+    lines.append(f"{'path':<28}{'loop ms':>14}{'vectorized ms':>18}{'speedup':>10}")
+    lines.append(f"{'indicators only':<28}{result['loop_ms']:>14}{result['vectorized_ms']:>18}{result['speedup']:>9}x")
+    lines.append(
+        f"{'parse + indicators':<28}{result['loop_with_parse_ms']:>14}"
+        f"{result['vectorized_with_parse_ms']:>18}{result['speedup_with_parse']:>9}x"
+    )
+    lines.append(f"max difference between results: {result['max_difference']:.3g}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark loop-based against vectorized technical indicators")
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--bars", type=int, default=2520, help="Bars per symbol, default about 10 years of daily bars")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    print(report(run(args.symbols, args.bars, args.repeat)))
+
+
+if __name__ == "__main__":
+    main()
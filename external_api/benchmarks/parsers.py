@@ -0,0 +1,247 @@
+"""
+解析器基准测试
+
+对每个解析器记录:
+- 耗时: 多次运行的最小值和中位数(time.perf_counter)
+- 内存: 单次运行的峰值分配和结果对象保留的内存(tracemalloc)
+
+用法:
+    python -m external_api.benchmarks.parsers [--size realistic|extreme] [--repeat N] [--case NAME ...]
+                                              [--output result.json] [--baseline result.json]
+"""
+
+import argparse
+import contextlib
+import gc
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from external_api.benchmarks import payloads
+from external_api.data_sources.booking_source import BookingSource
+from external_api.data_sources.client import config
+from external_api.data_sources.pinterest_source import PinterestSource
+from external_api.data_sources.price_bars import parse_price_columns
+from external_api.data_sources.projection import Projection, use_projection
+from external_api.data_sources.records import Tweet
+from external_api.data_sources.tripadvisor_source import TripAdvisorSource
+from external_api.data_sources.twitter_source import TwitterSource
+from external_api.data_sources.yahoo_source import YahooFinanceSource
+
+
+class ParserCase:
+    """One parser under benchmark
+
+    Args:
+        name: Case name, e.g. "booking.hotel_detail"
+        source_class: Data source owning the parser, instantiated with the client config
+        build_payload: Creates the synthetic input from a SIZES entry
+        run: Calls the parser on the payload
+    """
+
+    def __init__(
+        self,
+        name: str,
+        source_class: type,
+        build_payload: Callable[[Dict[str, int]], Any],
+        run: Callable[[Any, Any], Any],
+    ):
+        self.name = name
+        self.source_class = source_class
+        self.build_payload = build_payload
+        self.run = run
+
+
+def _projected(fields: List[str], parse: Callable[[Any], Any], payload: Any) -> Any:
+    """Run a parser the way a source method called with fields= does: projection-aware parse, then prune"""
+    projection = Projection.parse(fields)
+    with use_projection(projection):
+        return projection.apply(parse(payload))  # type: ignore[union-attr]
+
+
+CASES: List[ParserCase] = [
+    ParserCase(
+        "booking.hotel_detail",
+        BookingSource,
+        lambda size: payloads.hotel_detail(size["hotel_rooms"], size["room_photos"]),
+        lambda source, payload: source._parse_hotel_detail(payload),
+    ),
+    ParserCase(
+        "booking.hotel_detail[fields]",
+        BookingSource,
+        lambda size: payloads.hotel_detail(size["hotel_rooms"], size["room_photos"]),
+        lambda source, payload: _projected(
+            ["data.hotel_name", "data.rating", "data.rooms.*.description"], source._parse_hotel_detail, payload
+        ),
+    ),
+    ParserCase(
+        "booking.flight_offers",
+        BookingSource,
+        lambda size: payloads.flight_offers(size["flight_offers"]),
+        lambda source, payload: source._parse_flight_offers(payload),
+    ),
+    ParserCase(
+        "twitter.tweets",
+        TwitterSource,
+        lambda size: payloads.tweets(size["tweets"]),
+        lambda source, payload: [source._parse_tweet_with_ref(result) for result in payload],
+    ),
+    ParserCase(
+        "twitter.tweets[fields]",
+        TwitterSource,
+        lambda size: payloads.tweets(size["tweets"]),
+        lambda source, payload: [
+            source._parse_tweet_with_ref(result, Projection.parse(["id", "text", "created_at"])) for result in payload
+        ],
+    ),
+    ParserCase(
+        "twitter.tweets[records]",
+        TwitterSource,
+        lambda size: payloads.tweets(size["tweets"]),
+        lambda source, payload: [Tweet.from_dict(source._parse_tweet_with_ref(result)) for result in payload],
+    ),
+    ParserCase(
+        "tripadvisor.reviews",
+        TripAdvisorSource,
+        lambda size: payloads.reviews(size["reviews"]),
+        lambda source, payload: source._parse_reviews(payload),
+    ),
+    ParserCase(
+        "tripadvisor.location_details",
+        TripAdvisorSource,
+        lambda size: payloads.location_details(size["ancestors"]),
+        lambda source, payload: source._parse_location_details(payload),
+    ),
+    ParserCase(
+        "pinterest.pins",
+        PinterestSource,
+        lambda size: payloads.pins(size["pins"]),
+        lambda source, payload: source._parse_pins(payload),
+    ),
+    ParserCase(
+        "pinterest.pins[records]",
+        PinterestSource,
+        lambda size: payloads.pins(size["pins"]),
+        lambda source, payload: source._parse_pins(payload, True),
+    ),
+    ParserCase(
+        "yahoo.price_bars",
+        YahooFinanceSource,
+        lambda size: payloads.chart(size["bars"]),
+        lambda source, payload: source._parse_price_bars(payload),
+    ),
+    ParserCase(
+        "yahoo.price_bars[records]",
+        YahooFinanceSource,
+        lambda size: payloads.chart(size["bars"]),
+        lambda source, payload: source._parse_price_bars(payload, True),
+    ),
+    ParserCase(
+        "yahoo.price_bars[numpy]",
+        YahooFinanceSource,
+        lambda size: payloads.chart(size["bars"]),
+        lambda source, payload: parse_price_columns(payload, "numpy"),
+    ),
+    ParserCase(
+        "yahoo.price_bars[pandas]",
+        YahooFinanceSource,
+        lambda size: payloads.chart(size["bars"]),
+        lambda source, payload: parse_price_columns(payload, "pandas"),
+    ),
+]
+
+
+def measure(case: ParserCase, size: Dict[str, int], repeat: int) -> Dict[str, Any]:
+    """Benchmark one parser
+
+    Returns:
+        Dict[str, Any]: min_ms, median_ms, peak_kb (peak allocation during one run) and
+            retained_kb (memory still held by the parsed result)
+    """
+    source = case.source_class(config)
+    payload = case.build_payload(size)
+
+    # 部分解析器会打印调试信息，输出到 devnull 以保留格式化开销但不刷屏
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        case.run(source, payload)  # warm up
+
+        timings = []
+        for _ in range(repeat):
+            gc.collect()
+            started = time.perf_counter()
+            case.run(source, payload)
+            timings.append(time.perf_counter() - started)
+
+        gc.collect()
+        tracemalloc.start()
+        try:
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            result = case.run(source, payload)
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del result
+
+    return {
+        "min_ms": round(min(timings) * 1000, 3),
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "peak_kb": round((peak - before) / 1024, 1),
+        "retained_kb": round((current - before) / 1024, 1),
+    }
+
+
+def run(size_name: str = "realistic", repeat: int = 10, names: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """Benchmark all (or the named) parsers at one payload size"""
+    size = payloads.SIZES[size_name]
+    results = {}
+    for case in CASES:
+        if names and case.name not in names:
+            continue
+        results[case.name] = measure(case, size, repeat)
+    return results
+
+
+def _format_change(value: float, baseline: Optional[float]) -> str:
+    if not baseline:
+        return ""
+    return f" ({(value - baseline) / baseline * 100:+.1f}%)"
+
+
+def report(results: Dict[str, Dict[str, Any]], baseline: Optional[Dict[str, Dict[str, Any]]] = None) -> str:
+    lines = [f"{'parser':<32}{'min ms':>22}{'median ms':>22}{'peak KB':>24}{'retained KB':>24}"]
+    for name, result in results.items():
+        base = (baseline or {}).get(name, {})
+        cells = [
+            f"{result[key]}{_format_change(result[key], base.get(key))}"
+            for key in ("min_ms", "median_ms", "peak_kb", "retained_kb")
+        ]
+        lines.append(f"{name:<32}{cells[0]:>22}{cells[1]:>22}{cells[2]:>24}{cells[3]:>24}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark data source parsers on synthetic payloads")
+    parser.add_argument("--size", choices=sorted(payloads.SIZES), default="realistic")
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--case", action="append", dest="cases", help="Only run the named case, can be repeated")
+    parser.add_argument("--output", help="Write results as JSON")
+    parser.add_argument("--baseline", help="Compare against a previous --output file")
+    args = parser.parse_args()
+
+    results = run(args.size, args.repeat, args.cases)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+    print(report(results, baseline))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"size": args.size, "repeat": args.repeat, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
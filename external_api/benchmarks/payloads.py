@@ -0,0 +1,378 @@
+"""
+合成上游响应数据
+
+结构与各数据源实际收到的 JSON 一致，只包含解析器会读取的字段和少量常见的无关字段。
+同一个 seed 生成的数据完全相同，便于前后对比。
+"""
+
+import random
+import string
+from typing import Any, Dict, List
+
+# 每个 payload 在两档规模下的主要尺寸参数
+SIZES: Dict[str, Dict[str, int]] = {
+    "realistic": {
+        "hotel_rooms": 20,
+        "room_photos": 15,
+        "flight_offers": 15,
+        "tweets": 20,
+        "reviews": 10,
+        "ancestors": 4,
+        "pins": 25,
+        "bars": 250,
+        "statements": 4,
+    },
+    "extreme": {
+        "hotel_rooms": 300,
+        "room_photos": 60,
+        "flight_offers": 500,
+        "tweets": 1000,
+        "reviews": 500,
+        "ancestors": 50,
+        "pins": 1000,
+        "bars": 100_000,
+        "statements": 200,
+    },
+}
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 9))) for _ in range(words))
+
+
+def _twitter_date(rng: random.Random) -> str:
+    return f"Thu Mar {rng.randint(10, 28)} {rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d} +0000 2025"
+
+
+def _iso_date(rng: random.Random, millis: bool = False) -> str:
+    base = f"2025-04-{rng.randint(10, 28)}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:{rng.randint(0, 59):02d}"
+    return base + (".206Z" if millis else "Z")
+
+
+def hotel_detail(rooms: int, photos_per_room: int, seed: int = 0) -> Dict[str, Any]:
+    """Booking getHotelDetails `data` object"""
+    rng = random.Random(seed)
+    return {
+        "hotel_id": 1234567,
+        "hotel_name": "Synthetic Grand Hotel",
+        "url": "https://www.booking.com/hotel/xx/synthetic.html",
+        "review_nr": 4321,
+        "raw_data": {"reviewScore": 8.7},
+        "arrival_date": "2025-05-01",
+        "departure_date": "2025-05-03",
+        "latitude": 31.23,
+        "longitude": 121.47,
+        "address": _text(rng, 6),
+        "city": "Shanghai",
+        "district": "Huangpu",
+        "countrycode": "cn",
+        "country_trans": "China",
+        "currency_code": "CNY",
+        "zip": "200001",
+        "timezone": "Asia/Shanghai",
+        "soldout": 0,
+        "available_rooms": rooms,
+        "max_rooms_in_reservation": 10,
+        "average_room_size_for_ufi_m2": "32",
+        "is_family_friendly": 1,
+        "is_closed": 0,
+        "is_cash_accepted_check_enabled": 0,
+        "hotel_include_breakfast": 1,
+        "family_facilities": ["Family rooms", "Kids club"],
+        "facilities_block": {"facilities": [{"name": _text(rng, 2), "icon": "wifi"} for _ in range(30)]},
+        "spoken_languages": ["en-gb", "zh-cn", "ja"],
+        "hotel_important_information_with_codes": [{"phrase": _text(rng, 20), "sequence": i} for i in range(8)],
+        "rooms": {
+            str(1_000_000 + i): {
+                "photos": [
+                    {
+                        "url_max1280": "" if j % 7 == 0 else f"https://cf.bstatic.com/max1280/{i}_{j}.jpg",
+                        "url_original": f"https://cf.bstatic.com/original/{i}_{j}.jpg",
+                        "url_square60": f"https://cf.bstatic.com/square60/{i}_{j}.jpg",
+                        "photo_id": i * 1000 + j,
+                    }
+                    for j in range(photos_per_room)
+                ],
+                "children_and_beds_text": {
+                    "allow_children": 1,
+                    "age_intervals": [{"text": _text(rng, 8)}, {"text": ""}],
+                    "children_at_the_property": [{"text": _text(rng, 12)}],
+                },
+                "description": _text(rng, 60),
+                "bed_configurations": [
+                    {"bed_types": [{"name_with_count": "1 large double bed", "description": "151-180 cm wide", "count": 1}]}
+                    for _ in range(2)
+                ],
+                "facilities": [{"name": _text(rng, 2)} for _ in range(20)],
+            }
+            for i in range(rooms)
+        },
+    }
+
+
+def flight_offers(offers: int, legs_per_segment: int = 2, seed: int = 0) -> List[Dict[str, Any]]:
+    """Booking searchFlights `data.flightOffers` list, round trips"""
+    rng = random.Random(seed)
+
+    def leg() -> Dict[str, Any]:
+        return {
+            "flightInfo": {"carrierInfo": {"marketingCarrier": "CA"}, "flightNumber": rng.randint(100, 9999)},
+            "flightStops": [{"airport": "SHA"}] if rng.random() < 0.2 else [],
+            "departureAirport": {"code": "PEK", "name": _text(rng, 3)},
+            "arrivalAirport": {"code": "CAN", "name": _text(rng, 3)},
+            "departureTime": _iso_date(rng)[:-1],
+            "arrivalTime": _iso_date(rng)[:-1],
+            "totalTime": rng.randint(3600, 20000),
+        }
+
+    return [
+        {
+            "segments": [{"legs": [leg() for _ in range(legs_per_segment)]} for _ in range(2)],
+            "priceBreakdown": {"total": {"currencyCode": "CNY", "units": rng.randint(500, 20000), "nanos": rng.randint(0, 999_999_999)}},
+            "token": "".join(rng.choices(string.ascii_letters, k=120)),
+        }
+        for _ in range(offers)
+    ]
+
+
+def _twitter_user(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "user_id": rng.randint(10**9, 10**10),
+        "username": _text(rng, 1),
+        "name": _text(rng, 2),
+        "creation_date": _twitter_date(rng),
+        "description": _text(rng, 15),
+        "location": _text(rng, 2),
+        "external_url": "https://example.com",
+        "profile_pic_url": "https://pbs.twimg.com/profile.jpg",
+        "profile_banner_url": "https://pbs.twimg.com/banner.jpg",
+        "follower_count": rng.randint(0, 10**6),
+        "following_count": rng.randint(0, 5000),
+        "number_of_tweets": rng.randint(0, 10**5),
+        "listed_count": rng.randint(0, 100),
+        "favourites_count": rng.randint(0, 10**5),
+        "is_verified": False,
+        "is_blue_verified": rng.random() < 0.3,
+        "is_private": False,
+        "bot": False,
+    }
+
+
+def _tweet(rng: random.Random) -> Dict[str, Any]:
+    return {
+        "tweet_id": str(rng.randint(10**17, 10**18)),
+        "creation_date": _twitter_date(rng),
+        "text": _text(rng, 35),
+        "language": "en",
+        "media_url": [f"https://pbs.twimg.com/media/{rng.randint(0, 10**6)}.jpg"] if rng.random() < 0.3 else None,
+        "video_url": None,
+        "retweet_count": rng.randint(0, 1000),
+        "reply_count": rng.randint(0, 1000),
+        "favorite_count": rng.randint(0, 10000),
+        "quote_count": rng.randint(0, 100),
+        "views": rng.randint(0, 10**6),
+        "bookmark_count": rng.randint(0, 100),
+        "user": _twitter_user(rng),
+    }
+
+
+def tweets(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Twitter search `results` list, mixing plain tweets, replies, retweets and quotes"""
+    rng = random.Random(seed)
+    results = []
+    for i in range(count):
+        tweet = _tweet(rng)
+        kind = i % 4
+        if kind == 1:
+            tweet["in_reply_to_status_id"] = str(rng.randint(10**17, 10**18))
+        elif kind == 2:
+            tweet["retweet_tweet_id"] = str(rng.randint(10**17, 10**18))
+            tweet["retweet_status"] = _tweet(rng)
+            if rng.random() < 0.5:
+                tweet["retweet_status"]["quoted_status"] = _tweet(rng)
+        elif kind == 3:
+            tweet["quoted_status_id"] = str(rng.randint(10**17, 10**18))
+            tweet["quoted_status"] = _tweet(rng)
+        results.append(tweet)
+    return results
+
+
+def reviews(count: int, seed: int = 0) -> Dict[str, Any]:
+    """TripAdvisor location reviews response"""
+    rng = random.Random(seed)
+    return {
+        "data": [
+            {
+                "id": rng.randint(10**8, 10**9),
+                "lang": "en",
+                "location_id": 13189438,
+                "published_date": _iso_date(rng),
+                "rating": rng.randint(1, 5),
+                "helpful_votes": rng.randint(0, 50),
+                "url": "https://www.tripadvisor.com/ShowUserReviews",
+                "text": _text(rng, 120),
+                "title": _text(rng, 6),
+                "trip_type": "Couples",
+                "travel_date": "2025-03-31",
+                "user": {"username": _text(rng, 1), "avatar": {"original": "https://media.tacdn.com/avatar.jpg", "small": "x"}},
+                "subratings": {
+                    str(k): {"name": f"rate_{k}", "value": rng.randint(1, 5), "localized_name": _text(rng, 1)} for k in range(6)
+                },
+                "owner_response": {
+                    "id": rng.randint(10**8, 10**9),
+                    "title": "Owner response",
+                    "text": _text(rng, 60),
+                    "lang": "en",
+                    "author": _text(rng, 2),
+                    "published_date": _iso_date(rng),
+                },
+            }
+            for _ in range(count)
+        ]
+    }
+
+
+def location_details(ancestors: int, seed: int = 0) -> Dict[str, Any]:
+    """TripAdvisor location details response"""
+    rng = random.Random(seed)
+    return {
+        "location_id": "13189438",
+        "name": "Synthetic Resort",
+        "description": _text(rng, 150),
+        "web_url": "https://www.tripadvisor.com/Hotel_Review",
+        "address_obj": {
+            "street1": _text(rng, 3),
+            "city": "Zhuhai",
+            "state": "Guangdong",
+            "country": "China",
+            "postalcode": "519000",
+            "address_string": _text(rng, 8),
+        },
+        "ancestors": [{"level": "City", "name": _text(rng, 1), "location_id": str(i)} for i in range(ancestors)],
+        "latitude": "22.08",
+        "longitude": "113.49",
+        "timezone": "Asia/Shanghai",
+        "phone": "+86 756 000 0000",
+        "ranking_data": {
+            "geo_location_id": "297415",
+            "ranking_string": "#1 of 300 hotels",
+            "geo_location_name": "Zhuhai",
+            "ranking_out_of": "300",
+            "ranking": "1",
+        },
+        "rating": "4.5",
+        "num_reviews": "2345",
+        "review_rating_count": {str(k): str(rng.randint(0, 1000)) for k in range(1, 6)},
+        "subratings": {str(k): {"name": f"rate_{k}", "localized_name": _text(rng, 1), "value": "4.5"} for k in range(ancestors)},
+        "photo_count": "1200",
+        "see_all_photos": "https://www.tripadvisor.com/Hotel_Review#photos",
+        "price_level": "$$$",
+        "amenities": [_text(rng, 2) for _ in range(ancestors * 10)],
+        "category": {"name": "hotel", "localized_name": "Hotel"},
+        "subcategory": [{"name": _text(rng, 1), "localized_name": _text(rng, 1)} for _ in range(ancestors)],
+        "styles": ["Family Resort", "Business"],
+        "neighborhood_info": [],
+        "trip_types": [{"name": f"type_{k}", "localized_name": _text(rng, 1), "value": str(rng.randint(0, 500))} for k in range(ancestors)],
+        "awards": [{"award_type": "Travellers Choice", "year": str(2020 + k % 5)} for k in range(ancestors)],
+    }
+
+
+def pins(count: int, seed: int = 0) -> Dict[str, Any]:
+    """Pinterest search response"""
+    rng = random.Random(seed)
+    data = []
+    for i in range(count):
+        pin: Dict[str, Any] = {
+            "id": str(rng.randint(10**15, 10**16)),
+            "title": _text(rng, 5),
+            "description": _text(rng, 30),
+            "alt_text": _text(rng, 8),
+            "auto_alt_text": _text(rng, 10),
+            "images": {
+                "orig": {"url": f"https://i.pinimg.com/originals/{i}.jpg", "width": 1000, "height": 1500},
+                "236x": {"url": f"https://i.pinimg.com/236x/{i}.jpg", "width": 236, "height": 354},
+            },
+            "reaction_counts": {"1": rng.randint(0, 5000)},
+            "pinner": {
+                "id": str(rng.randint(10**15, 10**16)),
+                "image_large_url": "https://i.pinimg.com/user.jpg",
+                "follower_count": rng.randint(0, 10**5),
+                "username": _text(rng, 1),
+                "full_name": _text(rng, 2),
+            },
+        }
+        if i % 5 == 0:
+            pin["videos"] = {
+                "video_list": {
+                    "V_HLSV4": {"url": f"https://v.pinimg.com/{i}.m3u8", "duration": rng.randint(1000, 60000)},
+                    "V_720P": {"url": f"https://v.pinimg.com/{i}.mp4", "duration": rng.randint(1000, 60000)},
+                }
+            }
+        data.append(pin)
+    return {"data": data}
+
+
+def chart(bars: int, seed: int = 0) -> Dict[str, Any]:
+    """Yahoo Finance get-chart `chart.result[0]` object with daily bars"""
+    rng = random.Random(seed)
+    start = 1_500_000_000
+    price = 100.0
+    opens, highs, lows, closes, volumes = [], [], [], [], []
+    for _ in range(bars):
+        price = max(price * (1 + rng.gauss(0, 0.01)), 1.0)
+        opens.append(round(price * (1 + rng.gauss(0, 0.002)), 4))
+        highs.append(round(price * 1.01, 4))
+        lows.append(round(price * 0.99, 4))
+        closes.append(round(price, 4))
+        volumes.append(rng.randint(10**5, 10**8))
+    return {
+        "meta": {"symbol": "SYN", "currency": "USD", "exchangeName": "NMS"},
+        "timestamp": [start + i * 86400 for i in range(bars)],
+        "indicators": {
+            "quote": [{"open": opens, "high": highs, "low": lows, "close": closes, "volume": volumes}],
+            "adjclose": [{"adjclose": closes}],
+        },
+    }
+
+
+def _yahoo_value(rng: random.Random, scale: float) -> Dict[str, Any]:
+    raw = round(rng.uniform(-0.1, 1.0) * scale, 4)
+    return {"raw": raw, "fmt": f"{raw:.2f}", "longFmt": f"{raw:,.2f}"}
+
+
+_FINANCIAL_FIELDS = [
+    ("currentPrice", 300), ("targetLowPrice", 300), ("targetHighPrice", 300), ("targetMeanPrice", 300),
+    ("targetMedianPrice", 300), ("recommendationMean", 5), ("numberOfAnalystOpinions", 50), ("totalCash", 1e11),
+    ("totalCashPerShare", 10), ("totalDebt", 1e11), ("debtToEquity", 200), ("currentRatio", 2), ("quickRatio", 2),
+    ("grossMargins", 1), ("operatingMargins", 1), ("profitMargins", 1), ("ebitdaMargins", 1), ("revenueGrowth", 1),
+    ("earningsGrowth", 1), ("returnOnAssets", 1), ("returnOnEquity", 1), ("operatingCashflow", 1e11), ("freeCashflow", 1e11),
+]
+
+_STATEMENT_FIELDS = [
+    "totalRevenue", "costOfRevenue", "grossProfit", "researchDevelopment", "sellingGeneralAdministrative",
+    "totalOperatingExpenses", "operatingIncome", "interestExpense", "incomeBeforeTax", "incomeTaxExpense",
+    "netIncome", "netIncomeApplicableToCommonShares", "ebit", "totalOtherIncomeExpenseNet",
+]
+
+
+def financial_data(statements: int, seed: int = 0) -> Dict[str, Any]:
+    """Yahoo Finance get-fundamentals response with financialData and quarterly income statements"""
+    rng = random.Random(seed)
+    financial = {name: _yahoo_value(rng, scale) for name, scale in _FINANCIAL_FIELDS}
+    financial["recommendationKey"] = "buy"
+    financial["financialCurrency"] = "USD"
+    history = [
+        {"endDate": {"raw": 1_700_000_000 - i * 7_776_000, "fmt": "2023-11-14"}, **{name: _yahoo_value(rng, 1e11) for name in _STATEMENT_FIELDS}}
+        for i in range(statements)
+    ]
+    return {
+        "quoteSummary": {
+            "result": [
+                {
+                    "financialData": financial,
+                    "incomeStatementHistoryQuarterly": {"incomeStatementHistory": history, "maxAge": 86400},
+                }
+            ],
+            "error": None,
+        }
+    }
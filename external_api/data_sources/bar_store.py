@@ -0,0 +1,197 @@
+"""
+本地增量K线存储
+
+get_stock_price 经常对同一批股票反复请求相互重叠的时间范围，每次都整段重新拉取。
+开启后，每个 (股票, 间隔) 的K线以列式 .npz 文件保存在本地，同时记录已经拉取过的时间区间:
+
+- 请求的范围已完整覆盖时直接从本地返回，不发请求
+- 否则只拉取缺失的区间，合并进存储后再返回
+- 最近一个间隔内的K线可能仍在变化，不计入已覆盖区间，下次请求时重新拉取
+- 只存储日内和日线间隔(周/月线的最后一根会随时间变化)，不带 events 的请求
+
+写入时先写临时文件再原子替换，并用文件锁串行化同一文件的合并，多个进程可以共用一个目录。
+上游的历史价格会因拆股被调整，需要时用 invalidate() 删除对应股票的存储。
+"""
+
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import numpy as np
+
+from .price_bars import PRICE_FIELDS
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger("data_sources_bar_store")
+
+# 支持本地存储的间隔及其秒数
+INTERVAL_SECONDS = {
+    "1m": 60,
+    "2m": 120,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "60m": 3600,
+    "90m": 5400,
+    "1h": 3600,
+    "1d": 86400,
+}
+
+
+def _subtract(start: int, end: int, covered: np.ndarray) -> List[Tuple[int, int]]:
+    """Parts of [start, end) not covered by the sorted, disjoint [start, end) rows of covered"""
+    gaps = []
+    cursor = start
+    for covered_start, covered_end in covered.tolist():
+        if covered_end <= cursor:
+            continue
+        if covered_start >= end:
+            break
+        if covered_start > cursor:
+            gaps.append((cursor, covered_start))
+        cursor = max(cursor, covered_end)
+        if cursor >= end:
+            break
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def _union(covered: np.ndarray, start: int, end: int) -> np.ndarray:
+    """Add [start, end) to sorted, disjoint intervals, merging overlapping and adjacent ones"""
+    intervals = sorted(covered.tolist() + [[start, end]])
+    merged: List[List[int]] = []
+    for interval_start, interval_end in intervals:
+        if merged and interval_start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], interval_end)
+        else:
+            merged.append([interval_start, interval_end])
+    return np.asarray(merged, dtype=np.int64).reshape(-1, 2)
+
+
+class BarStore:
+    """Per (symbol, interval) OHLCV files with the time ranges already fetched"""
+
+    def __init__(self):
+        self.enabled = False
+        self.directory = os.path.join(tempfile.gettempdir(), "external_api_bars")
+        self._lock = threading.Lock()
+        self._local_hits = 0
+        self._partial_hits = 0
+        self._misses = 0
+        self._fetched_gaps = 0
+
+    def configure(self, enabled: Optional[bool] = None, directory: Optional[str] = None) -> None:
+        """
+        Args:
+            enabled: Turn the store on or off
+            directory: Root directory of the bar files, shared by all processes
+        """
+        if directory is not None:
+            self.directory = directory
+        if enabled is not None:
+            self.enabled = enabled
+
+    def supports(self, interval: str, events: str = "") -> bool:
+        return self.enabled and interval in INTERVAL_SECONDS and not events
+
+    def _path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.directory, interval, quote(symbol, safe="") + ".npz")
+
+    def _load(self, path: str) -> Dict[str, np.ndarray]:
+        try:
+            with np.load(path) as data:
+                return {name: data[name] for name in data.files}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            # 文件损坏时当作空存储，下次合并时覆盖
+            logger.warning(f"K线存储读取失败，将重新拉取: {path}, {type(e).__name__}: {str(e)}")
+        empty = {field: np.empty(0, dtype=np.float64) for field in PRICE_FIELDS}
+        return {"timestamp": np.empty(0, dtype=np.int64), "covered": np.empty((0, 2), dtype=np.int64), **empty}
+
+    def missing(self, symbol: str, interval: str, start: int, end: int) -> List[Tuple[int, int]]:
+        """Ranges [start, end) of unix seconds that still have to be fetched"""
+        gaps = _subtract(start, end, self._load(self._path(symbol, interval))["covered"])
+        with self._lock:
+            if not gaps:
+                self._local_hits += 1
+            elif gaps == [(start, end)]:
+                self._misses += 1
+            else:
+                self._partial_hits += 1
+        return gaps
+
+    def merge(self, symbol: str, interval: str, columns: Dict[str, np.ndarray], start: int, end: int, covered_end: int) -> None:
+        """
+        Merge bars fetched for [start, end) into the store
+
+        Args:
+            columns: Fetched columns with timestamp and the quote fields (see price_bars.price_arrays)
+            start: Start of the fetched range
+            end: End of the fetched range, stored bars in [start, end) are replaced
+            covered_end: End of the part of the range that is final, at most end
+        """
+        path = self._path(symbol, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + ".lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            stored = self._load(path)
+            timestamps = stored["timestamp"]
+            fetched = columns["timestamp"]
+            # 新拉取的K线覆盖该区间内原有的K线，以及时间戳相同的K线
+            keep = ((timestamps < start) | (timestamps >= end)) & ~np.isin(timestamps, fetched)
+            merged_timestamps = np.concatenate([timestamps[keep], fetched])
+            order = np.argsort(merged_timestamps, kind="stable")
+            data = {"timestamp": merged_timestamps[order]}
+            for field in PRICE_FIELDS:
+                data[field] = np.concatenate([stored[field][keep], columns[field]])[order]
+            data["covered"] = _union(stored["covered"], start, covered_end) if covered_end > start else stored["covered"]
+            fd, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".npz")
+            try:
+                with os.fdopen(fd, "wb") as file:
+                    np.savez(file, **data)
+                os.replace(temporary, path)
+            except BaseException:
+                os.unlink(temporary)
+                raise
+        with self._lock:
+            self._fetched_gaps += 1
+
+    def read(self, symbol: str, interval: str, start: int, end: int) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """Stored timestamps in [start, end) and the matching quote field arrays"""
+        stored = self._load(self._path(symbol, interval))
+        timestamps = stored["timestamp"]
+        lo, hi = np.searchsorted(timestamps, [start, end])
+        return timestamps[lo:hi], {field: stored[field][lo:hi] for field in PRICE_FIELDS}
+
+    def invalidate(self, symbol: str, interval: Optional[str] = None) -> None:
+        """Delete the stored bars of a symbol, for one interval or all of them"""
+        for name in [interval] if interval else list(INTERVAL_SECONDS):
+            try:
+                os.remove(self._path(symbol, name))
+            except FileNotFoundError:
+                pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "directory": self.directory,
+                "local_hits": self._local_hits,
+                "partial_hits": self._partial_hits,
+                "misses": self._misses,
+                "fetched_gaps": self._fetched_gaps,
+            }
+
+
+# 全局K线存储
+bar_store = BarStore()
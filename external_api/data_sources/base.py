@@ -4,19 +4,122 @@
 类的继承关系:
 BaseApi (基类)
 """
+import asyncio
+import functools
 import inspect
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 import os
 
+import aiohttp
+
+from .cache import response_cache
+from .circuit_breaker import breakers
+from .codec import json_codec
+from .concurrency import limiters
+from .hedging import hedger
+from .offload import offloader
+from .projection import Projection, use_projection
+from .replay import recorder
+from .streaming import JsonValueStream, json_stream
+from .tracing import tracer
+
+
+def _project_result(result: Any, projection: Optional[Projection]) -> Any:
+    if projection is None or not isinstance(result, dict) or not result.get("success") or "data" not in result:
+        return result
+    return {**result, "data": projection.apply(result["data"])}
+
 
 EXCLUDE_METHODS = ['get_capabilities', 'get_api_info', 'source_name', 'get_source_info']
 
+
+def _wrap_source_method(method_name: str, func: Callable) -> Callable:
+    """
+    包装数据源的公开异步方法，统一接入调用追踪和 fields 字段裁剪
+    """
+    accepts_fields = "fields" in inspect.signature(func).parameters
+
+    @functools.wraps(func)
+    async def wrapper(self: "BaseAPI", *args: Any, **kwargs: Any) -> Any:
+        fields = kwargs.get("fields") if accepts_fields else kwargs.pop("fields", None)
+        projection = Projection.parse(fields)
+        with tracer.call(self.source_name, method_name) as trace, use_projection(projection):
+            if trace is None:
+                return _project_result(await func(self, *args, **kwargs), projection)
+            try:
+                result = await func(self, *args, **kwargs)
+            except BaseException as e:
+                tracer.emit(trace, False, f"{type(e).__name__}: {str(e)}")
+                raise
+            if isinstance(result, dict):
+                tracer.emit(trace, result.get("success"), result.get("error"))
+            else:
+                tracer.emit(trace, None)
+            return _project_result(result, projection)
+
+    if not accepts_fields:
+        # 对外的签名里加上 fields 参数，方便调用方和文档工具发现
+        signature = inspect.signature(func)
+        parameters = list(signature.parameters.values())
+        fields_parameter = inspect.Parameter(
+            "fields", inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Optional[List[str]]
+        )
+        position = len(parameters)
+        if parameters and parameters[-1].kind is inspect.Parameter.VAR_KEYWORD:
+            position -= 1
+        parameters.insert(position, fields_parameter)
+        wrapper.__signature__ = signature.replace(parameters=parameters)  # type: ignore[attr-defined]
+
+    wrapper.__source_method__ = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+def _check_content_type(response: aiohttp.ClientResponse, content_type: Optional[str]) -> None:
+    """
+    校验响应的 Content-Type，规则与 aiohttp 的 response.json() 一致
+    """
+    if content_type:
+        ctype = response.headers.get(aiohttp.hdrs.CONTENT_TYPE, "").lower()
+        mimetype = ctype.split(";")[0].strip()
+        if content_type == "application/json":
+            expected = mimetype == content_type or (mimetype.startswith("application/") and mimetype.endswith("+json"))
+        else:
+            expected = content_type in ctype
+        if not expected:
+            raise aiohttp.ContentTypeError(
+                response.request_info,
+                response.history,
+                status=response.status,
+                message=f"Attempt to decode JSON with unexpected mimetype: {ctype}",
+                headers=response.headers,
+            )
+
+
+def _decode_json(response: aiohttp.ClientResponse, body: bytes, content_type: Optional[str]) -> Any:
+    """
+    用全局 JSON 解码器解码已读取的响应体
+    """
+    _check_content_type(response, content_type)
+    return json_codec.loads_body(body, response.charset)
+
+
 class BaseAPI(ABC):
     """
     数据源基类
     所有数据源都需要继承此类并实现相关方法
+    公开的异步方法会被自动包装，接入调用追踪等通用能力
     """
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        for attr_name, attr in list(vars(cls).items()):
+            if attr_name.startswith('_') or attr_name in EXCLUDE_METHODS:
+                continue
+            if inspect.iscoroutinefunction(attr) and not getattr(attr, "__source_method__", False):
+                setattr(cls, attr_name, _wrap_source_method(attr_name, attr))
+
     @abstractmethod
     def __init__(self, config: Dict[str, Any]):
         """
@@ -82,4 +185,202 @@ class BaseAPI(ABC):
                         "doc": doc  # 完整的文档字符串
                     }
                     capabilities.append(capability)
-        return capabilities
\ No newline at end of file
+        return capabilities
+
+    async def _fetch_json(
+        self,
+        operation: str,
+        http_method: str,
+        url: str,
+        *,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        data: Any = None,
+        timeout: Optional[float] = None,
+        content_type: Optional[str] = "application/json",
+        hedge: bool = False,
+        parse: Optional[str] = None,
+        parse_args: Tuple[Any, ...] = (),
+    ) -> Any:
+        """
+        发送请求并解析JSON响应，所有数据源的HTTP请求都经过这里
+
+        Args:
+            operation: 调用方的方法名，用于熔断器等按方法区分的统计
+            http_method: HTTP方法, GET/POST
+            url: 请求地址
+            headers: 请求头
+            params: 查询参数
+            json: JSON请求体
+            data: 原始请求体
+            timeout: 超时时间(秒)
+            content_type: 期望的响应Content-Type, None表示不校验
+            hedge: 是否启用对冲请求，仅用于幂等请求: 超过历史延迟分位数仍未返回时再发一个相同请求，先返回者胜出
+            parse: 解析方法名，方法签名为 (document, *parse_args)；响应体较大且开启了进程池解析时，
+                解码和解析都在工作进程中完成
+            parse_args: 传给解析方法的额外参数，需要可以pickle
+
+        Returns:
+            Any: 解析后的JSON数据，指定了 parse 时为解析方法的返回值
+
+        Raises:
+            CircuitOpenError: 熔断器打开时快速失败(aiohttp.ClientError的子类)
+            asyncio.TimeoutError: 请求超时
+            aiohttp.ClientError: 请求失败
+        """
+
+        ttl = response_cache.ttl_for(self.source_name, operation)
+        cache_key = response_cache.key(http_method, url, headers, params, json if json is not None else data) if ttl > 0 else None
+        if cache_key is not None:
+            # SQLite 读取(以及首次使用时的建连和建表)放到线程里，不阻塞事件循环
+            cached = await asyncio.to_thread(response_cache.get, cache_key)
+            if cached is not None:
+                if parse is not None:
+                    return await offloader.run(self, parse, cached[0], *parse_args, charset=cached[1])
+                return json_codec.loads_body(*cached)
+        # 校验通过的响应体和字符集，写入缓存用
+        fetched: List[Tuple[bytes, Optional[str]]] = []
+
+        async def attempt() -> Any:
+            async with limiters.slot(url, headers):
+                return await send()
+
+        async def send() -> Any:
+            with tracer.request(http_method, url) as request_trace:
+                async with aiohttp.ClientSession(trust_env=True, trace_configs=tracer.trace_configs()) as session:
+                    async with session.request(
+                        http_method,
+                        url,
+                        headers=headers,
+                        params=params,
+                        json=json,
+                        data=data,
+                        timeout=timeout,
+                        trace_request_ctx=request_trace,
+                    ) as response:
+                        response.raise_for_status()
+                        started = time.perf_counter()
+                        body = await response.read()
+                        downloaded = time.perf_counter()
+                        if recorder.enabled:
+                            recorder.record(
+                                self.source_name,
+                                operation,
+                                getattr(self, "proxy_url", ""),
+                                http_method,
+                                url,
+                                headers,
+                                params,
+                                json if json is not None else data,
+                                response.status,
+                                response.headers.get("Content-Type", ""),
+                                body,
+                            )
+                        if request_trace is not None:
+                            request_trace.bytes = len(body)
+                            request_trace.download = downloaded - started
+                        if parse is not None:
+                            _check_content_type(response, content_type)
+                            fetched.append((body, response.charset))
+                            return body, response.charset
+                        result = _decode_json(response, body, content_type)
+                        fetched.append((body, response.charset))
+                        if request_trace is not None:
+                            request_trace.decode = time.perf_counter() - downloaded
+                        return result
+
+        with breakers.get(self.source_name, operation).guard():
+            if hedge:
+                result = await hedger.call(self.source_name, operation, attempt)
+            else:
+                result = await attempt()
+        if cache_key is not None and fetched:
+            # 对冲请求时以先返回的为准
+            await asyncio.to_thread(response_cache.put, cache_key, *fetched[0], ttl)
+        if parse is not None:
+            body, charset = result
+            return await offloader.run(self, parse, body, *parse_args, charset=charset)
+        return result
+
+    async def _stream_json(
+        self,
+        operation: str,
+        http_method: str,
+        url: str,
+        consume: Callable[[JsonValueStream], Awaitable[Any]],
+        selectors: Sequence[str],
+        *,
+        exclude: Sequence[str] = (),
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+        content_type: Optional[str] = "application/json",
+    ) -> Any:
+        """
+        发送请求并流式解析JSON响应，边下载边解析，只构建选择器命中的部分
+
+        Args:
+            operation: 调用方的方法名，用于熔断器等按方法区分的统计
+            http_method: HTTP方法, GET/POST
+            url: 请求地址
+            consume: 消费 (path, value) 流并返回结果的协程函数，在响应关闭前执行
+            selectors: 需要构建的值的路径，语法见 streaming 模块
+            exclude: 命中选择器但不整体构建、只向下展开的路径
+            headers: 请求头
+            params: 查询参数
+            timeout: 超时时间(秒)
+            content_type: 期望的响应Content-Type, None表示不校验
+
+        Returns:
+            Any: consume 的返回值
+
+        Raises:
+            CircuitOpenError: 熔断器打开时快速失败(aiohttp.ClientError的子类)
+            asyncio.TimeoutError: 请求超时
+            aiohttp.ClientError: 请求失败
+        """
+        ttl = response_cache.ttl_for(self.source_name, operation)
+        cache_key = response_cache.key(http_method, url, headers, params, None) if ttl > 0 else None
+        if cache_key is not None:
+            cached = await asyncio.to_thread(response_cache.get, cache_key)
+            if cached is not None:
+                return await consume(JsonValueStream.from_document(json_codec.loads_body(*cached), selectors, exclude))
+        with breakers.get(self.source_name, operation).guard():
+            async with limiters.slot(url, headers):
+                with tracer.request(http_method, url) as request_trace:
+                    async with aiohttp.ClientSession(trust_env=True, trace_configs=tracer.trace_configs()) as session:
+                        async with session.request(
+                            http_method, url, headers=headers, params=params, timeout=timeout, trace_request_ctx=request_trace
+                        ) as response:
+                            response.raise_for_status()
+                            _check_content_type(response, content_type)
+                            started = time.perf_counter()
+                            if recorder.enabled or cache_key is not None or not json_stream.should_stream(response.content_length):
+                                # 小响应直接整体解码更快; 录制和缓存时也需要完整响应体
+                                body = await response.read()
+                                if recorder.enabled:
+                                    recorder.record(
+                                        self.source_name,
+                                        operation,
+                                        getattr(self, "proxy_url", ""),
+                                        http_method,
+                                        url,
+                                        headers,
+                                        params,
+                                        None,
+                                        response.status,
+                                        response.headers.get("Content-Type", ""),
+                                        body,
+                                    )
+                                stream = JsonValueStream.from_document(_decode_json(response, body, None), selectors, exclude)
+                                if cache_key is not None:
+                                    await asyncio.to_thread(response_cache.put, cache_key, body, response.charset, ttl)
+                            else:
+                                stream = JsonValueStream(response.content, selectors, exclude, response.charset)
+                            result = await consume(stream)
+                            if request_trace is not None:
+                                # 下载和解析交错进行，合计记为下载耗时
+                                request_trace.bytes = stream.bytes_read or response.content_length
+                                request_trace.download = time.perf_counter() - started
+                            return result
@@ -5,11 +5,14 @@ Booking.com flight search data source implementation
 import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import aiohttp
 
 from .base import BaseAPI
+from .pagination import Paginator
+from .projection import Projection, Pruned, child, current_projection, prune, wants
+from .streaming import JsonValueStream, json_stream
 
 logger = logging.getLogger("booking_source")
 
@@ -160,11 +163,9 @@ class BookingSource(BaseAPI):
 
             # Send request
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
-                    async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                        # Check response status
-                        response.raise_for_status()
-                        data = await response.json()
+                data = await self._fetch_json(
+                    "search_flights", "GET", request_url, headers=self.headers, params=params, timeout=self._timeout
+                )
 
             except asyncio.TimeoutError:
                 error_msg = f"Request timeout (timeout={self._timeout}s)"
@@ -186,46 +187,7 @@ class BookingSource(BaseAPI):
                 logger.error("No flight offers found")
                 return {"success": True, "data": {"flights": []}}
 
-            # Simplify response data structure
-            simplified_flights = []
-            for offer in data["data"]["flightOffers"]:
-                legs_info = []
-                stops_count = 0
-
-                total_time = 0
-                for segment in offer["segments"]:
-                    # Get flight number and stop info
-                    for leg in segment["legs"]:
-                        flight_number = f"{leg['flightInfo']['carrierInfo']['marketingCarrier']}{leg['flightInfo']['flightNumber']}"
-                        # Count stops
-                        stops_count += len(leg.get("flightStops", []))
-
-                        # Add segment info
-                        legs_info.append(
-                            {
-                                "flight_number": flight_number,
-                                "from": leg["departureAirport"]["code"],
-                                "to": leg["arrivalAirport"]["code"],
-                                "departure": leg["departureTime"],
-                                "arrival": leg["arrivalTime"],
-                                "total_time": self._format_duration(leg["totalTime"]),  # Segment flight time
-                            }
-                        )
-                        total_time += leg["totalTime"]
-                # Handle price
-                price = offer["priceBreakdown"]["total"]
-                total_amount = float(price["units"]) + float(price["nanos"]) / 1_000_000_000
-
-                simplified_flights.append(
-                    {
-                        "stops": stops_count,
-                        "segments": legs_info,
-                        "total_time": self._format_duration(total_time),
-                        "price": {"currency": price["currencyCode"], "amount": total_amount},
-                    }
-                )
-
-            return {"success": True, "data": {"flights": simplified_flights}}
+            return {"success": True, "data": {"flights": self._parse_flight_offers(data["data"]["flightOffers"])}}
 
         except Exception as e:
             error_msg = f"Error occurred while searching flights: {str(e)}"
@@ -233,6 +195,121 @@ class BookingSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
+    def iter_flights(
+        self,
+        from_code: str,
+        to_code: str,
+        depart_date: str,
+        return_date: Optional[str] = None,
+        stops: str = "none",
+        adults: int = 1,
+        children: Optional[str] = None,
+        sort: str = "BEST",
+        cabin_class: str = "ECONOMY",
+        currency_code: str = "USD",
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+        state: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Paginator:
+        """
+        Iterate over flight search results across pages
+
+        The next page is requested while the current one is being processed. Use with `async for`.
+
+        Args:
+            from_code(str): Departure airport code, e.g.: PEK
+            to_code(str): Destination airport code, e.g.: CAN
+            depart_date(str): Departure date, format: YYYY-MM-DD
+            return_date(Optional[str]): Return date, format: YYYY-MM-DD (optional)
+            stops(str): Number of stops, options: none, 0, 1, 2
+            adults(int): Number of adults, default is 1
+            children(Optional[str]): Children's ages, comma separated, e.g.: 0,17 (optional)
+            sort(str): Sort method, options: BEST, CHEAPEST, FASTEST
+            cabin_class(str): Cabin class, options: ECONOMY, PREMIUM_ECONOMY, BUSINESS, FIRST
+            currency_code(str): Currency code, default USD
+            max_items(Optional[int]): Maximum number of flights to yield, default None for all pages
+            prefetch(bool): Whether to prefetch the next page, default True
+            state(Optional[Dict[str, Any]]): `paginator.state.to_dict()` of an earlier iteration to resume from
+            fields(Optional[List[str]]): Only keep these fields of each flight
+
+        Returns:
+            Paginator: Async iterator of flights in the same format as search_flights,
+                `error` is set if a page failed and `state` can be saved to resume later
+
+        Example:
+            paginator = client.booking.iter_flights(from_code="PEK", to_code="CAN", depart_date="2025-04-25", max_items=50)
+            async for flight in paginator:
+                print(flight)
+        """
+        return Paginator(
+            lambda page_no, **kwargs: self.search_flights(
+                from_code,
+                to_code,
+                depart_date,
+                return_date,
+                stops,
+                page_no or 1,
+                adults,
+                children,
+                sort,
+                cabin_class,
+                currency_code,
+                **kwargs,
+            ),
+            "flights",
+            lambda data, page_no: (page_no or 1) + 1,
+            max_items=max_items,
+            prefetch=prefetch,
+            state=state,
+            fields=fields,
+        )
+
+    def _parse_flight_offers(self, flight_offers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Flatten raw flight offers into the simplified search_flights format
+        """
+        # Simplify response data structure
+        simplified_flights = []
+        for offer in flight_offers:
+            legs_info = []
+            stops_count = 0
+
+            total_time = 0
+            for segment in offer["segments"]:
+                # Get flight number and stop info
+                for leg in segment["legs"]:
+                    flight_number = f"{leg['flightInfo']['carrierInfo']['marketingCarrier']}{leg['flightInfo']['flightNumber']}"
+                    # Count stops
+                    stops_count += len(leg.get("flightStops", []))
+
+                    # Add segment info
+                    legs_info.append(
+                        {
+                            "flight_number": flight_number,
+                            "from": leg["departureAirport"]["code"],
+                            "to": leg["arrivalAirport"]["code"],
+                            "departure": leg["departureTime"],
+                            "arrival": leg["arrivalTime"],
+                            "total_time": self._format_duration(leg["totalTime"]),  # Segment flight time
+                        }
+                    )
+                    total_time += leg["totalTime"]
+            # Handle price
+            price = offer["priceBreakdown"]["total"]
+            total_amount = float(price["units"]) + float(price["nanos"]) / 1_000_000_000
+
+            simplified_flights.append(
+                {
+                    "stops": stops_count,
+                    "segments": legs_info,
+                    "total_time": self._format_duration(total_time),
+                    "price": {"currency": price["currencyCode"], "amount": total_amount},
+                }
+            )
+
+        return simplified_flights
+
     async def _search_hotel_destinations(self, query: str) -> Dict[str, Any]:
         """
         Search for hotel destinations
@@ -280,11 +357,9 @@ class BookingSource(BaseAPI):
 
             # 发送请求
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
-                    async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                        # 检查响应状态
-                        response.raise_for_status()
-                        data = await response.json()
+                data = await self._fetch_json(
+                    "search_hotel_destinations", "GET", request_url, headers=self.headers, params=params, timeout=self._timeout
+                )
 
             except asyncio.TimeoutError:
                 error_msg = f"Request timeout (timeout={self._timeout}s)"
@@ -449,11 +524,9 @@ class BookingSource(BaseAPI):
 
             # 发送请求
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
-                    async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                        # 检查响应状态
-                        response.raise_for_status()
-                        data = await response.json()
+                data = await self._fetch_json(
+                    "search_hotels", "GET", request_url, headers=self.headers, params=params, timeout=self._timeout
+                )
 
             except asyncio.TimeoutError:
                 error_msg = f"Request timeout (timeout={self._timeout}s)"
@@ -767,11 +840,32 @@ class BookingSource(BaseAPI):
             request_url = f"{self.proxy_url}/api/v1/hotels/getHotelDetails"
 
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
-                    async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                        # 检查响应状态
-                        response.raise_for_status()
-                        data = await response.json()
+                if json_stream.enabled:
+                    # 流式解析，房间数据逐个解析，不在内存中保留完整响应; 未请求房间时直接跳过房间数据
+                    selectors = ["status", "message", "data.*"]
+                    if wants(child(current_projection(), "data"), "rooms"):
+                        selectors.append("data.rooms.*")
+                    result = await self._stream_json(
+                        "search_hotel_details",
+                        "GET",
+                        request_url,
+                        self._consume_hotel_details_stream,
+                        selectors,
+                        exclude=["data.rooms"],
+                        headers=self.headers,
+                        params=params,
+                        timeout=self._timeout,
+                    )
+                else:
+                    result = await self._fetch_json(
+                        "search_hotel_details",
+                        "GET",
+                        request_url,
+                        headers=self.headers,
+                        params=params,
+                        timeout=self._timeout,
+                        parse="_parse_hotel_details_response",
+                    )
 
             except asyncio.TimeoutError:
                 error_msg = f"Request timeout (timeout={self._timeout}s)"
@@ -782,72 +876,72 @@ class BookingSource(BaseAPI):
                 logger.error(error_msg)
                 return {"success": False, "error": error_msg}
 
-            # 检查API响应中是否有错误
-            if not data.get("status"):
-                error_msg = data.get("message", "Unknown error")
-                logger.error(f"API returned error: {error_msg}")
-                return {"success": False, "error": error_msg}
-
-            hotel_detail = self._parse_hotel_detail(data.get("data", {}))
-            return {"success": True, "data": hotel_detail}
+            if not result["success"]:
+                logger.error(f"API returned error: {result['error']}")
+            return result
         except Exception as e:
             error_msg = f"Error occurred while searching hotel details: {str(e)}"
             logger.error(error_msg)
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
-    def _parse_hotel_detail(self, data: Dict[str, Any]) -> Dict[str, Any]:
-        """解析酒店详情"""
-        facilities = []
-        for facility in data.get("facilities_block", {}).get("facilities", []):
-            facility_name = facility.get("name", "")
-            if len(facility_name) > 0:
-                facilities.append(facility_name)
+    def _parse_hotel_details_response(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """解析酒店详情接口的完整响应，响应较大时在解析进程池中执行"""
+        # 检查API响应中是否有错误
+        if not data.get("status"):
+            return {"success": False, "error": data.get("message", "Unknown error")}
 
-        hotel_important_information = []
-        for item in data.get("hotel_important_information_with_codes", []):
-            info = item.get("phrase", "")
-            if len(info) > 0:
-                hotel_important_information.append(info)
-
-        rooms = {}
-        for roomId, roomInfo in data.get("rooms", {}).items():
-            room = {}
-            photos_data = roomInfo.get("photos", [])
-            photos = []
-            for photo in photos_data:
-                url = photo.get("url_max1280", "")
-                if len(url) == 0:
-                    url = photo.get("url_original", "")
-                if len(url) > 0:
-                    photos.append(url)
+        hotel_detail = self._parse_hotel_detail(data.get("data", {}))
+        return {"success": True, "data": hotel_detail}
 
-            children_and_beds_text = {}
-            for key, value in roomInfo.get("children_and_beds_text", {}).items():
-                if isinstance(value, list):
-                    children_and_beds_text[key] = []
-                    for item in value:
-                        if len(item.get("text", "")) > 0:
-                            children_and_beds_text[key].append(item.get("text", ""))
-                elif isinstance(value, int):
-                    children_and_beds_text[key] = value
+    async def _consume_hotel_details_stream(self, stream: JsonValueStream) -> Dict[str, Any]:
+        """流式解析酒店详情响应，原始房间数据解析后即释放"""
+        response: Dict[str, Any] = {}
+        data: Dict[str, Any] = {}
+        rooms: Dict[str, Any] = {}
+        rooms_projection = child(current_projection(), "data", "rooms")
+        async for path, value in stream:
+            if path.startswith("data.rooms."):
+                roomId = path[len("data.rooms.") :]
+                if wants(rooms_projection, roomId):
+                    rooms[roomId] = self._parse_room(value, child(rooms_projection, roomId))
+            elif path.startswith("data."):
+                data[path[len("data.") :]] = value
+            else:
+                response[path] = value
+
+        # 检查API响应中是否有错误
+        if not response.get("status"):
+            return {"success": False, "error": response.get("message", "Unknown error")}
+
+        hotel_detail = self._parse_hotel_detail(data, rooms)
+        return {"success": True, "data": hotel_detail}
 
-            description = roomInfo.get("description", "")
+    def _parse_hotel_detail(self, data: Dict[str, Any], rooms: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """解析酒店详情，只构建通过 fields 请求的字段; rooms 为已经解析好的房间(流式解析时)"""
+        projection = child(current_projection(), "data")
 
-            bed_configurations = []
-            for bed_config in roomInfo.get("bed_configurations", []):
-                for bed_type in bed_config.get("bed_types", []):
-                    bed_name_cnt = bed_type.get("name_with_count", "")
-                    bed_desc = bed_type.get("description", "")
-                    bed_configurations.append({"name_with_count": bed_name_cnt, "description": bed_desc})
+        facilities = []
+        if wants(projection, "facilities"):
+            for facility in data.get("facilities_block", {}).get("facilities", []):
+                facility_name = facility.get("name", "")
+                if len(facility_name) > 0:
+                    facilities.append(facility_name)
 
-            room = {
-                "photos": photos,
-                "children_and_beds_text": children_and_beds_text,
-                "description": description,
-                "bed_configurations": bed_configurations,
-            }
-            rooms[roomId] = room
+        hotel_important_information = []
+        if wants(projection, "hotel_important_information"):
+            for item in data.get("hotel_important_information_with_codes", []):
+                info = item.get("phrase", "")
+                if len(info) > 0:
+                    hotel_important_information.append(info)
+
+        if rooms is None:
+            rooms = {}
+            if wants(projection, "rooms"):
+                rooms_projection = child(projection, "rooms")
+                for roomId, roomInfo in data.get("rooms", {}).items():
+                    if wants(rooms_projection, roomId):
+                        rooms[roomId] = self._parse_room(roomInfo, child(rooms_projection, roomId))
 
         hotel_detail = {
             "hotel_id": data.get("hotel_id", ""),  # 酒店 id
@@ -881,8 +975,54 @@ class BookingSource(BaseAPI):
             "hotel_important_information": hotel_important_information,
             "rooms": rooms,
         }
+        if projection is not None:
+            # 房间已按 projection 解析，其余字段在这里裁剪，方法返回后不再整体裁剪
+            hotel_detail = Pruned(
+                (key, value if key == "rooms" else prune(projection, key, value))
+                for key, value in hotel_detail.items()
+                if projection.wants(key)
+            )
         return {"success": True, "data": hotel_detail}
 
+    def _parse_room(self, roomInfo: Dict[str, Any], projection: Optional[Projection] = None) -> Dict[str, Any]:
+        """解析单个房间信息，只构建 projection 请求的字段"""
+        room: Dict[str, Any] = {}
+        if wants(projection, "photos"):
+            photos = []
+            for photo in roomInfo.get("photos", []):
+                url = photo.get("url_max1280", "")
+                if len(url) == 0:
+                    url = photo.get("url_original", "")
+                if len(url) > 0:
+                    photos.append(url)
+            room["photos"] = photos
+
+        if wants(projection, "children_and_beds_text"):
+            children_and_beds_text = {}
+            for key, value in roomInfo.get("children_and_beds_text", {}).items():
+                if isinstance(value, list):
+                    children_and_beds_text[key] = []
+                    for item in value:
+                        if len(item.get("text", "")) > 0:
+                            children_and_beds_text[key].append(item.get("text", ""))
+                elif isinstance(value, int):
+                    children_and_beds_text[key] = value
+            room["children_and_beds_text"] = prune(projection, "children_and_beds_text", children_and_beds_text)
+
+        if wants(projection, "description"):
+            room["description"] = roomInfo.get("description", "")
+
+        if wants(projection, "bed_configurations"):
+            bed_configurations = []
+            for bed_config in roomInfo.get("bed_configurations", []):
+                for bed_type in bed_config.get("bed_types", []):
+                    bed_name_cnt = bed_type.get("name_with_count", "")
+                    bed_desc = bed_type.get("description", "")
+                    bed_configurations.append({"name_with_count": bed_name_cnt, "description": bed_desc})
+            room["bed_configurations"] = prune(projection, "bed_configurations", bed_configurations)
+
+        return room
+
     def _format_duration(self, seconds: int) -> str:
         """Convert seconds to hours and minutes format"""
         hours = seconds // 3600
@@ -0,0 +1,224 @@
+"""
+跨进程共享的响应缓存
+
+同一台机器上的多个进程各自有一个 ApiClient 单例，相同的数据会被各自重复请求。
+开启后，所有数据源经过 BaseAPI._fetch_json/_stream_json 的响应原始字节保存到一个 SQLite 文件(WAL 模式)，
+所有进程共用: 读不阻塞写，多个进程可以同时读写。
+
+- 缓存键: 上游、HTTP方法、URL、查询参数和请求体(与 replay 的 fixture 键相同)，不包含鉴权等其他请求头
+- TTL: default_ttl 秒后过期，可以按数据源("yahoo_finance")或方法("yahoo_finance.get_stock_price")单独设置，0 表示不缓存
+- 容量: 定期检查，总大小超过 max_bytes 时先删除过期条目，再按写入时间删除最旧的条目
+- 缓存读写出错(磁盘满、文件损坏等)只记录日志，请求照常发出，不影响调用结果
+"""
+
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from .concurrency import upstream_of
+from .replay import request_key
+
+logger = logging.getLogger("data_sources_cache")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    charset TEXT,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    expires REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_created ON responses (created);
+CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires);
+"""
+
+
+class ResponseCache:
+    """Shared SQLite cache of raw response bodies, safe to use from several threads and processes"""
+
+    def __init__(self):
+        self.enabled = False
+        self.path = os.path.join(tempfile.gettempdir(), "external_api_cache.sqlite3")
+        self.default_ttl = 300.0
+        self.ttl: Dict[str, float] = {}
+        self.max_bytes = 256 * 1024 * 1024
+        # 每写入 evict_every 次，或写入超过容量 1/10 的数据时检查一次总大小
+        self.evict_every = 64
+        self._pending_bytes = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._puts = 0
+        self._hits = 0
+        self._misses = 0
+        self._stores = 0
+        self._evictions = 0
+        self._errors = 0
+
+    def configure(
+        self,
+        enabled: Optional[bool] = None,
+        path: Optional[str] = None,
+        default_ttl: Optional[float] = None,
+        ttl: Optional[Dict[str, float]] = None,
+        max_bytes: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            enabled: Turn the cache on or off
+            path: SQLite file shared by all processes
+            default_ttl: Seconds a response stays fresh
+            ttl: Overrides of default_ttl by "source" or "source.method", 0 disables caching
+            max_bytes: Upper bound of the total size of cached bodies
+        """
+        with self._lock:
+            if path is not None and path != self.path:
+                self.path = path
+                # 各线程在下次使用时重新连接
+                self._generation += 1
+            if default_ttl is not None:
+                self.default_ttl = default_ttl
+            if ttl is not None:
+                self.ttl = dict(ttl)
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            if enabled is not None:
+                self.enabled = enabled
+
+    def ttl_for(self, source_name: str, operation: str) -> float:
+        """Time to live of responses of a source method, 0 when they are not cached"""
+        if not self.enabled:
+            return 0.0
+        ttl = self.ttl.get(f"{source_name}.{operation}")
+        if ttl is None:
+            ttl = self.ttl.get(source_name, self.default_ttl)
+        return ttl
+
+    @staticmethod
+    def key(
+        http_method: str,
+        url: str,
+        headers: Optional[Mapping[str, str]],
+        params: Optional[Mapping[str, Any]],
+        body: Any,
+    ) -> str:
+        return request_key(upstream_of(url, dict(headers) if headers else None), http_method, url, params, body)
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is not None and self._local.generation == self._generation:
+            return connection
+        if connection is not None:
+            connection.close()
+        connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(_SCHEMA)
+        self._local.connection = connection
+        self._local.generation = self._generation
+        return connection
+
+    def _error(self, action: str, e: Exception) -> None:
+        with self._lock:
+            self._errors += 1
+        logger.warning(f"响应缓存{action}失败: {type(e).__name__}: {str(e)}")
+
+    def get(self, key: str) -> Optional[Tuple[bytes, Optional[str]]]:
+        """Fresh (body, charset) of a key, None on a miss"""
+        try:
+            row = self._connection().execute(
+                "SELECT body, charset FROM responses WHERE key = ? AND expires > ?", (key, time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            self._error("读取", e)
+            return None
+        with self._lock:
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return bytes(row[0]), row[1]
+
+    def put(self, key: str, body: bytes, charset: Optional[str], ttl: float) -> None:
+        """Store a response body for ttl seconds"""
+        if len(body) > self.max_bytes:
+            return
+        now = time.time()
+        try:
+            connection = self._connection()
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, body, charset, size, created, expires) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, body, charset, len(body), now, now + ttl),
+            )
+        except sqlite3.Error as e:
+            self._error("写入", e)
+            return
+        with self._lock:
+            self._stores += 1
+            self._puts += 1
+            self._pending_bytes += len(body)
+            evict = self._puts % self.evict_every == 0 or self._pending_bytes * 10 >= self.max_bytes
+            if evict:
+                self._pending_bytes = 0
+        if evict:
+            self.evict()
+
+    def evict(self) -> int:
+        """Drop expired entries, then the oldest ones until the total size is under max_bytes"""
+        try:
+            connection = self._connection()
+            removed = connection.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),)).rowcount
+            total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                # 删到容量的 90%，避免每次写入都触发淘汰
+                excess = total - int(self.max_bytes * 0.9)
+                cutoff = connection.execute(
+                    "SELECT created FROM (SELECT created, SUM(size) OVER (ORDER BY created) AS running FROM responses) "
+                    "WHERE running >= ? LIMIT 1",
+                    (excess,),
+                ).fetchone()
+                if cutoff is not None:
+                    removed += connection.execute("DELETE FROM responses WHERE created <= ?", (cutoff[0],)).rowcount
+        except sqlite3.Error as e:
+            self._error("淘汰", e)
+            return 0
+        with self._lock:
+            self._evictions += removed
+        return removed
+
+    def clear(self) -> None:
+        """Remove all entries, for every process sharing the file"""
+        try:
+            self._connection().execute("DELETE FROM responses")
+        except sqlite3.Error as e:
+            self._error("清空", e)
+
+    def snapshot(self) -> Dict[str, Any]:
+        entries, size = 0, 0
+        if self.enabled:
+            try:
+                entries, size = self._connection().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            except sqlite3.Error as e:
+                self._error("统计", e)
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "path": self.path,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "stores": self._stores,
+                "evictions": self._evictions,
+                "errors": self._errors,
+            }
+
+
+# 全局响应缓存
+response_cache = ResponseCache()
@@ -0,0 +1,226 @@
+"""
+数据源熔断器
+
+每个 (数据源, 方法) 对应一个熔断器:
+- CLOSED: 正常放行，连续失败/超时达到阈值后转为 OPEN
+- OPEN: 直接快速失败，冷却时间结束后转为 HALF_OPEN
+- HALF_OPEN: 只放行少量试探请求，成功则恢复 CLOSED，失败则重新 OPEN
+"""
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import aiohttp
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(aiohttp.ClientError):
+    """Raised instead of calling the upstream while the circuit is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(f"Circuit breaker open for {name}, retry after {retry_after:.1f}s")
+
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """Whether an exception means the upstream is unhealthy
+
+    Timeouts, connection errors, 5xx and 429 responses count as failures. Other 4xx
+    responses mean the upstream answered, so they do not trip the breaker.
+    """
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, asyncio.TimeoutError):
+        return True
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status >= 500 or exc.status == 429
+    return isinstance(exc, aiohttp.ClientError)
+
+
+class CircuitBreaker:
+    """Circuit breaker for a single source method"""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        """
+        Args:
+            name: Breaker name, e.g. "yahoo_finance.get_stock_price"
+            failure_threshold: Consecutive failures before the circuit opens
+            recovery_timeout: Seconds to stay open before allowing trial requests
+            half_open_max_calls: Number of concurrent trial requests while half open
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        self._total_calls = 0
+        self._total_failures = 0
+        self._total_rejected = 0
+        self._last_error: Optional[str] = None
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self) -> None:
+        if self._state == CircuitState.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_in_flight = 0
+
+    def _open(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._half_open_in_flight = 0
+
+    def acquire(self) -> bool:
+        """Reserve a call slot
+
+        Returns:
+            bool: True if the call is a half-open trial request
+
+        Raises:
+            CircuitOpenError: The circuit is open, or all trial slots are taken
+        """
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == CircuitState.OPEN:
+                self._total_rejected += 1
+                retry_after = self.recovery_timeout - (time.monotonic() - self._opened_at)
+                raise CircuitOpenError(self.name, max(retry_after, 0.0))
+            if self._state == CircuitState.HALF_OPEN:
+                if self._half_open_in_flight >= self.half_open_max_calls:
+                    self._total_rejected += 1
+                    raise CircuitOpenError(self.name, 0.0)
+                self._half_open_in_flight += 1
+                self._total_calls += 1
+                return True
+            self._total_calls += 1
+            return False
+
+    def record_success(self, trial: bool = False) -> None:
+        with self._lock:
+            if trial:
+                self._half_open_in_flight = max(self._half_open_in_flight - 1, 0)
+            self._consecutive_failures = 0
+            if self._state == CircuitState.HALF_OPEN:
+                self._state = CircuitState.CLOSED
+
+    def record_failure(self, error: Optional[BaseException] = None, trial: bool = False) -> None:
+        with self._lock:
+            if trial:
+                self._half_open_in_flight = max(self._half_open_in_flight - 1, 0)
+            self._consecutive_failures += 1
+            self._total_failures += 1
+            self._last_error = f"{type(error).__name__}: {error}" if error is not None else None
+            if self._state == CircuitState.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                self._open()
+
+    def release(self, trial: bool = False) -> None:
+        """Give back a slot without a verdict (e.g. the call was cancelled)"""
+        if not trial:
+            return
+        with self._lock:
+            self._half_open_in_flight = max(self._half_open_in_flight - 1, 0)
+
+    @contextmanager
+    def guard(self) -> Iterator[None]:
+        """Wrap one upstream call, recording its outcome
+
+        Raises:
+            CircuitOpenError: The circuit is open
+        """
+        trial = self.acquire()
+        try:
+            yield
+        except asyncio.CancelledError:
+            self.release(trial)
+            raise
+        except BaseException as e:
+            if is_upstream_failure(e):
+                self.record_failure(e, trial)
+            else:
+                self.record_success(trial)
+            raise
+        else:
+            self.record_success(trial)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the breaker state for monitoring"""
+        with self._lock:
+            self._maybe_half_open()
+            retry_after = 0.0
+            if self._state == CircuitState.OPEN:
+                retry_after = max(self.recovery_timeout - (time.monotonic() - self._opened_at), 0.0)
+            return {
+                "state": self._state.value,
+                "consecutive_failures": self._consecutive_failures,
+                "total_calls": self._total_calls,
+                "total_failures": self._total_failures,
+                "total_rejected": self._total_rejected,
+                "retry_after": round(retry_after, 3),
+                "last_error": self._last_error,
+            }
+
+
+class CircuitBreakerRegistry:
+    """All breakers, keyed by (source name, method name)"""
+
+    def __init__(self, **settings: Any):
+        self._settings: Dict[str, Any] = dict(settings)
+        self._breakers: Dict[Tuple[str, str], CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, **settings: Any) -> None:
+        """Update breaker settings, applied to new and existing breakers"""
+        with self._lock:
+            self._settings.update(settings)
+            for breaker in self._breakers.values():
+                for key, value in settings.items():
+                    setattr(breaker, key, value)
+
+    def get(self, source_name: str, method_name: str) -> CircuitBreaker:
+        key = (source_name, method_name)
+        breaker = self._breakers.get(key)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.get(key)
+                if breaker is None:
+                    breaker = CircuitBreaker(f"{source_name}.{method_name}", **self._settings)
+                    self._breakers[key] = breaker
+        return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._breakers.clear()
+
+
+# 全局熔断器注册表
+breakers = CircuitBreakerRegistry()
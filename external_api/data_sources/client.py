@@ -2,22 +2,40 @@
 统一的数据源访问客户端
 """
 
+import asyncio
 import importlib
 import inspect
 import logging
 import os
 import pkgutil
+import re
+import tempfile
 import threading
+from collections import deque
 from enum import Enum
 from pathlib import Path
-from typing import Dict
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Sequence, Tuple
 
 from docstring_parser import parse
 
+from .bar_store import bar_store
 from .base import EXCLUDE_METHODS, BaseAPI
+from .cache import response_cache
+from .circuit_breaker import breakers
+from .codec import json_codec
+from .concurrency import limiters
+from .hedging import hedger
+from .offload import offloader
+from .replay import recorder
+from .streaming import json_stream
+from .tracing import tracer
 
 # 用于在shell中设置LLM_GATEWAY_BASE_URL环境变量
 LLM_GATEWAY_BASE_URL_ENV_NAME = "LLM_GATEWAY_BASE_URL"
+# 设置后开启调用追踪，追踪记录写入该JSONL文件
+TRACE_FILE_ENV_NAME = "EXTERNAL_API_TRACE_FILE"
+# 设置后开启录制模式，代理响应作为 fixture 保存到该目录，供 replay 回放
+RECORD_DIR_ENV_NAME = "EXTERNAL_API_RECORD_DIR"
 
 logger = logging.getLogger("data_sources_client")
 
@@ -39,9 +57,76 @@ config = {
     "serper_base_url": "google.serper.dev",
     "external_api_proxy_url": get_external_api_proxy_url(),
     "timeout": 60,
+    # 响应JSON解码器: auto 表示使用已安装的最快实现(orjson > msgspec > ujson > json)
+    "json_codec": "auto",
+    # 熔断器: 连续失败/超时 failure_threshold 次后打开, recovery_timeout 秒后放行 half_open_max_calls 个试探请求
+    "circuit_breaker": {
+        "failure_threshold": 5,
+        "recovery_timeout": 30,
+        "half_open_max_calls": 1,
+    },
+    # 自适应并发(AIMD): 每个上游一个并发上限, 延迟不超过 target_latency 秒时逐步增加, 超时/5xx/429 时乘以 decrease_factor
+    # 默认关闭(并发不设上限); 开启后超出上限的请求排队，大批量并发调用同一上游时会变慢
+    "concurrency": {
+        "enabled": False,
+        "initial_limit": 16,
+        "min_limit": 1,
+        "max_limit": 256,
+        "target_latency": 5.0,
+        "decrease_factor": 0.5,
+    },
+    # 对冲请求: 仅对标记为幂等的方法生效, 超过 P{percentile} 延迟未返回时再发一个请求, 额外请求数不超过 budget_ratio
+    "hedging": {
+        "enabled": True,
+        "percentile": 95,
+        "min_samples": 20,
+        "budget_ratio": 0.1,
+    },
+    # 调用追踪: 记录每次调用的DNS/建连/首字节/下载/JSON解码/解析耗时, 默认写入JSONL文件
+    "tracing": {
+        "enabled": bool(os.getenv(TRACE_FILE_ENV_NAME)),
+        "path": os.getenv(TRACE_FILE_ENV_NAME) or "external_api_traces.jsonl",
+    },
+    # 解析进程池: 响应体不小于 threshold_bytes 时在工作进程中解码和解析(酒店详情/财务数据/K线), 避免阻塞事件循环
+    "offload": {
+        "enabled": False,
+        "threshold_bytes": 512 * 1024,
+    },
+    # 流式JSON解析: 安装了 ijson 时, 酒店详情/地点照片边下载边解析, 降低峰值内存
+    "streaming": {
+        "enabled": True,
+    },
+    # 响应缓存: 同一台机器上所有进程共用的 SQLite(WAL) 文件, 按数据源或 "数据源.方法" 设置 ttl 秒数(0 表示不缓存), 总大小不超过 max_bytes
+    "cache": {
+        "enabled": False,
+        "path": os.path.join(tempfile.gettempdir(), "external_api_cache.sqlite3"),
+        "default_ttl": 300,
+        "ttl": {},
+        "max_bytes": 256 * 1024 * 1024,
+    },
+    # K线存储: get_stock_price 的日内/日线K线按 股票/间隔 保存在本地目录, 只拉取未覆盖的时间区间, 多个进程可共用
+    "bar_store": {
+        "enabled": False,
+        "directory": os.path.join(tempfile.gettempdir(), "external_api_bars"),
+    },
+    # 录制模式: 按 数据源/方法 保存代理响应, 用 python -m external_api.data_sources.replay 离线回放
+    "recording": {
+        "enabled": bool(os.getenv(RECORD_DIR_ENV_NAME)),
+        "directory": os.getenv(RECORD_DIR_ENV_NAME) or "fixtures",
+    },
 }
 
 
+# 返回值示例中 data 对象的第一个字段
+_DATA_FIELD = re.compile(r'"data"\s*:\s*\{\s*(?:#[^\n]*\s*)?"(\w+)"')
+
+
+def _fields_example(returns: Optional[str]) -> str:
+    """Example fields value for a method, built from the first data field in its documented return value"""
+    match = _DATA_FIELD.search(returns or "")
+    return f'["{match.group(1)}"]' if match else '["<field>", "<list>.<field>"]'
+
+
 class ApiType(Enum):
     DATA_SOURCE = "data_source"
     FUNCTION = "function"
@@ -78,6 +163,16 @@ class ApiClient:
                 return
             self._sources: Dict[str, BaseAPI] = {}
             self._functions: Dict[str, BaseAPI] = {}
+            json_codec.use(config.get("json_codec", "auto"))
+            breakers.configure(**config.get("circuit_breaker", {}))
+            limiters.configure(**config.get("concurrency", {}))
+            hedger.configure(**config.get("hedging", {}))
+            tracer.configure(**config.get("tracing", {}))
+            offloader.configure(**config.get("offload", {}))
+            json_stream.configure(**config.get("streaming", {}))
+            recorder.configure(**config.get("recording", {}))
+            response_cache.configure(**config.get("cache", {}))
+            bar_store.configure(**config.get("bar_store", {}))
             self._load_data_sources()
             self._initialized = True
 
@@ -184,15 +279,24 @@ class ApiClient:
                 method_lines.append(docstring.short_description + "\n")
 
             # Add parameter description
-            if docstring.params:
+            param_lines = []
+            for param in docstring.params:
+                param_desc = f"- `{param.arg_name}`"
+                if param.type_name:
+                    param_desc += f": {param.type_name}"
+                if param.description:
+                    param_desc += f" - {param.description}"
+                param_lines.append(param_desc)
+            # 数据源方法统一支持 fields 字段裁剪
+            if getattr(method, "__source_method__", False) and all(param.arg_name != "fields" for param in docstring.params):
+                example = _fields_example(docstring.returns.description if docstring.returns else None)
+                param_lines.append(
+                    f"- `fields`: Optional[List[str]] - Only return these paths of `data`, e.g. {example}; "
+                    "`*` matches any key, lists are expanded automatically (default: all fields)"
+                )
+            if param_lines:
                 method_lines.append("**Parameters:**")
-                for param in docstring.params:
-                    param_desc = f"- `{param.arg_name}`"
-                    if param.type_name:
-                        param_desc += f": {param.type_name}"
-                    if param.description:
-                        param_desc += f" - {param.description}"
-                    method_lines.append(param_desc)
+                method_lines.extend(param_lines)
                 method_lines.append("")
 
             # Add return value description
@@ -260,6 +364,140 @@ class ApiClient:
             result.append(self.get_function_desc(function_name))
         return "\n".join(result)
 
+    async def fan_out(
+        self,
+        calls: Sequence[Tuple[str, str, Optional[Dict[str, Any]]]],
+        max_concurrency: int = 16,
+        per_source_concurrency: int = 4,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Run many data source method calls concurrently and yield results as they complete
+
+        Args:
+            calls: List of (source_name, method_name, kwargs) tuples, sources may differ,
+                e.g. [("yahoo_finance", "get_stock_info", {"symbol": "AAPL"}), ("twitter", "search_tweets", {"query": "AAPL"})]
+            max_concurrency: Maximum number of calls in flight overall
+            per_source_concurrency: Maximum number of calls in flight per data source
+
+        Returns:
+            AsyncIterator[Dict[str, Any]]: One item per call in completion order, e.g.
+            {
+                "index": 0,                     # Position of the call in `calls`
+                "source": "yahoo_finance",      # Data source name
+                "method": "get_stock_info",     # Method name
+                "result": {"success": True, "data": {...}}  # Return value of the method, failures
+                                                            # (including exceptions and unknown
+                                                            # sources/methods) are {"success": False, "error": "..."}
+            }
+        """
+        if max_concurrency < 1 or per_source_concurrency < 1:
+            raise ValueError("max_concurrency and per_source_concurrency must be positive")
+
+        # 按数据源分组排队，轮询各数据源以免单个数据源占满全局并发
+        queues: Dict[str, Deque[Tuple[int, str, Dict[str, Any]]]] = {}
+        for index, (source_name, method_name, kwargs) in enumerate(calls):
+            queues.setdefault(source_name, deque()).append((index, method_name, dict(kwargs or {})))
+        order: Deque[str] = deque(queues)
+        in_flight_per_source: Dict[str, int] = {name: 0 for name in queues}
+        tasks: Dict[asyncio.Task, Tuple[int, str, str]] = {}
+
+        def start_ready_calls() -> None:
+            blocked = 0
+            while order and len(tasks) < max_concurrency and blocked < len(order):
+                source_name = order[0]
+                order.rotate(-1)
+                if in_flight_per_source[source_name] >= per_source_concurrency:
+                    blocked += 1
+                    continue
+                blocked = 0
+                index, method_name, kwargs = queues[source_name].popleft()
+                if not queues[source_name]:
+                    order.remove(source_name)
+                in_flight_per_source[source_name] += 1
+                task = asyncio.ensure_future(self._invoke(source_name, method_name, kwargs))
+                tasks[task] = (index, source_name, method_name)
+
+        try:
+            start_ready_calls()
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index, source_name, method_name = tasks.pop(task)
+                    in_flight_per_source[source_name] -= 1
+                    yield {"index": index, "source": source_name, "method": method_name, "result": task.result()}
+                start_ready_calls()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _invoke(self, source_name: str, method_name: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Call one data source method, turning every failure into an error result"""
+        source = self._sources.get(source_name)
+        if source is None:
+            return {"success": False, "error": f"Data source {source_name} does not exist"}
+        method = getattr(source, method_name, None)
+        if method_name.startswith("_") or method is None or not inspect.iscoroutinefunction(method):
+            return {"success": False, "error": f"Data source {source_name} has no method {method_name}"}
+        try:
+            return await method(**kwargs)
+        except Exception as e:
+            logger.error(f"调用 {source_name}.{method_name} 失败: {str(e)}")
+            logger.exception(e)
+            return {"success": False, "error": f"{type(e).__name__}: {str(e)}"}
+
+    def get_circuit_breaker_states(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the circuit breaker state of every data source method that has been called
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Mapping of "source.method" to breaker state, containing
+                state (closed/open/half_open), consecutive_failures, total_calls, total_failures,
+                total_rejected, retry_after and last_error
+        """
+        return breakers.snapshot()
+
+    def get_hedging_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get hedged request statistics of every hedged data source method
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Mapping of "source.method" to requests, hedges, hedge_wins,
+                budget_exhausted, budget_tokens, hedge_delay (seconds) and samples
+        """
+        return hedger.snapshot()
+
+    def get_concurrency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the adaptive concurrency state of every upstream that has been called, empty unless config
+        "concurrency" is enabled
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Mapping of upstream host to limit, in_flight, queued, latency
+                (moving average, seconds), min_latency, target_latency, total_requests, total_failures,
+                total_decreases, total_queued and max_queue_wait
+        """
+        return limiters.snapshot()
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        Get the state of the shared response cache
+
+        Returns:
+            Dict[str, Any]: enabled, path, entries and bytes (shared by all processes), max_bytes,
+                and hits, misses, stores, evictions and errors of this process
+        """
+        return response_cache.snapshot()
+
+    def get_bar_store_stats(self) -> Dict[str, Any]:
+        """
+        Get the state of the local price bar store
+
+        Returns:
+            Dict[str, Any]: enabled, directory, and local_hits (served without requests), partial_hits,
+                misses and fetched_gaps of this process
+        """
+        return bar_store.snapshot()
+
     def __getattr__(self, name: str) -> BaseAPI:
         """
         Get data source instance by attribute access
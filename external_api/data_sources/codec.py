@@ -0,0 +1,118 @@
+"""
+JSON 解码
+
+按 orjson > msgspec > ujson > 标准库 json 的顺序选择已安装的最快解码器，
+标准库始终可用作为兜底。所有数据源的响应都通过这里解码原始字节。
+"""
+
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Union
+
+logger = logging.getLogger("data_sources_codec")
+
+Decoder = Callable[[Union[bytes, str]], Any]
+
+
+def _load_decoders() -> Dict[str, Decoder]:
+    decoders: Dict[str, Decoder] = {}
+    try:
+        import orjson
+
+        decoders["orjson"] = orjson.loads
+    except ImportError:
+        pass
+    try:
+        import msgspec
+
+        decode = msgspec.json.decode
+
+        def msgspec_loads(data: Union[bytes, str]) -> Any:
+            # msgspec.DecodeError 不是 ValueError 的子类，统一转换
+            try:
+                return decode(data)
+            except msgspec.DecodeError as e:
+                raise ValueError(str(e)) from e
+
+        decoders["msgspec"] = msgspec_loads
+    except ImportError:
+        pass
+    try:
+        import ujson
+
+        decoders["ujson"] = ujson.loads
+    except ImportError:
+        pass
+    decoders["json"] = json.loads
+    return decoders
+
+
+# 按优先级排列的可用解码器
+_DECODERS = _load_decoders()
+
+
+class JsonCodec:
+    """Decodes JSON bodies with a selectable backend"""
+
+    def __init__(self, name: str = "auto"):
+        self.name = ""
+        self._loads: Decoder = json.loads
+        self.use(name)
+
+    def use(self, name: str = "auto") -> None:
+        """
+        Select the decoder backend
+
+        Args:
+            name: "auto" for the fastest installed one, or one of available_codecs()
+
+        Raises:
+            ValueError: The named backend is not installed
+        """
+        if name == "auto":
+            name = next(iter(_DECODERS))
+        if name not in _DECODERS:
+            raise ValueError(f"JSON codec {name} is not available, options: {', '.join(available_codecs())}")
+        self.name = name
+        self._loads = _DECODERS[name]
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Decode a JSON document
+
+        Raises:
+            ValueError: Invalid JSON (msgspec errors are re-raised as ValueError)
+        """
+        return self._loads(data)
+
+    def loads_body(self, body: bytes, charset: Optional[str] = None) -> Any:
+        """
+        Decode a raw response body in its charset, None for an empty body
+
+        Raises:
+            ValueError: Invalid JSON
+        """
+        body = body.strip()
+        if not body:
+            return None
+        if not is_utf8(charset):
+            return self._loads(body.decode(charset))
+        return self._loads(body)
+
+
+def is_utf8(charset: Optional[str]) -> bool:
+    """Whether a response charset is UTF-8, a missing charset counts as UTF-8"""
+    return not charset or charset.lower().replace("-", "") == "utf8"
+
+
+def available_codecs() -> List[str]:
+    """Installed decoder backends, fastest first"""
+    return list(_DECODERS)
+
+
+def get_decoder(name: str) -> Decoder:
+    return _DECODERS[name]
+
+
+# 全局解码器
+json_codec = JsonCodec()
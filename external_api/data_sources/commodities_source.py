@@ -3,13 +3,13 @@ Commodities data source implementation
 """
 
 import asyncio
-import json
 import logging
 from typing import Any, Dict
 
 import aiohttp
 
 from .base import BaseAPI
+from .codec import json_codec
 
 logger = logging.getLogger("commodities_source")
 
@@ -78,15 +78,12 @@ class CommoditiesSource(BaseAPI):
             request_url = f"{self.proxy_url}/v1/supported"
 
             # Send request using aiohttp
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.get(request_url, headers=self._headers, timeout=self._timeout) as response:
-                    response.raise_for_status()
-
-                    # Parse the response
-                    data = await response.json(content_type=None)
+            data = await self._fetch_json(
+                "get_supported_commodities", "GET", request_url, headers=self._headers, timeout=self._timeout, content_type=None
+            )
 
             if isinstance(data, str):
-                data = json.loads(data)
+                data = json_codec.loads(data)
 
             if not isinstance(data, dict):
                 raise ValueError(f"Invalid API response format: {data}")
@@ -165,15 +162,12 @@ class CommoditiesSource(BaseAPI):
             request_url = f"{self.proxy_url}/v1/market-data"
 
             # Send request using aiohttp
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.get(request_url, headers=self._headers, params=params, timeout=self._timeout) as response:
-                    response.raise_for_status()
-
-                    # Parse the response
-                    data = await response.json(content_type=None)
+            data = await self._fetch_json(
+                "get_commodities_price", "GET", request_url, headers=self._headers, params=params, timeout=self._timeout, content_type=None
+            )
 
             if isinstance(data, str):
-                data = json.loads(data)
+                data = json_codec.loads(data)
 
             if not isinstance(data, dict):
                 raise ValueError(f"Invalid API response format: {data}")
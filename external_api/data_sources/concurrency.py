@@ -0,0 +1,227 @@
+"""
+按上游自适应的并发限制(AIMD)
+
+每个上游(代理转发的目标站点，即 X-Original-Host)一个并发上限:
+- 请求成功且延迟不超过 target_latency 时加性增加: 每个完整的并发窗口大约 +increase
+- 超时、连接错误、5xx/429 时乘性减小: limit *= decrease_factor; 同一批在途请求只减一次，避免瞬间降到最低
+- 超出上限的请求排队等待，不会被拒绝
+- 默认关闭，通过配置 concurrency.enabled 开启
+
+当前上限、在途/排队请求数和测得的延迟通过 snapshot() 暴露(ApiClient.get_concurrency_stats)。
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+from urllib.parse import urlsplit
+
+from .circuit_breaker import is_upstream_failure
+
+
+def upstream_of(url: str, headers: Optional[Dict[str, str]] = None) -> str:
+    """Name of the upstream a request goes to: the proxied host if set, otherwise the URL host"""
+    if headers:
+        host = headers.get("X-Original-Host")
+        if host:
+            return host
+    return urlsplit(url).netloc
+
+
+class AIMDLimiter:
+    """Adaptive concurrency limit of one upstream, for use from a single event loop at a time"""
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: float = 16,
+        min_limit: int = 1,
+        max_limit: int = 256,
+        target_latency: float = 5.0,
+        increase: float = 1.0,
+        decrease_factor: float = 0.5,
+        smoothing: float = 0.2,
+    ):
+        """
+        Args:
+            name: Upstream name
+            initial_limit: Concurrency limit before any feedback
+            min_limit: Lower bound of the limit
+            max_limit: Upper bound of the limit
+            target_latency: Requests slower than this (seconds) stop the limit from growing
+            increase: Additive increase per window of successful requests
+            decrease_factor: Multiplier applied to the limit on timeouts and upstream errors
+            smoothing: Weight of the newest sample in the latency moving average
+        """
+        self.name = name
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.smoothing = smoothing
+        self._limit = float(min(max(initial_limit, min_limit), max_limit))
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+        self._last_decrease = 0.0
+        self._latency: Optional[float] = None
+        self._min_latency: Optional[float] = None
+        self._total_requests = 0
+        self._total_failures = 0
+        self._total_decreases = 0
+        self._total_queued = 0
+        self._max_queue_wait = 0.0
+
+    @property
+    def limit(self) -> int:
+        return max(self.min_limit, int(self._limit))
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self._in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._in_flight += 1
+                waiter.set_result(None)
+
+    async def acquire(self) -> None:
+        """Wait for a free slot"""
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._total_queued += 1
+        queued = time.monotonic()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # 已经分到名额后才被取消，把名额还回去
+                self.release()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+        self._max_queue_wait = max(self._max_queue_wait, time.monotonic() - queued)
+
+    def release(self) -> None:
+        """Give back a slot without feedback"""
+        self._in_flight -= 1
+        self._wake_waiters()
+
+    def on_success(self, latency: float, in_flight: int) -> None:
+        with self._lock:
+            self._total_requests += 1
+            self._latency = latency if self._latency is None else self._latency + self.smoothing * (latency - self._latency)
+            self._min_latency = latency if self._min_latency is None else min(self._min_latency, latency)
+            # 只有并发真正用到上限附近时才增加，空闲时上限不会无限增长
+            if latency <= self.target_latency and in_flight * 2 >= self.limit:
+                self._limit = min(self._limit + self.increase / max(self._limit, 1.0), float(self.max_limit))
+
+    def on_failure(self, started: float) -> None:
+        with self._lock:
+            self._total_requests += 1
+            self._total_failures += 1
+            # 在上次减小之前就已发出的请求失败，反映的是旧的并发水平，不再重复减小
+            if started < self._last_decrease:
+                return
+            self._limit = max(self._limit * self.decrease_factor, float(self.min_limit))
+            self._last_decrease = time.monotonic()
+            self._total_decreases += 1
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a slot for one upstream request, feeding its latency and outcome back into the limit"""
+        await self.acquire()
+        started = time.monotonic()
+        in_flight = self._in_flight
+        try:
+            yield
+        except asyncio.CancelledError:
+            raise
+        except BaseException as e:
+            if is_upstream_failure(e):
+                self.on_failure(started)
+            else:
+                self.on_success(time.monotonic() - started, in_flight)
+            raise
+        else:
+            self.on_success(time.monotonic() - started, in_flight)
+        finally:
+            # 上限变大后会一次放行多个排队的请求
+            self.release()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "queued": len(self._waiters),
+                "latency": round(self._latency, 4) if self._latency is not None else None,
+                "min_latency": round(self._min_latency, 4) if self._min_latency is not None else None,
+                "target_latency": self.target_latency,
+                "total_requests": self._total_requests,
+                "total_failures": self._total_failures,
+                "total_decreases": self._total_decreases,
+                "total_queued": self._total_queued,
+                "max_queue_wait": round(self._max_queue_wait, 4),
+            }
+
+
+class ConcurrencyLimiterRegistry:
+    """All limiters, keyed by upstream"""
+
+    def __init__(self, enabled: bool = False, **settings: Any):
+        self.enabled = enabled
+        self._settings: Dict[str, Any] = dict(settings)
+        self._limiters: Dict[str, AIMDLimiter] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, enabled: Optional[bool] = None, **settings: Any) -> None:
+        """Update limiter settings, applied to new and existing limiters (initial_limit only to new ones)"""
+        with self._lock:
+            if enabled is not None:
+                self.enabled = enabled
+            self._settings.update(settings)
+            for limiter in self._limiters.values():
+                for key, value in settings.items():
+                    if key != "initial_limit":
+                        setattr(limiter, key, value)
+
+    def get(self, upstream: str) -> AIMDLimiter:
+        limiter = self._limiters.get(upstream)
+        if limiter is None:
+            with self._lock:
+                limiter = self._limiters.get(upstream)
+                if limiter is None:
+                    limiter = AIMDLimiter(upstream, **self._settings)
+                    self._limiters[upstream] = limiter
+        return limiter
+
+    @asynccontextmanager
+    async def slot(self, url: str, headers: Optional[Dict[str, str]] = None) -> AsyncIterator[None]:
+        """Hold a slot of the request's upstream, a no-op when disabled"""
+        if not self.enabled:
+            yield
+            return
+        async with self.get(upstream_of(url, headers)).slot():
+            yield
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            limiters = list(self._limiters.values())
+        return {limiter.name: limiter.snapshot() for limiter in limiters}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._limiters.clear()
+
+
+# 全局并发限制注册表
+limiters = ConcurrencyLimiterRegistry()
@@ -0,0 +1,212 @@
+"""
+对冲请求(hedged requests)
+
+对幂等的请求，如果在最近延迟的某个分位数(默认P95)内还没有返回，就再发一个相同的请求，
+先返回的结果胜出，另一个被取消。额外的请求数量受对冲预算限制，避免放大上游压力。
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+
+class LatencyTracker:
+    """Sliding window of recent successful request latencies"""
+
+    def __init__(self, window: int = 200):
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._samples.append(latency)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """Get the p-th percentile (0-100) of the window, None if empty"""
+        with self._lock:
+            if not self._samples:
+                return None
+            ordered = sorted(self._samples)
+        index = min(int(round(p / 100 * (len(ordered) - 1))), len(ordered) - 1)
+        return ordered[index]
+
+
+class HedgeBudget:
+    """Token bucket limiting hedges to a fraction of primary requests
+
+    Every primary request earns `ratio` tokens (up to `max_tokens`), every hedge spends one.
+    """
+
+    def __init__(self, ratio: float = 0.1, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def earn(self) -> None:
+        with self._lock:
+            self._tokens = min(self._tokens + self.ratio, self.max_tokens)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+
+class _HedgeStats:
+    def __init__(self, window: int, budget_ratio: float, max_tokens: float):
+        self.latency = LatencyTracker(window)
+        self.budget = HedgeBudget(budget_ratio, max_tokens)
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.budget_exhausted = 0
+
+
+class Hedger:
+    """Runs hedged calls and keeps per (source, method) latency and budget state"""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        percentile: float = 95.0,
+        min_samples: int = 20,
+        min_delay: float = 0.05,
+        budget_ratio: float = 0.1,
+        max_tokens: float = 10.0,
+        window: int = 200,
+    ):
+        """
+        Args:
+            enabled: Whether hedging is enabled at all
+            percentile: Latency percentile after which the hedge is fired
+            min_samples: Samples needed before hedging starts for a method
+            min_delay: Lower bound of the hedge delay in seconds
+            budget_ratio: Hedges allowed per primary request, e.g. 0.1 means at most 10% extra load
+            max_tokens: Maximum hedge tokens that can be saved up for bursts
+            window: Number of recent latencies used for the percentile
+        """
+        self.enabled = enabled
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self.budget_ratio = budget_ratio
+        self.max_tokens = max_tokens
+        self.window = window
+        self._stats: Dict[Tuple[str, str], _HedgeStats] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, **settings: Any) -> None:
+        with self._lock:
+            for key, value in settings.items():
+                if not hasattr(self, key):
+                    raise ValueError(f"Unknown hedging setting: {key}")
+                setattr(self, key, value)
+            for stats in self._stats.values():
+                stats.budget.ratio = self.budget_ratio
+                stats.budget.max_tokens = self.max_tokens
+
+    def _get_stats(self, source_name: str, method_name: str) -> _HedgeStats:
+        key = (source_name, method_name)
+        stats = self._stats.get(key)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(key, _HedgeStats(self.window, self.budget_ratio, self.max_tokens))
+        return stats
+
+    def hedge_delay(self, source_name: str, method_name: str) -> Optional[float]:
+        """Get the current hedge delay for a method, None if there is not enough data yet"""
+        stats = self._get_stats(source_name, method_name)
+        if len(stats.latency) < self.min_samples:
+            return None
+        delay = stats.latency.percentile(self.percentile)
+        return None if delay is None else max(delay, self.min_delay)
+
+    async def call(self, source_name: str, method_name: str, attempt: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `attempt`, firing a duplicate if it is slower than the tracked percentile
+
+        Args:
+            source_name: Data source name
+            method_name: Method name
+            attempt: Factory creating one request attempt; must be idempotent
+
+        Returns:
+            Any: Result of the first attempt that succeeds
+        """
+        stats = self._get_stats(source_name, method_name)
+        stats.requests += 1
+        stats.budget.earn()
+        delay = self.hedge_delay(source_name, method_name) if self.enabled else None
+
+        started = time.monotonic()
+        primary = asyncio.ensure_future(attempt())
+        if delay is None:
+            result = await primary
+            stats.latency.record(time.monotonic() - started)
+            return result
+
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay)
+            if done:
+                result = primary.result()
+                stats.latency.record(time.monotonic() - started)
+                return result
+
+            if not stats.budget.try_spend():
+                stats.budget_exhausted += 1
+                result = await primary
+                stats.latency.record(time.monotonic() - started)
+                return result
+
+            stats.hedges += 1
+            hedge = asyncio.ensure_future(attempt())
+            pending.add(hedge)
+            last_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        last_error = task.exception()
+                        continue
+                    if task is hedge:
+                        stats.hedge_wins += 1
+                    stats.latency.record(time.monotonic() - started)
+                    return task.result()
+            assert last_error is not None
+            raise last_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            items = list(self._stats.items())
+        result = {}
+        for (source_name, method_name), stats in items:
+            delay = self.hedge_delay(source_name, method_name)
+            result[f"{source_name}.{method_name}"] = {
+                "requests": stats.requests,
+                "hedges": stats.hedges,
+                "hedge_wins": stats.hedge_wins,
+                "budget_exhausted": stats.budget_exhausted,
+                "budget_tokens": round(stats.budget.tokens, 3),
+                "hedge_delay": None if delay is None else round(delay, 4),
+                "samples": len(stats.latency),
+            }
+        return result
+
+
+# 全局对冲请求管理
+hedger = Hedger()
@@ -0,0 +1,229 @@
+"""
+向量化技术指标
+
+在 get_stock_price 的列式K线(output="numpy"，见 price_bars)上计算 SMA/EMA/RSI/收益率/波动率，
+多个股票一起计算: 每个股票的收盘价序列右对齐放入同一个矩阵，按行一次性计算，结果与逐个股票计算相同。
+
+单个指标函数接受一维(一个序列)或二维(每行一个序列)数组，沿最后一维计算，前面数据不足的位置为 NaN。
+
+指标名称:
+    sma_<n>         n 根K线的简单移动平均，默认 20
+    ema_<n>         跨度为 n 的指数移动平均，默认 20
+    rsi_<n>         Wilder RSI，默认 14
+    returns_<n>     n 根K线的简单收益率，默认 1
+    log_returns_<n> n 根K线的对数收益率，默认 1
+    volatility_<n>  n 根K线对数收益率的滚动标准差(未年化)，默认 20
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_INDICATORS = ("sma_20", "sma_50", "ema_12", "ema_26", "rsi_14", "returns_1", "volatility_20")
+
+
+def _rows(values: Any) -> Tuple[np.ndarray, bool]:
+    """Values as a 2D float64 array and whether the input was 1D"""
+    array = np.asarray(values, dtype=np.float64)
+    if array.ndim == 1:
+        return array[np.newaxis, :], True
+    if array.ndim != 2:
+        raise ValueError(f"Expected a 1D or 2D array, got {array.ndim} dimensions")
+    return array, False
+
+
+def _frame(rows: np.ndarray) -> Any:
+    # pandas 导入较慢，只在使用时导入; 递推类指标(EMA/RSI)和滚动标准差用 pandas 的 C 实现
+    import pandas as pd
+
+    return pd.DataFrame(rows.T)
+
+
+def _check_window(window: int) -> None:
+    if window < 1:
+        raise ValueError(f"Window must be positive, got {window}")
+
+
+def sma(values: Any, window: int = 20) -> np.ndarray:
+    """Simple moving average over `window` values, NaN until the window is full or while it contains NaN"""
+    _check_window(window)
+    rows, flat = _rows(values)
+    valid = ~np.isnan(rows)
+    sums = np.cumsum(np.where(valid, rows, 0.0), axis=1)
+    counts = np.cumsum(valid, axis=1)
+    sums[:, window:] = sums[:, window:] - sums[:, :-window]
+    counts[:, window:] = counts[:, window:] - counts[:, :-window]
+    result = np.where(counts == window, sums / window, np.nan)
+    return result[0] if flat else result
+
+
+def ema(values: Any, span: int = 20) -> np.ndarray:
+    """Exponential moving average with alpha = 2 / (span + 1), seeded with the first value; NaN stays NaN"""
+    _check_window(span)
+    rows, flat = _rows(values)
+    result = _frame(rows).ewm(span=span, adjust=False, ignore_na=True).mean().to_numpy(copy=True).T
+    result[np.isnan(rows)] = np.nan
+    return result[0] if flat else result
+
+
+def rsi(values: Any, period: int = 14) -> np.ndarray:
+    """Wilder's relative strength index (0-100), NaN for the first `period` values"""
+    _check_window(period)
+    rows, flat = _rows(values)
+    delta = np.full_like(rows, np.nan)
+    delta[:, 1:] = np.diff(rows, axis=1)
+    gains = _frame(np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0)))
+    losses = _frame(np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0)))
+    options = {"alpha": 1.0 / period, "adjust": False, "ignore_na": True, "min_periods": period}
+    average_gain = gains.ewm(**options).mean().to_numpy(copy=True).T
+    average_loss = losses.ewm(**options).mean().to_numpy(copy=True).T
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = 100.0 - 100.0 / (1.0 + average_gain / average_loss)
+    # 没有下跌时 RSI 为 100
+    result = np.where((average_loss == 0) & ~np.isnan(average_gain), 100.0, result)
+    result[np.isnan(rows)] = np.nan
+    return result[0] if flat else result
+
+
+def returns(values: Any, periods: int = 1, log: bool = False) -> np.ndarray:
+    """Simple (or log) return over `periods` values, NaN for the first `periods` values"""
+    _check_window(periods)
+    rows, flat = _rows(values)
+    result = np.full_like(rows, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = rows[:, periods:] / rows[:, :-periods]
+        result[:, periods:] = np.log(ratio) if log else ratio - 1.0
+    return result[0] if flat else result
+
+
+def volatility(values: Any, window: int = 20, periods_per_year: Optional[int] = None) -> np.ndarray:
+    """
+    Rolling standard deviation of one-period log returns over `window` returns
+
+    Args:
+        values: Prices
+        window: Number of returns in the window
+        periods_per_year: Annualize with sqrt(periods_per_year), e.g. 252 for daily bars; None to leave as is
+    """
+    _check_window(window)
+    rows, flat = _rows(values)
+    result = _frame(returns(rows, 1, log=True)).rolling(window, min_periods=window).std().to_numpy(copy=True).T
+    if periods_per_year:
+        result = result * np.sqrt(periods_per_year)
+    return result[0] if flat else result
+
+
+_INDICATORS: Dict[str, Tuple[Callable[..., np.ndarray], int, Dict[str, Any]]] = {
+    "sma": (sma, 20, {}),
+    "ema": (ema, 20, {}),
+    "rsi": (rsi, 14, {}),
+    "returns": (returns, 1, {}),
+    "log_returns": (returns, 1, {"log": True}),
+    "volatility": (volatility, 20, {}),
+}
+
+_NAME = re.compile(r"^([a-z_]+?)(?:_(\d+))?$")
+
+
+def parse_indicator(name: str) -> Tuple[str, Callable[[np.ndarray], np.ndarray]]:
+    """
+    Resolve an indicator name such as "sma_50" or "rsi"
+
+    Returns:
+        Tuple[str, Callable]: Canonical name with the window (e.g. "rsi_14") and a function of a 2D price array
+
+    Raises:
+        ValueError: Unknown indicator or invalid window
+    """
+    match = _NAME.match(name.strip().lower())
+    if not match or match.group(1) not in _INDICATORS:
+        raise ValueError(f"Unsupported indicator: {name}, options: {', '.join(_INDICATORS)} with an optional _<window>")
+    kind, window = match.group(1), match.group(2)
+    function, default, options = _INDICATORS[kind]
+    window = int(window) if window else default
+    _check_window(window)
+    return f"{kind}_{window}", lambda rows: function(rows, window, **options)
+
+
+def pack(series: Sequence[np.ndarray]) -> np.ndarray:
+    """Right-align 1D series of different lengths into one 2D array, padding the front with NaN"""
+    length = max((len(values) for values in series), default=0)
+    rows = np.full((len(series), length), np.nan)
+    for row, values in zip(rows, series):
+        if len(values):
+            row[length - len(values) :] = values
+    return rows
+
+
+def compute_indicators(
+    prices: Dict[str, Dict[str, np.ndarray]],
+    indicators: Sequence[str] = DEFAULT_INDICATORS,
+    field: str = "close",
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Compute indicators for many symbols at once
+
+    Bars whose price is missing (NaN) are skipped, so every indicator runs over the bars that traded.
+
+    Args:
+        prices: Symbol -> columns in price_arrays layout (get_stock_price output="numpy")
+        indicators: Indicator names, see module docstring
+        field: Price column the indicators are computed on
+
+    Returns:
+        Dict[str, Dict[str, np.ndarray]]: Symbol -> date, timestamp, the price field and one array per indicator
+
+    Raises:
+        ValueError: Unknown indicator
+    """
+    resolved = [parse_indicator(name) for name in indicators]
+    symbols = list(prices)
+    kept: List[np.ndarray] = []
+    series: List[np.ndarray] = []
+    for symbol in symbols:
+        values = np.asarray(prices[symbol][field], dtype=np.float64)
+        mask = ~np.isnan(values)
+        kept.append(mask)
+        series.append(values[mask])
+    rows = pack(series)
+    computed = {name: function(rows) for name, function in resolved}
+
+    length = rows.shape[1]
+    results: Dict[str, Dict[str, np.ndarray]] = {}
+    for index, (symbol, mask) in enumerate(zip(symbols, kept)):
+        start = length - int(mask.sum())
+        columns = prices[symbol]
+        result = {"date": columns["date"][mask], "timestamp": columns["timestamp"][mask], field: rows[index, start:]}
+        for name, values in computed.items():
+            result[name] = values[index, start:]
+        results[symbol] = result
+    return results
+
+
+def latest_values(results: Dict[str, Dict[str, np.ndarray]]) -> Dict[str, Dict[str, Any]]:
+    """Last value of every column per symbol as plain Python values, NaN as None"""
+    latest: Dict[str, Dict[str, Any]] = {}
+    for symbol, columns in results.items():
+        values: Dict[str, Any] = {}
+        for name, column in columns.items():
+            if not len(column):
+                values[name] = None
+            elif name == "date":
+                values[name] = str(column[-1])
+            else:
+                value = column[-1].item()
+                values[name] = None if isinstance(value, float) and value != value else value
+        latest[symbol] = values
+    return latest
+
+
+def indicator_frame(results: Dict[str, Dict[str, np.ndarray]]) -> Any:
+    """All symbols' indicator columns as one long pandas DataFrame with a symbol column"""
+    import pandas as pd
+
+    frames = [pd.DataFrame(columns).assign(symbol=symbol) for symbol, columns in results.items()]
+    if not frames:
+        return pd.DataFrame()
+    frame = pd.concat(frames, ignore_index=True)
+    return frame[["symbol"] + [column for column in frame.columns if column != "symbol"]]
@@ -3,7 +3,6 @@ Metal data source implementation
 """
 
 import asyncio
-import json
 import logging
 from datetime import datetime
 from typing import Any, Dict
@@ -11,6 +10,7 @@ from typing import Any, Dict
 import aiohttp
 
 from .base import BaseAPI
+from .codec import json_codec
 
 logger = logging.getLogger("metal_source")
 
@@ -89,14 +89,20 @@ class MetalSource(BaseAPI):
             request_url = f"{self.proxy_url}/web-crawling/api/gold-index"
 
             # Send request using aiohttp
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.post(request_url, headers=self._headers, params=params, json=payload, timeout=self._timeout) as response:
-                    response.raise_for_status()
-                    # Parse the response
-                    data = await response.json(content_type=None)
+            data = await self._fetch_json(
+                "get_metal_price",
+                "POST",
+                request_url,
+                headers=self._headers,
+                params=params,
+                json=payload,
+                timeout=self._timeout,
+                content_type=None,
+                hedge=True,  # 只读查询，可以安全地对冲
+            )
 
             if isinstance(data, str):
-                data = json.loads(data)
+                data = json_codec.loads(data)
 
             if not isinstance(data, dict):
                 raise ValueError(f"Invalid API response format: {data}")
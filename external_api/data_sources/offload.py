@@ -0,0 +1,146 @@
+"""
+CPU 密集的响应解析放到进程池执行
+
+响应体超过阈值时，把原始字节(而不是解码后的大字典)交给工作进程，工作进程负责 JSON 解码和解析，
+只把精简后的结果传回来，事件循环在此期间可以继续处理其他请求。小响应仍在当前进程内直接解析。
+"""
+
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional, Tuple
+
+from .codec import json_codec
+from .projection import Projection, current_projection, use_projection
+
+logger = logging.getLogger("data_sources_offload")
+
+# 工作进程内缓存的数据源实例，按 (模块, 类名) 索引
+_worker_sources: Dict[Tuple[str, str], Any] = {}
+
+
+def _parse_in_worker(
+    module_name: str,
+    class_name: str,
+    parse: str,
+    body: bytes,
+    charset: Optional[str],
+    codec_name: str,
+    projection: Optional[Projection],
+    args: Tuple[Any, ...],
+) -> Any:
+    """Decode and parse a response body inside a worker process, under the caller's field projection"""
+    key = (module_name, class_name)
+    source = _worker_sources.get(key)
+    if source is None:
+        from .client import config
+
+        source_class = getattr(importlib.import_module(module_name), class_name)
+        source = source_class(config)
+        _worker_sources[key] = source
+    if json_codec.name != codec_name:
+        json_codec.use(codec_name)
+    with use_projection(projection):
+        return getattr(source, parse)(json_codec.loads_body(body, charset), *args)
+
+
+class Offloader:
+    """Runs source parse steps in a lazily created process pool when the body is large"""
+
+    def __init__(self, enabled: bool = False, threshold_bytes: int = 512 * 1024, max_workers: Optional[int] = None):
+        """
+        Args:
+            enabled: Whether large bodies are parsed in the pool
+            threshold_bytes: Bodies at least this large are offloaded
+            max_workers: Pool size, defaults to the CPU count
+        """
+        self.enabled = enabled
+        self.threshold_bytes = threshold_bytes
+        self.max_workers = max_workers
+        self.offloaded = 0
+        self.inline = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def configure(self, enabled: Optional[bool] = None, threshold_bytes: Optional[int] = None, max_workers: Optional[int] = None) -> None:
+        if threshold_bytes is not None:
+            self.threshold_bytes = threshold_bytes
+        if max_workers is not None and max_workers != self.max_workers:
+            self.max_workers = max_workers
+            self.shutdown()
+        if enabled is not None:
+            self.enabled = enabled
+            if not enabled:
+                self.shutdown()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    # spawn 避免在已有事件循环和线程的进程中 fork
+                    self._pool = ProcessPoolExecutor(self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    async def run(self, source: Any, parse: str, body: bytes, *args: Any, charset: Optional[str] = None) -> Any:
+        """
+        Decode `body` and call `source.<parse>(document, *args)`, in the pool if the body is large
+
+        Args:
+            source: Data source instance owning the parse method
+            parse: Name of the parse method, must be a plain method of the source class
+            body: Raw response body
+            args: Extra picklable arguments for the parse method
+            charset: Charset of the body, decoded the same way as unparsed responses
+
+        Returns:
+            Any: Return value of the parse method
+        """
+        if not self.enabled or len(body) < self.threshold_bytes:
+            self.inline += 1
+            return getattr(source, parse)(json_codec.loads_body(body, charset), *args)
+
+        source_class = type(source)
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                self._get_pool(),
+                _parse_in_worker,
+                source_class.__module__,
+                source_class.__qualname__,
+                parse,
+                body,
+                charset,
+                json_codec.name,
+                current_projection(),
+                args,
+            )
+        except BrokenProcessPool as e:
+            logger.error(f"解析进程池不可用，改为在当前进程解析: {str(e)}")
+            self.shutdown()
+            self.inline += 1
+            return getattr(source, parse)(json_codec.loads_body(body, charset), *args)
+        self.offloaded += 1
+        return result
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "threshold_bytes": self.threshold_bytes,
+            "offloaded": self.offloaded,
+            "inline": self.inline,
+            "pool_started": self._pool is not None,
+        }
+
+
+# 全局解析进程池
+offloader = Offloader()
@@ -0,0 +1,134 @@
+"""
+分页结果的异步迭代
+
+把按游标翻页的方法包装成逐条产出结果的异步迭代器:
+- 预取: 当前页的结果交给调用方处理时，下一页已经在后台请求
+- max_items: 最多产出的条数，达到上限后不再请求后续页
+- 可恢复: state 记录下一次要请求的游标和当前页已消费的条数，序列化后可以在之后(或其他进程里)继续
+
+页面请求失败时迭代结束，错误信息记录在 error 中，state 停留在失败的那一页，可以直接重试。
+"""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger("data_sources_pagination")
+
+
+class PageState:
+    """Resumable position of a paginated iteration
+
+    Args:
+        cursor: Cursor of the page being consumed, None for the first page
+        offset: Items of that page already consumed
+        yielded: Items yielded so far over all runs
+        exhausted: Whether the last page has been consumed
+    """
+
+    def __init__(self, cursor: Any = None, offset: int = 0, yielded: int = 0, exhausted: bool = False):
+        self.cursor = cursor
+        self.offset = offset
+        self.yielded = yielded
+        self.exhausted = exhausted
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"cursor": self.cursor, "offset": self.offset, "yielded": self.yielded, "exhausted": self.exhausted}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PageState":
+        return cls(data.get("cursor"), data.get("offset", 0), data.get("yielded", 0), data.get("exhausted", False))
+
+    def __repr__(self) -> str:
+        return f"PageState({self.to_dict()!r})"
+
+
+class Paginator:
+    """
+    Async iterator over the items of a cursor-paged source method
+
+    Args:
+        fetch_page: Calls the source method for a cursor and returns its result dict
+        items_key: Key of the item list in the result's data, e.g. "tweets"
+        next_cursor: Returns the cursor of the next page from (data, current cursor), None on the last page
+        max_items: Maximum number of items to yield in this run, None for no limit
+        prefetch: Whether to request the next page while the current one is being consumed
+        state: State to resume from, either a PageState or its to_dict() form
+        fields: Paths to keep in each item, relative to the item (see projection)
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[..., Awaitable[Dict[str, Any]]],
+        items_key: str,
+        next_cursor: Callable[[Dict[str, Any], Any], Any],
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+        state: Optional[Any] = None,
+        fields: Optional[List[str]] = None,
+    ):
+        self._fetch_page = fetch_page
+        self.items_key = items_key
+        self._next_cursor = next_cursor
+        self.max_items = max_items
+        self.prefetch = prefetch
+        self.state = PageState.from_dict(state) if isinstance(state, dict) else (state or PageState())
+        self.error: Optional[str] = None
+        self.pages = 0
+        # 单条结果的字段换算成整页结果的字段，并保留翻页需要的游标
+        self._fields = [f"{items_key}.{field}" for field in fields] + ["cursor"] if fields else None
+
+    def _fetch(self, cursor: Any) -> "asyncio.Task[Dict[str, Any]]":
+        if self._fields is not None:
+            return asyncio.ensure_future(self._fetch_page(cursor, fields=self._fields))
+        return asyncio.ensure_future(self._fetch_page(cursor))
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        state = self.state
+        if state.exhausted:
+            return
+        count = 0
+        task: Optional["asyncio.Task[Dict[str, Any]]"] = self._fetch(state.cursor)
+        try:
+            while task is not None:
+                result = await task
+                task = None
+                if not result.get("success"):
+                    self.error = result.get("error", "Unknown error")
+                    logger.error(f"获取分页结果失败(cursor={state.cursor}): {self.error}")
+                    return
+                self.pages += 1
+                data = result.get("data") or {}
+                items = data.get(self.items_key) or []
+                cursor = self._next_cursor(data, state.cursor)
+                # 空页或游标没有前进时视为最后一页，避免无限翻页
+                has_next = bool(items) and cursor is not None and cursor != state.cursor
+
+                remaining = len(items) - state.offset
+                if has_next and self.prefetch and (self.max_items is None or self.max_items - count > remaining):
+                    task = self._fetch(cursor)
+
+                for item in items[state.offset :]:
+                    if self.max_items is not None and count >= self.max_items:
+                        return
+                    state.offset += 1
+                    state.yielded += 1
+                    count += 1
+                    yield item
+
+                if not has_next:
+                    state.exhausted = True
+                    return
+                state.cursor = cursor
+                state.offset = 0
+                if self.max_items is not None and count >= self.max_items:
+                    return
+                if task is None:
+                    task = self._fetch(cursor)
+        finally:
+            if task is not None and not task.done():
+                task.cancel()
+
+    async def collect(self) -> List[Any]:
+        """Consume the iterator and return all items"""
+        return [item async for item in self]
@@ -5,11 +5,11 @@
 import asyncio
 import logging
 import math
-from typing import Any, Dict, Optional
-
-import aiohttp
+from typing import Any, Dict, List, Optional
 
 from .base import BaseAPI
+from .pagination import Paginator
+from .projection import Projection
 
 logger = logging.getLogger("patents_source")
 
@@ -80,10 +80,9 @@ class PatentSource(BaseAPI):
         request_url = f"{self.proxy_url}/patents"
 
         try:
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.post(request_url, headers=self.headers, json=payload, timeout=self.timeout) as response:
-                    response.raise_for_status()
-                    data = await response.json()
+            data = await self._fetch_json(
+                "search_patents", "POST", request_url, headers=self.headers, json=payload, timeout=self.timeout
+            )
 
             organic = data.get("organic", [])
             results = []
@@ -225,3 +224,64 @@ class PatentSource(BaseAPI):
         except Exception as e:
             logger.error(f"search_patents error: {e}")
             return {"success": False, "error": str(e)}
+
+    def iter_patents(
+        self,
+        query: str,
+        assignee: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+        state: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Paginator:
+        """
+        Iterate over patent search results page by page, 50 patents per page.
+
+        The next page is requested while the current one is being processed, and iteration ends after the first page
+        with fewer than 50 patents. Use with `async for`.
+
+        Args:
+            query(str): Search keywords. up to 5.
+            assignee(str): The assignee of the patents, e.g. "Apple Inc.".
+            start_time(str): Start date YYYYMMDD, optional.
+            end_time(str): End date YYYYMMDD, optional.
+            max_items(Optional[int]): Maximum number of patents to yield, default None for all pages
+            prefetch(bool): Whether to prefetch the next page, default True
+            state(Optional[Dict[str, Any]]): `paginator.state.to_dict()` of an earlier iteration to resume from
+            fields(Optional[List[str]]): Only keep these fields of each patent, e.g. ["publicationNumber", "title"]
+
+        Returns:
+            Paginator: Async iterator of patents in the same format as search_patents,
+                `error` is set if a page failed and `state` can be saved to resume later
+
+        Example:
+            paginator = client.patent.iter_patents(query="machine learning", assignee="Apple Inc.")
+            async for patent in paginator:
+                print(patent["publicationNumber"], patent["title"])
+        """
+        keywords = query.split(" ")
+        if len(keywords) > 5:
+            query = " ".join(keywords[:5])
+
+        page_size = 50
+
+        async def fetch_page(page: Optional[int], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+            result = await self._fetch_patents_page(query, assignee, page_size, page or 1, start_time, end_time)
+            if not result["success"]:
+                return result
+            data = {"patents": result["data"]}
+            projection = Projection.parse(fields)
+            return {"success": True, "data": data if projection is None else projection.apply(data)}
+
+        return Paginator(
+            fetch_page,
+            "patents",
+            # 不满一页说明已是最后一页
+            lambda data, page: (page or 1) + 1 if len(data["patents"]) >= page_size else None,
+            max_items=max_items,
+            prefetch=prefetch,
+            state=state,
+            fields=fields,
+        )
@@ -3,14 +3,16 @@ Pinterest data source implementation
 """
 
 import asyncio
-import json
 import logging
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import aiohttp
 
 from .base import BaseAPI
+from .codec import json_codec
+from .pagination import Paginator
+from .records import Pin, check_output
 
 logger = logging.getLogger("pinterest_source")
 
@@ -39,7 +41,7 @@ class PinterestSource(BaseAPI):
         return {"name": self.source_name, "description": "Pinterest data source, provides user and pin search features for Pinterest."}
 
     async def search_pins(
-        self, keyword: str, num: int = 10, nextPageCursor: Optional[str] = None, sort: str = "relevance"
+        self, keyword: str, num: int = 10, nextPageCursor: Optional[str] = None, sort: str = "relevance", output: str = "dicts"
     ) -> Dict[str, Any]:
         """
         Search related pins.
@@ -51,6 +53,8 @@ class PinterestSource(BaseAPI):
             num(int): Number of results per page, e.g. 10
             nextPageCursor(str): Pagination cursor for next page, default None for first page
             sort(str): Sort order, default "relevance", options: "relevance" or "recent"
+            output(str): Format of the pin list, "dicts" (default) or "records" for compact Pin objects
+                (attribute access, convert with to_dict())
 
         Returns:
             Dict[str, Any]: Dictionary containing pin search results, e.g.
@@ -109,6 +113,8 @@ class PinterestSource(BaseAPI):
         #     ...     print(f"Search failed: {result['error']}")
         # """
         try:
+            check_output(output)
+
             # Build query parameters
             params = {"keyword": keyword, "num": num, "sort": sort}
 
@@ -118,15 +124,13 @@ class PinterestSource(BaseAPI):
             request_url = f"{self.proxy_url}/pinterest/pins/advance"
 
             # Send request using aiohttp
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.post(request_url, headers=self._headers, json=params, timeout=self._timeout) as response:
-                    response.raise_for_status()
-                    # Parse the response
-                    data = await response.json(content_type=None)
+            data = await self._fetch_json(
+                "search_pins", "POST", request_url, headers=self._headers, json=params, timeout=self._timeout, content_type=None
+            )
 
             # The API returns a JSON string, need to parse it first
             if isinstance(data, str):
-                data = json.loads(data)
+                data = json_codec.loads(data)
 
             if not isinstance(data, dict):
                 raise ValueError(f"Invalid API response format: {data}")
@@ -134,7 +138,7 @@ class PinterestSource(BaseAPI):
             if "data" not in data:
                 raise ValueError(f"API response missing data field: {data}")
 
-            pins = self._parse_pins(data)
+            pins = self._parse_pins(data, output == "records")
 
             return {"success": True, "data": {"keyword": keyword, "count": len(pins), "pins": pins, "cursor": data.get("nextPageCursor")}}
 
@@ -152,6 +156,51 @@ class PinterestSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
+    def iter_pins(
+        self,
+        keyword: str,
+        num: int = 20,
+        sort: str = "relevance",
+        output: str = "dicts",
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+        state: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Paginator:
+        """
+        Iterate over pin search results across pages.
+
+        The next page is requested while the current one is being processed. Use with `async for`.
+
+        Args:
+            keyword(str): Search keyword, e.g. "cats"
+            num(int): Number of results per page, e.g. 20
+            sort(str): Sort order, default "relevance", options: "relevance" or "recent"
+            output(str): "dicts" (default) or "records" for compact Pin objects
+            max_items(Optional[int]): Maximum number of pins to yield, default None for all pages
+            prefetch(bool): Whether to prefetch the next page, default True
+            state(Optional[Dict[str, Any]]): `paginator.state.to_dict()` of an earlier iteration to resume from
+            fields(Optional[List[str]]): Only keep these fields of each pin, e.g. ["id", "images.url"]
+
+        Returns:
+            Paginator: Async iterator of pins in the same format as search_pins,
+                `error` is set if a page failed and `state` can be saved to resume later
+
+        Example:
+            paginator = client.pinterest.iter_pins(keyword="cat", max_items=100)
+            async for pin in paginator:
+                print(pin["id"], pin["title"])
+        """
+        return Paginator(
+            lambda cursor, **kwargs: self.search_pins(keyword, num, cursor, sort, output, **kwargs),
+            "pins",
+            lambda data, cursor: data.get("cursor"),
+            max_items=max_items,
+            prefetch=prefetch,
+            state=state,
+            fields=fields,
+        )
+
     async def get_user_info(self, username: str, user_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Get detailed information of a Pinterest user.
@@ -195,15 +244,13 @@ class PinterestSource(BaseAPI):
             params = {"keyword": username}
 
             # Send request using aiohttp
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.get(request_url, headers=self._headers, params=params, timeout=self._timeout) as response:
-                    response.raise_for_status()
-                    # Parse the response
-                    data = await response.json(content_type=None)
+            data = await self._fetch_json(
+                "get_user_info", "GET", request_url, headers=self._headers, params=params, timeout=self._timeout, content_type=None
+            )
 
             # Parse response data
             if isinstance(data, str):
-                data = json.loads(data)
+                data = json_codec.loads(data)
 
             if not isinstance(data, dict):
                 raise ValueError(f"Invalid API response format: {data}")
@@ -237,7 +284,7 @@ class PinterestSource(BaseAPI):
         except Exception:
             return date_str
 
-    def _parse_pins(self, data: dict[str, Any]) -> list[dict[str, Any]]:
+    def _parse_pins(self, data: dict[str, Any], records: bool = False) -> list[Any]:
         print(f"xwy-pins, {data}")
         print("-" * 100)
         print("\n")
@@ -291,7 +338,7 @@ class PinterestSource(BaseAPI):
                     "full_name": pin_data.get("pinner", {}).get("full_name", ""),
                 },
             }
-            pins.append(pin)
+            pins.append(Pin.from_dict(pin) if records else pin)
         return pins
 
     def _parse_user_info(self, resp: dict[str, Any]) -> dict[str, Any]:
@@ -0,0 +1,303 @@
+"""
+批量抓取流水线: 抓取 -> 转换 -> 写出
+
+各阶段之间用有界队列连接，下游处理不过来时上游自动等待(背压)，
+结果按批写入 JSONL / Parquet / SQLite，不在内存中累积，内存占用与抓取总量无关。
+
+抓取阶段接受任意异步迭代器，通常是数据源的 iter_* 分页迭代器，可以同时传入多个(例如多个关键词)。
+
+用法:
+    pipeline = Pipeline(
+        [client.twitter.iter_search_tweets(query) for query in queries],
+        JsonlSink("tweets.jsonl"),
+        transform=lambda tweet: tweet if tweet["public_metrics"]["like_count"] > 10 else None,
+    )
+    stats = await pipeline.run()
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from typing import Any, AsyncIterable, Callable, Dict, List, Optional, Sequence, Union
+
+from .records import Record
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+logger = logging.getLogger("data_sources_pipeline")
+
+# 队列结束标记
+_DONE = object()
+
+
+def _plain(item: Any) -> Any:
+    """Records are written in their dict form"""
+    return item.to_dict() if isinstance(item, Record) else item
+
+
+class Sink(ABC):
+    """
+    Destination of a pipeline, written to in batches
+
+    Methods are blocking and run in a worker thread, one call at a time.
+    """
+
+    def open(self) -> None:
+        pass
+
+    @abstractmethod
+    def write(self, batch: List[Any]) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class JsonlSink(Sink):
+    """Writes one JSON document per line"""
+
+    def __init__(self, path: str, append: bool = False):
+        self.path = path
+        self.append = append
+        self._file: Optional[Any] = None
+
+    def open(self) -> None:
+        self._file = open(self.path, "a" if self.append else "w", encoding="utf-8")
+
+    def write(self, batch: List[Any]) -> None:
+        assert self._file is not None
+        self._file.write("".join(json.dumps(_plain(item), ensure_ascii=False, default=str) + "\n" for item in batch))
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SqliteSink(Sink):
+    """
+    Writes items as rows of a SQLite table (WAL mode)
+
+    Args:
+        path: Database file
+        table: Table name, created if missing
+        columns: Item fields stored as their own columns, non-scalar values are JSON encoded;
+            by default the whole item is stored as JSON in a `data` column
+        key: Field used as primary key, rows with an existing key are replaced, so re-running
+            a harvest does not create duplicates
+    """
+
+    def __init__(self, path: str, table: str = "items", columns: Optional[Sequence[str]] = None, key: Optional[str] = None):
+        self.path = path
+        self.table = table
+        self.columns = list(columns) if columns else ["data"]
+        self.key = key
+        if key and columns and key not in self.columns:
+            self.columns.insert(0, key)
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def open(self) -> None:
+        # 在写线程中使用，关闭同线程检查
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        definitions = [f'"{column}"' for column in self.columns]
+        if self.key:
+            if self.columns == ["data"]:
+                definitions.insert(0, f'"{self.key}" PRIMARY KEY')
+            else:
+                definitions[self.columns.index(self.key)] += " PRIMARY KEY"
+        self._connection.execute(f'CREATE TABLE IF NOT EXISTS "{self.table}" ({", ".join(definitions)})')
+
+    def _row(self, item: Any) -> List[Any]:
+        item = _plain(item)
+        if self.columns == ["data"]:
+            row = [json.dumps(item, ensure_ascii=False, default=str)]
+            if self.key:
+                row.insert(0, item.get(self.key))
+            return row
+        row = []
+        for column in self.columns:
+            value = item.get(column)
+            if value is not None and not isinstance(value, (str, int, float, bool)):
+                value = json.dumps(value, ensure_ascii=False, default=str)
+            row.append(value)
+        return row
+
+    def write(self, batch: List[Any]) -> None:
+        assert self._connection is not None
+        names = ["data"] if self.columns == ["data"] else self.columns
+        if self.key and self.columns == ["data"]:
+            names = [self.key, "data"]
+        verb = "INSERT OR REPLACE" if self.key else "INSERT"
+        placeholders = ", ".join("?" for _ in names)
+        column_list = ", ".join(f'"{name}"' for name in names)
+        with self._connection:
+            self._connection.executemany(
+                f'{verb} INTO "{self.table}" ({column_list}) VALUES ({placeholders})', [self._row(item) for item in batch]
+            )
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+class ParquetSink(Sink):
+    """
+    Writes items to a Parquet file, one row group per batch (requires pyarrow)
+
+    The schema is inferred from the first batch; later batches are cast to it.
+    """
+
+    def __init__(self, path: str, compression: str = "zstd"):
+        self.path = path
+        self.compression = compression
+        self._writer: Optional[Any] = None
+
+    def open(self) -> None:
+        if pyarrow is None:
+            raise ImportError("ParquetSink requires pyarrow, install it with: pip install pyarrow")
+
+    def write(self, batch: List[Any]) -> None:
+        rows = [_plain(item) for item in batch]
+        if self._writer is None:
+            table = pyarrow.Table.from_pylist(rows)
+            self._writer = pyarrow.parquet.ParquetWriter(self.path, table.schema, compression=self.compression)
+        else:
+            table = pyarrow.Table.from_pylist(rows, schema=self._writer.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class Pipeline:
+    """
+    Staged fetch -> transform -> sink pipeline with bounded queues
+
+    Args:
+        fetch: Async iterable of items, or several that are consumed concurrently
+        sink: Where the items are written
+        transform: Optional function (sync or async) applied to every item; returning None drops the item
+        queue_size: Capacity of each queue between stages, producers wait when it is full
+        transform_workers: Number of concurrent transform workers, useful for async transforms
+        batch_size: Items per sink write
+        flush_interval: Seconds a partial batch waits for more items before it is written
+    """
+
+    def __init__(
+        self,
+        fetch: Union[AsyncIterable[Any], Sequence[AsyncIterable[Any]]],
+        sink: Sink,
+        transform: Optional[Callable[[Any], Any]] = None,
+        queue_size: int = 1000,
+        transform_workers: int = 1,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+    ):
+        if queue_size < 1 or transform_workers < 1 or batch_size < 1:
+            raise ValueError("queue_size, transform_workers and batch_size must be positive")
+        self.fetchers = list(fetch) if isinstance(fetch, (list, tuple)) else [fetch]
+        self.sink = sink
+        self.transform = transform
+        self.queue_size = queue_size
+        self.transform_workers = transform_workers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stats: Dict[str, Any] = {}
+
+    async def _fetch(self, source: AsyncIterable[Any], queue: "asyncio.Queue[Any]") -> None:
+        async for item in source:
+            self.stats["fetched"] += 1
+            await queue.put(item)
+        # 分页迭代器的请求失败不抛异常，记录在 error 中
+        error = getattr(source, "error", None)
+        if error:
+            self.stats["fetch_errors"].append(error)
+
+    async def _transform(self, inbox: "asyncio.Queue[Any]", outbox: "asyncio.Queue[Any]") -> None:
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                return
+            result = self.transform(item) if self.transform is not None else item
+            if inspect.isawaitable(result):
+                result = await result
+            if result is None:
+                self.stats["dropped"] += 1
+                continue
+            await outbox.put(result)
+
+    async def _sink(self, inbox: "asyncio.Queue[Any]") -> None:
+        batch: List[Any] = []
+        deadline = 0.0
+        while True:
+            timed_out = False
+            if batch:
+                # 抓取较慢时，不满的批次最多等待 flush_interval 就写出，不让结果长时间停留在内存中
+                try:
+                    item = await asyncio.wait_for(inbox.get(), max(deadline - time.monotonic(), 0.0))
+                except asyncio.TimeoutError:
+                    timed_out = True
+            else:
+                item = await inbox.get()
+                deadline = time.monotonic() + self.flush_interval
+            done = not timed_out and item is _DONE
+            if not timed_out and not done:
+                batch.append(item)
+            if batch and (timed_out or done or len(batch) >= self.batch_size):
+                await asyncio.to_thread(self.sink.write, batch)
+                self.stats["written"] += len(batch)
+                self.stats["batches"] += 1
+                batch = []
+            if done:
+                return
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Run the pipeline to completion
+
+        Returns:
+            Dict[str, Any]: fetched, dropped, written, batches, fetch_errors (errors reported by
+                paginated sources) and elapsed (seconds)
+
+        Raises:
+            Exception: The first error raised by a stage or the sink; the other stages are cancelled
+        """
+        self.stats = {"fetched": 0, "dropped": 0, "written": 0, "batches": 0, "fetch_errors": [], "elapsed": 0.0}
+        started = time.monotonic()
+        fetched: "asyncio.Queue[Any]" = asyncio.Queue(self.queue_size)
+        transformed: "asyncio.Queue[Any]" = asyncio.Queue(self.queue_size)
+
+        async def fetch_all() -> None:
+            await asyncio.gather(*(self._fetch(source, fetched) for source in self.fetchers))
+            for _ in range(self.transform_workers):
+                await fetched.put(_DONE)
+
+        async def transform_all() -> None:
+            await asyncio.gather(*(self._transform(fetched, transformed) for _ in range(self.transform_workers)))
+            await transformed.put(_DONE)
+
+        await asyncio.to_thread(self.sink.open)
+        tasks = [asyncio.ensure_future(stage) for stage in (fetch_all(), transform_all(), self._sink(transformed))]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await asyncio.to_thread(self.sink.close)
+            self.stats["elapsed"] = round(time.monotonic() - started, 3)
+        logger.info(f"流水线完成: {self.stats}")
+        return self.stats
@@ -0,0 +1,162 @@
+"""
+K线的列式解析
+
+get_stock_price 默认每根K线构建一个字典，1m 间隔取几周数据时会产生数万个对象。
+output="numpy"/"pandas" 时直接从 get-chart 响应的 timestamp 和 indicators.quote 数组向量化构建列:
+
+- numpy: {"date": datetime64[D], "timestamp": int64, "open"/"high"/"low"/"close"/"volume": float64}
+- pandas: 以上列组成的 DataFrame，volume 为可空整数(Int64)
+
+缺失的K线(上游返回 None)在价格列中为 NaN，volume 中为 NaN/<NA>，不会因为 int(None) 出错。
+date 与 output="dicts" 中的日期一致，按本地时区换算。
+"""
+
+import time
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .records import OUTPUT_MODES, PriceBar
+
+# get_stock_price output 参数的可选值
+PRICE_OUTPUT_MODES = OUTPUT_MODES + ("numpy", "pandas")
+
+PRICE_FIELDS = ("open", "high", "low", "close", "volume")
+
+# 假定 7 天内本地时区偏移最多变化一次(夏令时切换)
+_MAX_CONSTANT_SPAN = 7 * 86400
+
+
+def _local_offsets(timestamps: np.ndarray) -> np.ndarray:
+    """UTC offsets (seconds) of ascending unix timestamps in the local timezone
+
+    Offsets are piecewise constant, so localtime is only queried while bisecting towards the changes.
+    """
+    offsets = np.empty(len(timestamps), dtype=np.int64)
+
+    def offset(i: int) -> int:
+        return time.localtime(int(timestamps[i])).tm_gmtoff
+
+    last = len(timestamps) - 1
+    pending = [(0, last, offset(0), offset(last))]
+    while pending:
+        lo, hi, lo_offset, hi_offset = pending.pop()
+        if lo_offset == hi_offset and timestamps[hi] - timestamps[lo] <= _MAX_CONSTANT_SPAN:
+            offsets[lo : hi + 1] = lo_offset
+        elif hi - lo <= 1:
+            offsets[lo] = lo_offset
+            offsets[hi] = hi_offset
+        else:
+            mid = (lo + hi) // 2
+            mid_offset = offset(mid)
+            pending.append((lo, mid, lo_offset, mid_offset))
+            pending.append((mid, hi, mid_offset, hi_offset))
+    return offsets
+
+
+def _local_dates(timestamps: np.ndarray) -> np.ndarray:
+    """Local calendar dates of unix timestamps, same as datetime.fromtimestamp(ts).date()"""
+    if not len(timestamps):
+        return np.empty(0, dtype="datetime64[D]")
+    if np.all(timestamps[1:] >= timestamps[:-1]):
+        offsets = _local_offsets(timestamps)
+    else:
+        order = np.argsort(timestamps, kind="stable")
+        offsets = np.empty(len(timestamps), dtype=np.int64)
+        offsets[order] = _local_offsets(timestamps[order])
+    return ((timestamps + offsets) // 86400).astype("datetime64[D]")
+
+
+def price_arrays(chart_data: Dict[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Build the columns of a get-chart result
+
+    Args:
+        chart_data: `chart.result[0]` of a get-chart response
+
+    Returns:
+        Dict[str, np.ndarray]: date, timestamp and one float64 array per quote field, NaN where a bar is missing
+    """
+    timestamps = np.asarray(chart_data.get("timestamp") or [], dtype=np.int64)
+    quotes = chart_data.get("indicators", {}).get("quote") or [{}]
+    quote = quotes[0]
+    columns: Dict[str, np.ndarray] = {"date": _local_dates(timestamps), "timestamp": timestamps}
+    for field in PRICE_FIELDS:
+        values = quote.get(field)
+        # dtype=float64 时 None 转换为 NaN
+        columns[field] = np.asarray(values, dtype=np.float64) if values else np.full(len(timestamps), np.nan)
+    return columns
+
+
+def price_frame(chart_data: Dict[str, Any]) -> Any:
+    """
+    Build a pandas DataFrame of a get-chart result, with the columns of price_arrays
+
+    Returns:
+        pandas.DataFrame: One row per bar, volume as nullable Int64
+    """
+    return _frame(price_arrays(chart_data))
+
+
+def _frame(columns: Dict[str, np.ndarray]) -> Any:
+    # pandas 导入较慢，只在使用时导入
+    import pandas as pd
+
+    frame = pd.DataFrame(columns)
+    frame["volume"] = frame["volume"].round().astype("Int64")
+    return frame
+
+
+def parse_price_columns(chart_data: Dict[str, Any], output: str) -> Any:
+    """Columns of a get-chart result for output="numpy" or output="pandas" """
+    if output == "pandas":
+        return price_frame(chart_data)
+    return price_arrays(chart_data)
+
+
+def concat_price_columns(parts: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """
+    Merge the columns of several get-chart results (e.g. consecutive windows) in timestamp order
+
+    Bars with the same timestamp are kept once, later parts win.
+    """
+    timestamps = np.concatenate([part["timestamp"] for part in parts]) if parts else np.empty(0, dtype=np.int64)
+    order = np.argsort(timestamps, kind="stable")
+    timestamps = timestamps[order]
+    keep = np.ones(len(timestamps), dtype=bool)
+    keep[:-1] = timestamps[1:] != timestamps[:-1]
+    fields = {}
+    for field in PRICE_FIELDS:
+        values = np.concatenate([part[field] for part in parts]) if parts else np.empty(0, dtype=np.float64)
+        fields[field] = values[order][keep]
+    return with_dates(timestamps[keep], fields)
+
+
+def with_dates(timestamps: np.ndarray, fields: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Columns in price_arrays layout from timestamps and the quote field arrays"""
+    return {"date": _local_dates(timestamps), "timestamp": timestamps, **{field: fields[field] for field in PRICE_FIELDS}}
+
+
+def format_price_columns(columns: Dict[str, np.ndarray], output: str) -> Any:
+    """
+    Convert price_arrays columns to any get_stock_price output, the same as parsing the response in that mode
+
+    Args:
+        columns: Columns in price_arrays layout
+        output: One of PRICE_OUTPUT_MODES
+    """
+    if output == "numpy":
+        return columns
+    if output == "pandas":
+        return _frame(columns)
+    dates = np.datetime_as_string(columns["date"]).tolist()
+    # NaN 还原为 None
+    opens, highs, lows, closes = ([None if v != v else v for v in columns[field].tolist()] for field in PRICE_FIELDS[:4])
+    volumes = [None if v != v else int(v) for v in columns["volume"].tolist()]
+    rows = zip(dates, opens, highs, lows, closes, volumes)
+    if output == "records":
+        return [PriceBar(*row) for row in rows]
+    return [
+        {"date": date, "open": open, "high": high, "low": low, "close": close, "volume": volume}
+        for date, open, high, low, close, volume in rows
+    ]
@@ -0,0 +1,161 @@
+"""
+返回字段裁剪(fields= 参数)
+
+所有数据源方法都接受 fields 参数，只返回指定路径的字段，路径相对于结果中的 data:
+- "tweets.text": 每条推文只保留 text，列表会自动展开
+- "rooms.*.description": "*" 匹配对象的任意字段名或列表的每个元素
+- 多个路径用列表或逗号分隔的字符串传入
+
+解析器可以通过 current_projection() 判断哪些子结构不需要构建，跳过对应的转换工作；
+方法返回后还会按同样的路径统一裁剪一次，保证输出只包含请求的字段。
+解析器已经只构建了请求的字段时返回 Pruned，统一裁剪时不再遍历。
+"""
+
+import contextvars
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+from .records import Record
+
+# 树结构: 字段名 -> 子树, None 表示保留该字段的全部内容
+_Tree = Dict[str, Optional["_Tree"]]
+
+
+def _merge(trees: List[_Tree]) -> _Tree:
+    merged: _Tree = {}
+    for tree in trees:
+        for key, sub in tree.items():
+            if key not in merged:
+                merged[key] = sub
+            elif merged[key] is None or sub is None:
+                merged[key] = None
+            else:
+                merged[key] = _merge([merged[key], sub])  # type: ignore[list-item]
+    return merged
+
+
+class Pruned(dict):
+    """A dict a parser built under the projection, Projection.apply keeps it without walking it again"""
+
+
+class Projection:
+    """A set of requested field paths"""
+
+    def __init__(self, tree: _Tree):
+        self._tree = tree
+        # 字段名 -> child() 的结果，解析器对列表和对象的每个元素都会调用 child()
+        self._children: Dict[str, Optional[Projection]] = {}
+
+    @classmethod
+    def parse(cls, fields: Union[str, Sequence[str], None]) -> Optional["Projection"]:
+        """
+        Build a projection from field paths
+
+        Returns:
+            Optional[Projection]: None when no fields are given, meaning everything is returned
+        """
+        if fields is None:
+            return None
+        if isinstance(fields, str):
+            fields = fields.split(",")
+        tree: _Tree = {}
+        for field in fields:
+            segments = [segment for segment in field.strip().split(".") if segment]
+            node = tree
+            for i, segment in enumerate(segments):
+                if segment in node and node[segment] is None:
+                    break
+                if i == len(segments) - 1:
+                    node[segment] = None
+                else:
+                    node = node.setdefault(segment, {})  # type: ignore[assignment]
+        return cls(tree) if tree else None
+
+    def wants(self, key: str) -> bool:
+        """Whether the field `key` at this level is requested"""
+        return key in self._tree or "*" in self._tree
+
+    def child(self, key: str) -> Optional["Projection"]:
+        """
+        Projection for the value under `key`, None if the whole value is requested
+
+        Only meaningful when wants(key) is True. Lists are transparent: child("*") of a level
+        without "*" returns the same level, so "tweets.text" applies to every tweet.
+        """
+        if key not in self._tree:
+            if "*" not in self._tree:
+                return self if key == "*" else None
+            # 未单独列出的字段只受 "*" 约束，共用同一个子 projection
+            key = "*"
+        if key in self._children:
+            return self._children[key]
+        subtrees = [self._tree[name] for name in (key, "*") if name in self._tree]
+        if not subtrees or any(subtree is None for subtree in subtrees):
+            projection = None
+        else:
+            projection = Projection(_merge(subtrees))  # type: ignore[arg-type]
+        self._children[key] = projection
+        return projection
+
+    def apply(self, value: Any) -> Any:
+        """Prune a value to the requested paths"""
+        if isinstance(value, Pruned):
+            return dict(value)
+        if isinstance(value, list):
+            item_projection = self.child("*")
+            return value if item_projection is None else [item_projection.apply(item) for item in value]
+        if isinstance(value, dict):
+            result = {}
+            for key, item in value.items():
+                if not self.wants(key):
+                    continue
+                sub = self.child(key)
+                result[key] = item if sub is None else sub.apply(item)
+            return result
+        if isinstance(value, Record):
+            return value.project(self)
+        return value
+
+    def __repr__(self) -> str:
+        return f"Projection({self._tree!r})"
+
+
+_current_projection: contextvars.ContextVar[Optional[Projection]] = contextvars.ContextVar(
+    "data_source_projection", default=None
+)
+
+
+def current_projection() -> Optional[Projection]:
+    """Projection of the running source method call, relative to the result's data; None means all fields"""
+    return _current_projection.get()
+
+
+@contextmanager
+def use_projection(projection: Optional[Projection]) -> Iterator[None]:
+    token = _current_projection.set(projection)
+    try:
+        yield
+    finally:
+        _current_projection.reset(token)
+
+
+def wants(projection: Optional[Projection], key: str) -> bool:
+    """Whether `key` is requested, True when there is no projection"""
+    return projection is None or projection.wants(key)
+
+
+def child(projection: Optional[Projection], *keys: str) -> Optional[Projection]:
+    """Projection below a path, None when everything below it is requested"""
+    for key in keys:
+        if projection is None:
+            return None
+        projection = projection.child(key)
+    return projection
+
+
+def prune(projection: Optional[Projection], key: str, value: Any) -> Any:
+    """The value of the requested field `key` pruned to the paths below it"""
+    if projection is None:
+        return value
+    sub = projection.child(key)
+    return value if sub is None else sub.apply(value)
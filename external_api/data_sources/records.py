@@ -0,0 +1,172 @@
+"""
+紧凑的结果记录类型
+
+大批量抓取时，每条结果一个 dict 的内存开销很大。数据源方法传 output="records" 时，
+价格、推文、Pin 等高频结果改为返回使用 __slots__ 的记录对象，不再为每条结果保留字典。
+
+- 字段和 output="dicts" 时的字典键一一对应，可以用属性(bar.close)或下标(bar["close"])访问
+- 该模式下没有返回的字段保持未设置，访问时抛出 AttributeError/KeyError，to_dict() 中也不出现
+- to_dict()/to_dicts() 按需转换回与默认模式完全相同的字典
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+# 数据源方法 output 参数的可选值
+OUTPUT_MODES = ("dicts", "records")
+
+
+def check_output(output: str, modes: Iterable[str] = OUTPUT_MODES) -> None:
+    """Raise ValueError for an unsupported output mode"""
+    if output not in modes:
+        raise ValueError(f"Unsupported output: {output}, options: {', '.join(modes)}")
+
+
+class Record:
+    """Base class of slotted result records, subclasses list their fields in __slots__ in output order"""
+
+    __slots__ = ()
+    # 字段名 -> 嵌套记录类型，from_dict 时把对应的字典转换为记录
+    _nested: Dict[str, type] = {}
+
+    def __init__(self, **values: Any):
+        for name, value in values.items():
+            setattr(self, name, value)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Record":
+        """Build a record from the dict form, converting nested dicts listed in _nested"""
+        record = cls.__new__(cls)
+        nested = cls._nested
+        for name, value in data.items():
+            if name in nested and isinstance(value, dict):
+                value = nested[name].from_dict(value)
+            setattr(record, name, value)
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the same dict as output="dicts" returns"""
+        result = {}
+        for name in self.__slots__:
+            try:
+                value = getattr(self, name)
+            except AttributeError:
+                continue
+            result[name] = value.to_dict() if isinstance(value, Record) else value
+        return result
+
+    def project(self, projection: Any) -> "Record":
+        """Copy with only the fields requested by a projection (see projection.Projection)"""
+        record = self.__class__.__new__(self.__class__)
+        for name in self.__slots__:
+            if not projection.wants(name) or not hasattr(self, name):
+                continue
+            sub = projection.child(name)
+            value = getattr(self, name)
+            setattr(record, name, value if sub is None else sub.apply(value))
+        return record
+
+    def __getitem__(self, name: str) -> Any:
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={value!r}" for name, value in self.to_dict().items())
+        return f"{self.__class__.__name__}({fields})"
+
+
+def to_dicts(items: Optional[Iterable[Any]]) -> List[Any]:
+    """Convert a list of records (or already plain dicts) to dicts"""
+    return [item.to_dict() if isinstance(item, Record) else item for item in items or []]
+
+
+class PriceBar(Record):
+    """One OHLCV bar of get_stock_price"""
+
+    __slots__ = ("date", "open", "high", "low", "close", "volume")
+
+    def __init__(self, date: str, open: Any, high: Any, low: Any, close: Any, volume: Any):
+        # 价格序列可能有几十万条，直接赋值比通用的关键字参数构造快得多
+        self.date = date
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+
+class PublicMetrics(Record):
+    """Engagement counts of a tweet"""
+
+    __slots__ = ("retweet_count", "reply_count", "like_count", "quote_count", "view_count", "bookmark_count")
+
+
+class TweetAuthor(Record):
+    """Author summary of a search_tweets result"""
+
+    __slots__ = ("id", "name", "username", "followers_count", "is_verified", "is_blue_verified")
+
+
+class UserMetrics(Record):
+    """Follower and activity counts of a Twitter user"""
+
+    __slots__ = ("followers_count", "following_count", "tweet_count", "listed_count", "like_count")
+
+
+class TwitterUser(Record):
+    """Twitter user profile attached to tweets of get_user_tweets"""
+
+    __slots__ = (
+        "id",
+        "username",
+        "name",
+        "created_at",
+        "description",
+        "location",
+        "url",
+        "profile_image_url",
+        "profile_banner_url",
+        "public_metrics",
+        "verified",
+        "blue_verified",
+        "private",
+        "bot",
+    )
+    _nested = {"public_metrics": UserMetrics}
+
+
+class Tweet(Record):
+    """A tweet of search_tweets (with author) or get_user_tweets (with language, user and referenced_tweets)"""
+
+    __slots__ = (
+        "id",
+        "created_at",
+        "text",
+        "language",
+        "media_urls",
+        "video_urls",
+        "author",
+        "public_metrics",
+        "user",
+        "referenced_tweets",
+    )
+    _nested = {"author": TweetAuthor, "public_metrics": PublicMetrics, "user": TwitterUser}
+
+
+class Pinner(Record):
+    """Creator of a pin"""
+
+    __slots__ = ("id", "image_url", "follower_count", "username", "full_name")
+
+
+class Pin(Record):
+    """A pin of search_pins"""
+
+    __slots__ = ("id", "title", "description", "alt_text", "auto_alt_text", "images", "videos", "created_at", "likes", "pinner")
+    _nested = {"pinner": Pinner}
@@ -0,0 +1,251 @@
+"""
+代理响应录制与回放
+
+录制模式: 把经过 external_api_proxy_url 的响应按 数据源/方法 保存为 fixture 文件
+回放模式: 用本地 aiohttp 服务替代代理，按请求匹配 fixture 返回，可配置延迟和抖动，
+用于离线压测和性能分析所有数据源的完整调用路径
+
+用法:
+    python -m external_api.data_sources.replay --fixtures ./fixtures --latency-ms 50 --jitter-ms 20 --port 8900
+
+    async with ReplayServer("./fixtures", latency=0.05) as server:
+        server.attach(get_client())
+        await get_client().yahoo_finance.get_stock_info("AAPL")
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+
+from aiohttp import web
+
+logger = logging.getLogger("data_sources_replay")
+
+HOST_HEADER = "X-Original-Host"
+
+
+def _canonical_body(body: Any) -> str:
+    if body is None or body == "" or body == b"":
+        return ""
+    if isinstance(body, bytes):
+        body = body.decode("utf-8", errors="replace")
+    if isinstance(body, str):
+        try:
+            body = json.loads(body)
+        except ValueError:
+            return body
+    return json.dumps(body, sort_keys=True, ensure_ascii=False)
+
+
+def request_key(host: str, http_method: str, path: str, params: Optional[Mapping[str, Any]], body: Any) -> str:
+    """Stable key of a proxied request, shared by the recorder and the replay server"""
+    canonical = {
+        "host": host,
+        "method": http_method.upper(),
+        "path": "/" + path.lstrip("/"),
+        "params": sorted((str(k), str(v)) for k, v in (params or {}).items()),
+        "body": _canonical_body(body),
+    }
+    return hashlib.sha1(json.dumps(canonical, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class Recorder:
+    """Saves proxy responses as fixture files: <directory>/<source>/<method>/<key>.json"""
+
+    def __init__(self):
+        self.enabled = False
+        self.directory = "fixtures"
+        self._lock = threading.Lock()
+
+    def configure(self, enabled: Optional[bool] = None, directory: Optional[str] = None) -> None:
+        if directory is not None:
+            self.directory = directory
+        if enabled is not None:
+            self.enabled = enabled
+
+    def record(
+        self,
+        source_name: str,
+        operation: str,
+        proxy_url: str,
+        http_method: str,
+        url: str,
+        headers: Optional[Mapping[str, str]],
+        params: Optional[Mapping[str, Any]],
+        body: Any,
+        status: int,
+        content_type: str,
+        response_body: bytes,
+    ) -> None:
+        host = (headers or {}).get(HOST_HEADER, "")
+        path = url[len(proxy_url) :] if proxy_url and url.startswith(proxy_url) else urlsplit(url).path
+        key = request_key(host, http_method, path, params, body)
+        fixture = {
+            "source": source_name,
+            "operation": operation,
+            "request": {
+                "host": host,
+                "method": http_method.upper(),
+                "path": "/" + path.lstrip("/"),
+                "params": {str(k): str(v) for k, v in (params or {}).items()},
+                "body": _canonical_body(body),
+            },
+            "response": {
+                "status": status,
+                "content_type": content_type,
+                "body": response_body.decode("utf-8", errors="replace"),
+            },
+        }
+        directory = os.path.join(self.directory, source_name, operation)
+        try:
+            with self._lock:
+                os.makedirs(directory, exist_ok=True)
+                with open(os.path.join(directory, f"{key}.json"), "w", encoding="utf-8") as f:
+                    json.dump(fixture, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            logger.error(f"录制 {source_name}.{operation} 响应失败: {str(e)}")
+
+
+def load_fixtures(directory: str) -> Dict[str, Dict[str, Any]]:
+    """Load all fixture files under a directory, keyed by request key"""
+    fixtures: Dict[str, Dict[str, Any]] = {}
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(root, name), "r", encoding="utf-8") as f:
+                fixture = json.load(f)
+            request = fixture["request"]
+            key = request_key(request["host"], request["method"], request["path"], request["params"], request["body"])
+            fixtures[key] = fixture
+    return fixtures
+
+
+class ReplayServer:
+    """Local aiohttp stand-in for the external API proxy, serving recorded fixtures"""
+
+    def __init__(
+        self,
+        directory: str,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        """
+        Args:
+            directory: Fixture directory written by the recorder
+            latency: Base response delay in seconds
+            jitter: Random delay added or subtracted from `latency`, in seconds
+            host: Listen host
+            port: Listen port, 0 picks a free port
+        """
+        self.directory = directory
+        self.latency = latency
+        self.jitter = jitter
+        self.host = host
+        self.port = port
+        self.fixtures: Dict[str, Dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._runner: Optional[web.AppRunner] = None
+        self._attached: List[Tuple[Any, str]] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        body = await request.read()
+        key = request_key(request.headers.get(HOST_HEADER, ""), request.method, request.path, request.query, body)
+        fixture = self.fixtures.get(key)
+
+        delay = self.latency + random.uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if fixture is None:
+            self.misses += 1
+            logger.warning(f"No fixture for {request.method} {request.path_qs}")
+            return web.json_response({"error": f"No fixture for {request.method} {request.path_qs}"}, status=404)
+
+        self.hits += 1
+        response = fixture["response"]
+        return web.Response(
+            status=response["status"],
+            body=response["body"].encode("utf-8"),
+            content_type=response["content_type"].split(";")[0] or "application/json",
+        )
+
+    async def start(self) -> "ReplayServer":
+        self.fixtures = load_fixtures(self.directory)
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if self.port == 0:
+            self.port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+        logger.info(f"Replay server serving {len(self.fixtures)} fixtures at {self.url}")
+        return self
+
+    async def stop(self) -> None:
+        self.detach()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def attach(self, client: Any) -> None:
+        """Point every data source of an ApiClient at this server"""
+        for source in client._sources.values():
+            if hasattr(source, "proxy_url"):
+                self._attached.append((source, source.proxy_url))
+                source.proxy_url = self.url
+
+    def detach(self) -> None:
+        """Restore the proxy url of attached data sources"""
+        for source, proxy_url in self._attached:
+            source.proxy_url = proxy_url
+        self._attached.clear()
+
+    async def __aenter__(self) -> "ReplayServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+
+# 全局录制器
+recorder = Recorder()
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    server = ReplayServer(args.fixtures, args.latency_ms / 1000, args.jitter_ms / 1000, args.host, args.port)
+    await server.start()
+    print(f"Serving {len(server.fixtures)} fixtures at {server.url}, set external_api_proxy_url to this address")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded external API proxy responses")
+    parser.add_argument("--fixtures", default="fixtures", help="Fixture directory")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Base response latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random latency jitter")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_serve(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,127 @@
+"""
+K线本地重采样
+
+看板经常同时需要同一股票的 1m/5m/15m/60m/1d 等多个间隔，每个间隔单独请求一次 get-chart。
+这里在列式K线(price_bars.price_arrays 格式)上向量化地把细间隔聚合为粗间隔，只需请求最细的一个间隔:
+
+- 开盘价取区间内第一根K线，收盘价取最后一根，最高/最低价取极值，成交量求和
+- 日内间隔从每个交易日的第一根K线开始划分(与上游从开盘时间划分一致)，不跨交易日
+- 1d 按本地日期，1wk 按自然周(周一开始)，1mo 按自然月聚合
+- 聚合后K线的时间戳为区间内第一根K线的时间戳
+- 缺失的K线(价格为 NaN)不参与聚合，区间内全部缺失时不产生K线
+
+上游日线的成交量包含集合竞价等日内K线之外的成交，由日内K线聚合的日成交量可能略小。
+"""
+
+from typing import Dict, Iterable
+
+import numpy as np
+
+from .bar_store import INTERVAL_SECONDS
+from .price_bars import PRICE_FIELDS, with_dates
+
+# 按日历聚合的间隔
+CALENDAR_INTERVALS = ("1d", "1wk", "1mo")
+
+# 上游支持的间隔，从粗到细，选择基础间隔时依次尝试
+_UPSTREAM_INTERVALS = ("1mo", "1wk", "1d", "90m", "60m", "30m", "15m", "5m", "2m", "1m")
+
+
+def _intraday(interval: str) -> bool:
+    return interval in INTERVAL_SECONDS and interval not in CALENDAR_INTERVALS
+
+
+def can_resample(source: str, target: str) -> bool:
+    """Whether bars of the `target` interval can be aggregated from bars of the `source` interval"""
+    if source == target or (source in ("60m", "1h") and target in ("60m", "1h")):
+        return True
+    if _intraday(source) and _intraday(target):
+        return INTERVAL_SECONDS[target] % INTERVAL_SECONDS[source] == 0
+    return target in CALENDAR_INTERVALS and (_intraday(source) or (source == "1d" and target != "1d"))
+
+
+def base_interval(intervals: Iterable[str]) -> str:
+    """
+    The coarsest upstream interval all of `intervals` can be aggregated from, e.g. 30m for 60m and 90m
+
+    Raises:
+        ValueError: Unknown interval or no common base
+    """
+    intervals = list(dict.fromkeys(intervals))
+    if not intervals:
+        raise ValueError("At least one interval is required")
+    for interval in intervals:
+        if interval not in _UPSTREAM_INTERVALS and interval != "1h":
+            raise ValueError(f"Unsupported interval: {interval}, options: {', '.join(reversed(_UPSTREAM_INTERVALS))}")
+    for candidate in _UPSTREAM_INTERVALS:
+        if all(can_resample(candidate, interval) for interval in intervals):
+            return candidate
+    raise ValueError(f"Intervals {', '.join(intervals)} cannot be derived from one interval")
+
+
+def _bucket_starts(columns: Dict[str, np.ndarray], target: str) -> np.ndarray:
+    """Indices of the first bar of every target bucket in ascending columns"""
+    days = columns["date"].astype(np.int64)
+    if target == "1d":
+        keys = days
+    elif target == "1wk":
+        # 1970-01-01 是周四，加 3 天后按 7 天取整即以周一为一周的开始
+        keys = (days + 3) // 7
+    elif target == "1mo":
+        keys = columns["date"].astype("datetime64[M]").astype(np.int64)
+    else:
+        timestamps = columns["timestamp"]
+        day_change = np.ones(len(days), dtype=bool)
+        day_change[1:] = days[1:] != days[:-1]
+        # 每根K线所在交易日第一根K线的时间戳
+        session_open = timestamps[np.maximum.accumulate(np.where(day_change, np.arange(len(days)), 0))]
+        offsets = (timestamps - session_open) // INTERVAL_SECONDS[target]
+        change = day_change.copy()
+        change[1:] |= offsets[1:] != offsets[:-1]
+        return np.flatnonzero(change)
+    change = np.ones(len(keys), dtype=bool)
+    change[1:] = keys[1:] != keys[:-1]
+    return np.flatnonzero(change)
+
+
+def resample_price_columns(columns: Dict[str, np.ndarray], source: str, target: str) -> Dict[str, np.ndarray]:
+    """
+    Aggregate ascending price_arrays columns of the `source` interval into the `target` interval
+
+    Args:
+        columns: Columns in price_arrays layout, in timestamp order (as get_stock_price output="numpy" returns)
+        source: Interval of the columns
+        target: Coarser interval, see can_resample
+
+    Returns:
+        Dict[str, np.ndarray]: Columns in price_arrays layout, one row per target bar
+
+    Raises:
+        ValueError: `target` cannot be derived from `source`
+    """
+    if not can_resample(source, target):
+        raise ValueError(f"Cannot resample {source} bars to {target}")
+    if source == target:
+        return columns
+
+    # 跳过缺失的K线
+    present = ~(np.isnan(columns["open"]) & np.isnan(columns["close"]))
+    if not present.all():
+        columns = {name: values[present] for name, values in columns.items()}
+    timestamps = columns["timestamp"]
+    if not len(timestamps):
+        return with_dates(timestamps, {field: columns[field] for field in PRICE_FIELDS})
+
+    starts = _bucket_starts(columns, target)
+    ends = np.empty_like(starts)
+    ends[:-1] = starts[1:] - 1
+    ends[-1] = len(timestamps) - 1
+    fields = {
+        "open": columns["open"][starts],
+        # fmax/fmin 忽略个别字段缺失的 NaN
+        "high": np.fmax.reduceat(columns["high"], starts),
+        "low": np.fmin.reduceat(columns["low"], starts),
+        "close": columns["close"][ends],
+        "volume": np.add.reduceat(np.nan_to_num(columns["volume"]), starts),
+    }
+    return with_dates(timestamps[starts], fields)
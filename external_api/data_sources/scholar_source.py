@@ -5,11 +5,13 @@
 import asyncio
 import logging
 import math
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import aiohttp
 
 from .base import BaseAPI
+from .pagination import Paginator
+from .projection import Projection
 
 logger = logging.getLogger("scholar_source")
 
@@ -79,10 +81,9 @@ class ScholarSource(BaseAPI):
         request_url = f"{self.proxy_url}/scholar"
 
         try:
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.post(request_url, headers=self.headers, json=payload, timeout=self.timeout) as response:
-                    response.raise_for_status()
-                    data = await response.json()
+            data = await self._fetch_json(
+                "search_scholar", "POST", request_url, headers=self.headers, json=payload, timeout=self.timeout
+            )
 
             organic = data.get("organic", [])
 
@@ -221,3 +222,59 @@ class ScholarSource(BaseAPI):
         except Exception as e:
             logger.error(f"search_scholar error: {e}")
             return {"success": False, "error": str(e)}
+
+    def iter_scholar(
+        self,
+        query: str,
+        start_year: Optional[str] = None,
+        end_year: Optional[str] = None,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+        state: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Paginator:
+        """
+        Iterate over academic paper search results page by page, 20 papers per page.
+
+        The next page is requested while the current one is being processed, and iteration ends after the first page
+        with fewer than 20 papers. Use with `async for`.
+
+        Args:
+            query(str): Search keywords.
+            start_year(str): Start year, YYYY, default is None.
+            end_year(str): End year, YYYY, default is None.
+            max_items(Optional[int]): Maximum number of papers to yield, default None for all pages
+            prefetch(bool): Whether to prefetch the next page, default True
+            state(Optional[Dict[str, Any]]): `paginator.state.to_dict()` of an earlier iteration to resume from
+            fields(Optional[List[str]]): Only keep these fields of each paper, e.g. ["title", "link"]
+
+        Returns:
+            Paginator: Async iterator of papers in the same format as search_scholar,
+                `error` is set if a page failed and `state` can be saved to resume later
+
+        Example:
+            paginator = client.scholar.iter_scholar(query="machine learning", max_items=2000)
+            async for paper in paginator:
+                print(paper["title"])
+        """
+
+        page_size = 20
+
+        async def fetch_page(page: Optional[int], fields: Optional[List[str]] = None) -> Dict[str, Any]:
+            result = await self._fetch_scholar_page(query, page_size, page or 1, start_year, end_year)
+            if not result["success"]:
+                return result
+            data = {"papers": result["data"]}
+            projection = Projection.parse(fields)
+            return {"success": True, "data": data if projection is None else projection.apply(data)}
+
+        return Paginator(
+            fetch_page,
+            "papers",
+            # 不满一页说明已是最后一页
+            lambda data, page: (page or 1) + 1 if len(data["papers"]) >= page_size else None,
+            max_items=max_items,
+            prefetch=prefetch,
+            state=state,
+            fields=fields,
+        )
@@ -0,0 +1,254 @@
+"""
+流式 JSON 解析
+
+边下载边解析响应体，只构建选择器命中的子树，其余部分读过即丢，降低大响应的峰值内存。
+依赖可选的 ijson；未安装时退化为整体解码后再按同样的选择器遍历，结果相同。
+
+选择器使用 ijson 的前缀语法: 对象字段用 "." 连接，数组元素用 "item"，"*" 匹配任意一个字段名，例如:
+- "data.rooms.*": data.rooms 对象里的每个值
+- "data.item": data 数组里的每个元素
+"""
+
+import logging
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+from .codec import is_utf8, json_codec
+
+logger = logging.getLogger("data_sources_streaming")
+
+_VALUE_EVENTS = {"null", "boolean", "integer", "double", "number", "string"}
+
+
+def _matches(path: List[str], pattern: List[str]) -> bool:
+    return len(path) == len(pattern) and all(p == "*" or p == s for s, p in zip(path, pattern))
+
+
+def _leads_to(path: List[str], pattern: List[str]) -> bool:
+    return len(path) < len(pattern) and all(p == "*" or p == s for s, p in zip(path, pattern))
+
+
+# 记录响应开头的字节数上限，用于判断文档是否为空
+_HEAD_BYTES = 4096
+
+
+def _empty_document(head: bytes) -> bool:
+    """Whether a document starting with head is empty: no body, null or {}"""
+    head = head.lstrip()
+    return not head or head.startswith(b"null") or (head[:1] == b"{" and head[1:].lstrip()[:1] == b"}")
+
+
+class _Reader:
+    """Counts the bytes read and keeps the start of the body"""
+
+    def __init__(self):
+        self.bytes_read = 0
+        self.head = b""
+
+    def _seen(self, chunk: bytes) -> None:
+        self.bytes_read += len(chunk)
+        # 收集到前两个非空白字符为止
+        if len(self.head) < _HEAD_BYTES and len(b"".join(self.head.split())) < 2:
+            self.head += chunk[:_HEAD_BYTES]
+
+
+class _CountingReader(_Reader):
+    def __init__(self, stream: Any):
+        super().__init__()
+        self._stream = stream
+
+    async def read(self, size: int = -1) -> bytes:
+        chunk = await self._stream.read(size)
+        self._seen(chunk)
+        return chunk
+
+
+class JsonValueStream:
+    """
+    Async iterator of (path, value) pairs for every selected value of a JSON document
+
+    Args:
+        reader: Object with an async read(size) method, e.g. aiohttp's response.content
+        selectors: Paths of the values to materialize
+        exclude: Paths that match a selector but should not be built as a whole, only
+            descended into (e.g. select "data.*" but exclude "data.rooms" and select "data.rooms.*")
+        charset: Charset of the body; ijson only reads UTF-8, other charsets are decoded whole
+    """
+
+    def __init__(
+        self, reader: Optional[Any], selectors: Sequence[str], exclude: Sequence[str] = (), charset: Optional[str] = None
+    ):
+        self._reader = _CountingReader(reader) if reader is not None else None
+        self._charset = charset
+        self._document: Any = None
+        self._selectors = [selector.split(".") for selector in selectors]
+        self._exclude = [path.split(".") for path in exclude]
+        # 根对象中出现过的字段名，用于判断响应是否为空; 走 ijson C 实现的快速路径且没有命中任何值时，
+        # 只能从响应开头判断是否为空，非空时为 None
+        self.top_level_keys: Optional[Set[str]] = set()
+
+    @classmethod
+    def from_document(cls, document: Any, selectors: Sequence[str], exclude: Sequence[str] = ()) -> "JsonValueStream":
+        """Walk an already decoded document with the same selectors"""
+        stream = cls(None, selectors, exclude)
+        stream._document = document
+        return stream
+
+    @property
+    def bytes_read(self) -> int:
+        return self._reader.bytes_read if self._reader is not None else 0
+
+    def _selected(self, path: List[str]) -> bool:
+        return any(_matches(path, selector) for selector in self._selectors) and not any(
+            _matches(path, excluded) for excluded in self._exclude
+        )
+
+    def _walk(self, node: Any, path: List[str]) -> Iterator[Tuple[str, Any]]:
+        if self._selected(path):
+            yield ".".join(path), node
+            return
+        if not any(_leads_to(path, selector) for selector in self._selectors):
+            return
+        if isinstance(node, dict):
+            for key, value in node.items():
+                yield from self._walk(value, path + [key])
+        elif isinstance(node, list):
+            for value in node:
+                yield from self._walk(value, path + ["item"])
+
+    async def __aiter__(self) -> AsyncIterator[Tuple[str, Any]]:
+        if self._reader is None or ijson is None or not is_utf8(self._charset):
+            document = self._document
+            if self._reader is not None:
+                chunks = []
+                while True:
+                    chunk = await self._reader.read(65536)
+                    if not chunk:
+                        break
+                    chunks.append(chunk)
+                document = json_codec.loads_body(b"".join(chunks), self._charset)
+            if isinstance(document, dict):
+                self.top_level_keys.update(document)  # type: ignore[union-attr]
+            for item in self._walk(document, []):
+                yield item
+            return
+
+        try:
+            async for item in self._parse():
+                yield item
+        except ijson.IncompleteJSONError:
+            # 与整体解码一致，空响应体视为空文档
+            if self._reader.head.strip():
+                raise
+
+    async def _parse(self) -> AsyncIterator[Tuple[str, Any]]:
+        if len(self._selectors) == 1 and not self._exclude and "*" not in self._selectors[0][:-1]:
+            # 单个选择器时由 ijson 的 C 实现直接构建对象，比逐个事件处理快数倍
+            selector = self._selectors[0]
+            yielded = False
+            if selector[-1] == "*":
+                prefix = ".".join(selector[:-1])
+                async for key, value in ijson.kvitems_async(self._reader, prefix, use_float=True):
+                    yielded = True
+                    yield f"{prefix}.{key}" if prefix else key, value
+            else:
+                prefix = ".".join(selector)
+                async for value in ijson.items_async(self._reader, prefix, use_float=True):
+                    yielded = True
+                    yield prefix, value
+            if yielded:
+                self.top_level_keys.add(prefix.split(".")[0] if prefix else "")  # type: ignore[union-attr]
+            elif not _empty_document(self._reader.head):
+                self.top_level_keys = None
+            return
+
+        builder: Optional[Any] = None
+        building_prefix = ""
+        depth = 0
+        skipping = 0
+        # 每个前缀只判断一次: True 为选中，False 为需要继续向下查找，None 为整个子树都不需要
+        decisions: Dict[str, Optional[bool]] = {}
+        async for prefix, event, value in ijson.parse_async(self._reader, use_float=True):
+            if skipping:
+                # 跳过不需要的子树，只跟踪嵌套深度
+                if event in ("start_map", "start_array"):
+                    skipping += 1
+                elif event in ("end_map", "end_array"):
+                    skipping -= 1
+                continue
+
+            if builder is not None:
+                builder.event(event, value)
+                if event in ("start_map", "start_array"):
+                    depth += 1
+                elif event in ("end_map", "end_array"):
+                    depth -= 1
+                if depth == 0:
+                    yield building_prefix, builder.value
+                    builder = None
+                continue
+
+            if event == "map_key":
+                if prefix == "":
+                    self.top_level_keys.add(value)  # type: ignore[union-attr]
+                continue
+            if event in ("end_map", "end_array"):
+                continue
+
+            if prefix in decisions:
+                decision = decisions[prefix]
+            else:
+                path = prefix.split(".") if prefix else []
+                if self._selected(path):
+                    decision = True
+                elif any(_leads_to(path, selector) for selector in self._selectors):
+                    decision = False
+                else:
+                    decision = None
+                decisions[prefix] = decision
+            if not decision:
+                if decision is None and event in ("start_map", "start_array"):
+                    skipping = 1
+                continue
+            if event in _VALUE_EVENTS:
+                yield prefix, value
+            else:
+                builder = ijson.ObjectBuilder()
+                builder.event(event, value)
+                building_prefix = prefix
+                depth = 1
+
+
+class StreamingConfig:
+    """Whether sources should use streaming parsing
+
+    Streaming trades CPU for memory, so responses whose Content-Length is below
+    `threshold_bytes` are still read whole and decoded with the fast codec.
+    """
+
+    def __init__(self, enabled: bool = True, threshold_bytes: int = 8 * 1024 * 1024):
+        self._enabled = enabled
+        self.threshold_bytes = threshold_bytes
+
+    def configure(self, enabled: Optional[bool] = None, threshold_bytes: Optional[int] = None) -> None:
+        if enabled is not None:
+            self._enabled = enabled
+        if threshold_bytes is not None:
+            self.threshold_bytes = threshold_bytes
+
+    def should_stream(self, content_length: Optional[int]) -> bool:
+        """Whether a response of this size should be streamed, unknown sizes are streamed"""
+        return content_length is None or content_length >= self.threshold_bytes
+
+    @property
+    def enabled(self) -> bool:
+        """Streaming is used only when enabled and ijson is installed"""
+        return self._enabled and ijson is not None
+
+
+# 全局流式解析开关
+json_stream = StreamingConfig()
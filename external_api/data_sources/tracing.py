@@ -0,0 +1,289 @@
+"""
+数据源调用链路追踪
+
+每次数据源方法调用生成一条记录，区分网络耗时和解析耗时:
+- 每个HTTP请求: DNS、建连、首字节(TTFB)、响应体下载、JSON解码
+- 整个方法调用: 总耗时、网络耗时(至少有一个请求在进行中的时间)、解析/转换耗时(总耗时减去网络耗时)
+
+记录写入可插拔的 TraceSink, 默认是 JSONL 文件。
+"""
+
+import contextvars
+import json
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import aiohttp
+
+logger = logging.getLogger("data_sources_tracing")
+
+
+class TraceSink(ABC):
+    """Destination of trace records"""
+
+    @abstractmethod
+    def emit(self, record: Dict[str, Any]) -> None:
+        """Write one trace record"""
+        pass
+
+    def close(self) -> None:
+        """Release resources held by the sink"""
+        pass
+
+
+class JsonlTraceSink(TraceSink):
+    """Append trace records to a JSONL file, one record per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = None
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class MemoryTraceSink(TraceSink):
+    """Keep trace records in memory, useful for benchmarks and ad-hoc analysis"""
+
+    def __init__(self):
+        self.records: List[Dict[str, Any]] = []
+
+    def emit(self, record: Dict[str, Any]) -> None:
+        self.records.append(record)
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+class RequestTrace:
+    """Timings of a single HTTP request"""
+
+    def __init__(self, http_method: str, url: str):
+        self.http_method = http_method
+        self.url = url
+        self.started = time.perf_counter()
+        self.dns_start: Optional[float] = None
+        self.dns: Optional[float] = None
+        self.connect_start: Optional[float] = None
+        self.connect: Optional[float] = None
+        self.reused_connection = False
+        self.ttfb: Optional[float] = None
+        self.download: Optional[float] = None
+        self.decode: Optional[float] = None
+        self.total: Optional[float] = None
+        self.status: Optional[int] = None
+        self.bytes: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        # 建连时间包含DNS解析，这里拆开单独记录
+        connect = self.connect
+        if connect is not None and self.dns is not None:
+            connect = max(connect - self.dns, 0.0)
+        return {
+            "method": self.http_method,
+            "url": self.url,
+            "status": self.status,
+            "dns_ms": _ms(self.dns),
+            "connect_ms": _ms(connect),
+            "reused_connection": self.reused_connection,
+            "ttfb_ms": _ms(self.ttfb),
+            "download_ms": _ms(self.download),
+            "decode_ms": _ms(self.decode),
+            "total_ms": _ms(self.total),
+            "bytes": self.bytes,
+            "error": self.error,
+        }
+
+
+class CallTrace:
+    """Trace of one data source method call"""
+
+    def __init__(self, source_name: str, method_name: str, parent: Optional["CallTrace"] = None):
+        self.source_name = source_name
+        self.method_name = method_name
+        self.parent = parent
+        self.timestamp = time.time()
+        self.started = time.perf_counter()
+        self.requests: List[RequestTrace] = []
+        self._in_flight = 0
+        self._busy_since = 0.0
+        self._network = 0.0
+
+    def _request_started(self, now: float) -> None:
+        if self._in_flight == 0:
+            self._busy_since = now
+        self._in_flight += 1
+        if self.parent is not None:
+            self.parent._request_started(now)
+
+    def _request_finished(self, now: float) -> None:
+        self._in_flight -= 1
+        if self._in_flight == 0:
+            self._network += now - self._busy_since
+        if self.parent is not None:
+            self.parent._request_finished(now)
+
+    def finish(self, success: Optional[bool], error: Optional[str] = None) -> Dict[str, Any]:
+        total = time.perf_counter() - self.started
+        network = min(self._network, total)
+        return {
+            "timestamp": self.timestamp,
+            "source": self.source_name,
+            "method": self.method_name,
+            "success": success,
+            "error": error,
+            "total_ms": _ms(total),
+            "network_ms": _ms(network),
+            "transform_ms": _ms(total - network),
+            "requests": [request.to_dict() for request in self.requests],
+        }
+
+
+_current_call: contextvars.ContextVar[Optional[CallTrace]] = contextvars.ContextVar("data_source_call_trace", default=None)
+
+
+async def _on_dns_start(session, ctx, params) -> None:
+    request = ctx.trace_request_ctx
+    if isinstance(request, RequestTrace):
+        request.dns_start = time.perf_counter()
+
+
+async def _on_dns_end(session, ctx, params) -> None:
+    request = ctx.trace_request_ctx
+    if isinstance(request, RequestTrace) and request.dns_start is not None:
+        request.dns = time.perf_counter() - request.dns_start
+
+
+async def _on_connection_start(session, ctx, params) -> None:
+    request = ctx.trace_request_ctx
+    if isinstance(request, RequestTrace):
+        request.connect_start = time.perf_counter()
+
+
+async def _on_connection_end(session, ctx, params) -> None:
+    request = ctx.trace_request_ctx
+    if isinstance(request, RequestTrace) and request.connect_start is not None:
+        request.connect = time.perf_counter() - request.connect_start
+
+
+async def _on_connection_reuse(session, ctx, params) -> None:
+    request = ctx.trace_request_ctx
+    if isinstance(request, RequestTrace):
+        request.reused_connection = True
+
+
+async def _on_request_end(session, ctx, params) -> None:
+    # aiohttp 在收到响应头时触发 on_request_end
+    request = ctx.trace_request_ctx
+    if isinstance(request, RequestTrace):
+        request.ttfb = time.perf_counter() - request.started
+        request.status = params.response.status
+
+
+def _build_trace_config() -> aiohttp.TraceConfig:
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(_on_dns_start)
+    trace_config.on_dns_resolvehost_end.append(_on_dns_end)
+    trace_config.on_connection_create_start.append(_on_connection_start)
+    trace_config.on_connection_create_end.append(_on_connection_end)
+    trace_config.on_connection_reuseconn.append(_on_connection_reuse)
+    trace_config.on_request_end.append(_on_request_end)
+    return trace_config
+
+
+class Tracer:
+    """Creates call traces and forwards finished ones to the sink"""
+
+    def __init__(self):
+        self.enabled = False
+        self.sink: Optional[TraceSink] = None
+        self._trace_config: Optional[aiohttp.TraceConfig] = None
+
+    def configure(self, enabled: Optional[bool] = None, path: Optional[str] = None, sink: Optional[TraceSink] = None) -> None:
+        """
+        Args:
+            enabled: Turn tracing on or off
+            path: Path of the default JSONL sink, used when no sink is given
+            sink: Custom sink, replaces the current one
+        """
+        if sink is not None or path is not None:
+            if self.sink is not None:
+                self.sink.close()
+            self.sink = sink if sink is not None else JsonlTraceSink(path)  # type: ignore[arg-type]
+        if enabled is not None:
+            self.enabled = enabled
+
+    def trace_configs(self) -> List[aiohttp.TraceConfig]:
+        """TraceConfigs to pass to aiohttp.ClientSession, empty when the current call is not traced"""
+        if _current_call.get() is None:
+            return []
+        if self._trace_config is None:
+            self._trace_config = _build_trace_config()
+        return [self._trace_config]
+
+    @contextmanager
+    def call(self, source_name: str, method_name: str) -> Iterator[Optional[CallTrace]]:
+        """Trace one data source method call"""
+        if not self.enabled or self.sink is None:
+            yield None
+            return
+        trace = CallTrace(source_name, method_name, _current_call.get())
+        token = _current_call.set(trace)
+        try:
+            yield trace
+        finally:
+            _current_call.reset(token)
+
+    def emit(self, trace: CallTrace, success: Optional[bool], error: Optional[str] = None) -> None:
+        if self.sink is None:
+            return
+        try:
+            self.sink.emit(trace.finish(success, error))
+        except Exception as e:
+            logger.error(f"写入追踪记录失败: {str(e)}")
+
+    @contextmanager
+    def request(self, http_method: str, url: str) -> Iterator[Optional[RequestTrace]]:
+        """Trace one HTTP request of the current call
+
+        The yielded RequestTrace is passed to aiohttp as trace_request_ctx; callers fill in
+        download/decode timings themselves.
+        """
+        call = _current_call.get()
+        if call is None:
+            yield None
+            return
+        request = RequestTrace(http_method, url)
+        call.requests.append(request)
+        call._request_started(request.started)
+        try:
+            yield request
+        except BaseException as e:
+            request.error = f"{type(e).__name__}: {str(e)}"
+            raise
+        finally:
+            now = time.perf_counter()
+            request.total = now - request.started
+            call._request_finished(now)
+
+
+# 全局追踪器
+tracer = Tracer()
@@ -2,13 +2,13 @@
 TripAdvisor Officical API data source implementation
 """
 
+import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
-
-import httpx
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 
 from .base import BaseAPI
+from .streaming import JsonValueStream, json_stream
 
 logger = logging.getLogger("tripadvisor_official_source")
 
@@ -29,17 +29,42 @@ class TripAdvisorSource(BaseAPI):
         }
 
 
-    async def _make_api_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    async def _make_api_request(self, operation: str, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make a request to the Tripadvisor Content API"""
         url = f"{self.proxy_url}/api/v1/{endpoint}"
-        
+
+        if params is None:
+            params = {}
+
+        return await self._fetch_json(
+            operation, "GET", url, headers=self.headers, params=params, timeout=self.timeout, content_type=None
+        )
+
+    async def _stream_api_request(
+        self,
+        operation: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]],
+        consume: Callable[[JsonValueStream], Awaitable[Any]],
+        selectors: List[str],
+    ) -> Any:
+        """Make a request to the Tripadvisor Content API and parse the response incrementally"""
+        url = f"{self.proxy_url}/api/v1/{endpoint}"
+
         if params is None:
             params = {}
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
-            return response.json()
+        return await self._stream_json(
+            operation,
+            "GET",
+            url,
+            consume,
+            selectors,
+            headers=self.headers,
+            params=params,
+            timeout=self.timeout,
+            content_type=None,
+        )
 
     @property
     def source_name(self) -> str:
@@ -108,7 +133,7 @@ class TripAdvisorSource(BaseAPI):
             params["latLong"] = latLong
 
         try:
-            data = await self._make_api_request("location/search", params)
+            data = await self._make_api_request("search_locations", "location/search", params)
             if not data:
                 return {"success": False, "error": "No data returned from Tripadvisor API"}
             if not data.get("data", None):
@@ -164,7 +189,7 @@ class TripAdvisorSource(BaseAPI):
             params["category"] = category
 
         try:
-            data = await self._make_api_request("location/nearby_search", params)
+            data = await self._make_api_request("search_nearby_locations", "location/nearby_search", params)
             if not data:
                 return {"success": False, "error": "No data returned from Tripadvisor API"}
 
@@ -277,7 +302,7 @@ class TripAdvisorSource(BaseAPI):
         location_id_str = str(locationId)
 
         try:
-            data = await self._make_api_request(f"location/{location_id_str}/details", params)
+            data = await self._make_api_request("get_location_details", f"location/{location_id_str}/details", params)
             if not data:
                 return {"success": False, "error": "No data returned from Tripadvisor API"}
 
@@ -348,7 +373,7 @@ class TripAdvisorSource(BaseAPI):
         location_id_str = str(locationId)
 
         try:
-            data = await self._make_api_request(f"location/{location_id_str}/reviews", params)
+            data = await self._make_api_request("get_location_reviews", f"location/{location_id_str}/reviews", params)
             if not data:
                 return {"success": False, "error": "No data returned from Tripadvisor API"}
 
@@ -403,7 +428,17 @@ class TripAdvisorSource(BaseAPI):
         location_id_str = str(locationId)
 
         try:
-            data = await self._make_api_request(f"location/{location_id_str}/photos", params)
+            if json_stream.enabled:
+                # 流式解析，照片逐个解析，不在内存中保留完整响应
+                return await self._stream_api_request(
+                    "get_location_photos",
+                    f"location/{location_id_str}/photos",
+                    params,
+                    self._consume_photos_stream,
+                    ["data.item"],
+                )
+
+            data = await self._make_api_request("get_location_photos", f"location/{location_id_str}/photos", params)
             if not data:
                 return {"success": False, "error": "No data returned from Tripadvisor API"}
 
@@ -540,23 +575,29 @@ class TripAdvisorSource(BaseAPI):
 
         return location_details
 
+    async def _consume_photos_stream(self, stream: JsonValueStream) -> Dict[str, Any]:
+        """流式解析地点照片响应"""
+        photos = [self._parse_photo(photo_data) async for _, photo_data in stream]
+        if not photos and stream.top_level_keys is not None and not stream.top_level_keys:
+            return {"success": False, "error": "No data returned from Tripadvisor API"}
+        return {"success": True, "data": photos}
+
     def _parse_photos(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """解析地点照片数据"""
-        photos = []
-        for photo_data in data.get("data", []):
-            photo = {
-                "id": photo_data.get("id", ""),  # 照片 id
-                "is_blessed": photo_data.get("is_blessed", False),  # 是否被认证
-                "caption": photo_data.get("caption", ""),  # 照片描述
-                "published_date": self._parse_date2(photo_data.get("published_date", "")),  # 照片发布时间
-                "images": photo_data.get("images", {}).get("original", {}).get("url", ""),  # 图片 url
-                "album": photo_data.get("album", ""),  # 照片所属相册
-                "source": photo_data.get("source", {}),  # 照片来源
-                "user": photo_data.get("user", {}),  # 照片上传者
-            }
-            photos.append(photo)
+        return [self._parse_photo(photo_data) for photo_data in data.get("data", [])]
 
-        return photos
+    def _parse_photo(self, photo_data: Dict[str, Any]) -> Dict[str, Any]:
+        """解析单张照片数据"""
+        return {
+            "id": photo_data.get("id", ""),  # 照片 id
+            "is_blessed": photo_data.get("is_blessed", False),  # 是否被认证
+            "caption": photo_data.get("caption", ""),  # 照片描述
+            "published_date": self._parse_date2(photo_data.get("published_date", "")),  # 照片发布时间
+            "images": photo_data.get("images", {}).get("original", {}).get("url", ""),  # 图片 url
+            "album": photo_data.get("album", ""),  # 照片所属相册
+            "source": photo_data.get("source", {}),  # 照片来源
+            "user": photo_data.get("user", {}),  # 照片上传者
+        }
 
     def _parse_date(self, date_str: str) -> str:
         """解析日期字符串"""
@@ -591,6 +632,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    import asyncio
-
     asyncio.run(main())
@@ -3,14 +3,17 @@ Twitter data source implementation
 """
 
 import asyncio
-import json
 import logging
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import aiohttp
 
 from .base import BaseAPI
+from .codec import json_codec
+from .pagination import Paginator
+from .projection import Projection, child, current_projection, wants
+from .records import Tweet, check_output
 
 logger = logging.getLogger("twitter_source")
 
@@ -52,6 +55,7 @@ class TwitterSource(BaseAPI):
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         cursor: Optional[str] = None,
+        output: str = "dicts",
     ) -> Dict[str, Any]:
         """
         Search for tweets.
@@ -66,6 +70,8 @@ class TwitterSource(BaseAPI):
             start_date (Optional[str]): Start date, format: YYYY-MM-DD, default is None
             end_date (Optional[str]): End date, format: YYYY-MM-DD, default is None
             cursor (Optional[str]): Pagination cursor, used to get next page results, default is None for first page
+            output (str): Format of the tweet list, "dicts" (default) or "records" for compact Tweet objects
+                (attribute access, convert with to_dict())
 
         Returns:
             Dict[str, Any]: Dictionary containing tweet search results, e.g.
@@ -124,6 +130,8 @@ class TwitterSource(BaseAPI):
         #     ...     print(f"Search failed: {result['error']}")
         # """
         try:
+            check_output(output)
+
             # 构建查询参数
             params = {
                 "query": query,
@@ -148,15 +156,13 @@ class TwitterSource(BaseAPI):
             request_url = f"{self.proxy_url}/search/search"
 
             # 使用aiohttp发送异步请求
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                    response.raise_for_status()
-                    # 解析响应
-                    data = await response.json(content_type=None)
+            data = await self._fetch_json(
+                "search_tweets", "GET", request_url, headers=self.headers, params=params, timeout=self._timeout, content_type=None
+            )
 
             # API返回的是JSON字符串，需要先解析
             if isinstance(data, str):
-                data = json.loads(data)
+                data = json_codec.loads(data)
 
             if not isinstance(data, dict):
                 raise ValueError(f"Invalid API response format: {data}")
@@ -164,6 +170,8 @@ class TwitterSource(BaseAPI):
             if "results" not in data:
                 raise ValueError(f"Missing results field in API response: {data}")
 
+            # 未请求的子结构(作者、互动数据)不构建
+            tweet_projection = child(current_projection(), "tweets", "*")
             tweets = []
             for result in data["results"]:
                 if not isinstance(result, dict):
@@ -176,24 +184,20 @@ class TwitterSource(BaseAPI):
                     "text": result.get("text", ""),
                     "media_urls": result.get("media_urls", []) if isinstance(result.get("media_urls"), list) else [],
                     "video_urls": result.get("video_urls", []) if isinstance(result.get("video_urls"), list) else [],
-                    "author": {
-                        "id": str(result.get("user", {}).get("user_id")),
-                        "name": result.get("user", {}).get("name"),
-                        "username": result.get("user", {}).get("username"),
-                        "followers_count": result.get("user", {}).get("follower_count", 0),
-                        "is_verified": result.get("user", {}).get("is_verified", False),
-                        "is_blue_verified": result.get("user", {}).get("is_blue_verified", False),
-                    },
-                    "public_metrics": {
-                        "retweet_count": result.get("retweet_count", 0),
-                        "reply_count": result.get("reply_count", 0),
-                        "like_count": result.get("favorite_count", 0),
-                        "quote_count": result.get("quote_count", 0),
-                        "view_count": result.get("views", 0),
-                        "bookmark_count": result.get("bookmark_count", 0),
-                    },
                 }
-                tweets.append(tweet)
+                if wants(tweet_projection, "author"):
+                    user = result.get("user", {})
+                    tweet["author"] = {
+                        "id": str(user.get("user_id")),
+                        "name": user.get("name"),
+                        "username": user.get("username"),
+                        "followers_count": user.get("follower_count", 0),
+                        "is_verified": user.get("is_verified", False),
+                        "is_blue_verified": user.get("is_blue_verified", False),
+                    }
+                if wants(tweet_projection, "public_metrics"):
+                    tweet["public_metrics"] = self._parse_public_metrics(result)
+                tweets.append(Tweet.from_dict(tweet) if output == "records" else tweet)
 
             return {
                 "success": True,
@@ -273,15 +277,13 @@ class TwitterSource(BaseAPI):
                 params["user_id"] = user_id
 
             # 使用aiohttp发送异步请求
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                    response.raise_for_status()
-                    # 解析响应
-                    data = await response.json(content_type=None)
+            data = await self._fetch_json(
+                "get_user_info", "GET", request_url, headers=self.headers, params=params, timeout=self._timeout, content_type=None
+            )
 
             # 解析响应数据
             if isinstance(data, str):
-                data = json.loads(data)
+                data = json_codec.loads(data)
 
             if not isinstance(data, dict):
                 raise ValueError(f"Invalid API response format: {data}")
@@ -304,7 +306,14 @@ class TwitterSource(BaseAPI):
             return {"success": False, "error": error_msg}
 
     async def get_user_tweets(
-        self, username: str, limit: int = 10, user_id: Optional[str] = None, include_replies: bool = False, include_pinned: bool = False
+        self,
+        username: str,
+        limit: int = 10,
+        user_id: Optional[str] = None,
+        include_replies: bool = False,
+        include_pinned: bool = False,
+        cursor: Optional[str] = None,
+        output: str = "dicts",
     ) -> Dict[str, Any]:
         """
         Get a list of tweets from a Twitter user.
@@ -315,6 +324,9 @@ class TwitterSource(BaseAPI):
             user_id (Optional[str]): Twitter user ID, default is None, if provided user_id, username will be ignored
             include_replies (bool): Whether to include reply tweets, default is False
             include_pinned (bool): Whether to include pinned tweets, default is False
+            cursor (Optional[str]): Pagination cursor, used to get next page results, default is None for first page
+            output (str): Format of the tweet list, "dicts" (default) or "records" for compact Tweet objects
+                (attribute access, convert with to_dict())
 
         Returns:
             Dict[str, Any]: Dictionary containing user tweet list, e.g.
@@ -369,6 +381,8 @@ class TwitterSource(BaseAPI):
         #     ...     print(f"Failed to get tweets: {result['error']}")
         # """
         try:
+            check_output(output)
+
             # 构建请求URL
             request_url = f"{self.proxy_url}/user/tweets"
 
@@ -382,17 +396,17 @@ class TwitterSource(BaseAPI):
 
             if user_id:
                 params["user_id"] = user_id
+            if cursor:
+                params["continuation_token"] = cursor
 
             # 使用aiohttp发送异步请求
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                    response.raise_for_status()
-                    # 解析响应
-                    data = await response.json(content_type=None)
+            data = await self._fetch_json(
+                "get_user_tweets", "GET", request_url, headers=self.headers, params=params, timeout=self._timeout, content_type=None
+            )
 
             # 解析响应数据
             if isinstance(data, str):
-                data = json.loads(data)
+                data = json_codec.loads(data)
 
             if not isinstance(data, dict):
                 raise ValueError(f"Invalid API response format: {data}")
@@ -400,11 +414,12 @@ class TwitterSource(BaseAPI):
             if "results" not in data:
                 raise ValueError(f"Missing results field in API response: {data}")
 
+            tweet_projection = child(current_projection(), "tweets", "*")
             tweets = []
             for result in data["results"]:
-                tweet = self._parse_tweet_with_ref(result)
+                tweet = self._parse_tweet_with_ref(result, tweet_projection)
 
-                tweets.append(tweet)
+                tweets.append(Tweet.from_dict(tweet) if output == "records" else tweet)
 
             return {
                 "success": True,
@@ -425,6 +440,116 @@ class TwitterSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
+    def iter_search_tweets(
+        self,
+        query: str,
+        limit: int = 20,
+        lang: Optional[str] = None,
+        min_retweets: Optional[int] = None,
+        min_likes: Optional[int] = None,
+        min_replies: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        output: str = "dicts",
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+        state: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Paginator:
+        """
+        Iterate over tweet search results across pages.
+
+        The next page is requested while the current one is being processed. Use with `async for`.
+
+        Args:
+            query (str): Search keyword, e.g. "Tesla" or "#TSLA"
+            limit (int): Number of tweets per page, default is 20
+            lang (Optional[str]): Language code, zh for Chinese, en for English, default is None
+            min_retweets (Optional[int]): Minimum number of retweets, default is None
+            min_likes (Optional[int]): Minimum number of likes, default is None
+            min_replies (Optional[int]): Minimum number of replies, default is None
+            start_date (Optional[str]): Start date, format: YYYY-MM-DD, default is None
+            end_date (Optional[str]): End date, format: YYYY-MM-DD, default is None
+            output (str): "dicts" (default) or "records" for compact Tweet objects
+            max_items (Optional[int]): Maximum number of tweets to yield, default is None for all pages
+            prefetch (bool): Whether to prefetch the next page, default is True
+            state (Optional[Dict[str, Any]]): `paginator.state.to_dict()` of an earlier iteration to resume from
+            fields (Optional[List[str]]): Only keep these fields of each tweet, e.g. ["id", "text"]
+
+        Returns:
+            Paginator: Async iterator of tweets in the same format as search_tweets,
+                `error` is set if a page failed and `state` can be saved to resume later
+
+        Example:
+            paginator = client.twitter.iter_search_tweets(query="Tesla", max_items=200)
+            async for tweet in paginator:
+                print(tweet["text"])
+            if paginator.error:
+                print(f"Search failed: {paginator.error}")
+        """
+        return Paginator(
+            lambda cursor, **kwargs: self.search_tweets(
+                query, limit, lang, min_retweets, min_likes, min_replies, start_date, end_date, cursor, output, **kwargs
+            ),
+            "tweets",
+            lambda data, cursor: data.get("cursor"),
+            max_items=max_items,
+            prefetch=prefetch,
+            state=state,
+            fields=fields,
+        )
+
+    def iter_user_tweets(
+        self,
+        username: str,
+        limit: int = 20,
+        user_id: Optional[str] = None,
+        include_replies: bool = False,
+        include_pinned: bool = False,
+        output: str = "dicts",
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+        state: Optional[Dict[str, Any]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Paginator:
+        """
+        Iterate over a Twitter user's tweets across pages.
+
+        The next page is requested while the current one is being processed. Use with `async for`.
+
+        Args:
+            username (str): Twitter username without @ symbol
+            limit (int): Number of tweets per page, default is 20
+            user_id (Optional[str]): Twitter user ID, default is None, if provided user_id, username will be ignored
+            include_replies (bool): Whether to include reply tweets, default is False
+            include_pinned (bool): Whether to include pinned tweets, default is False
+            output (str): "dicts" (default) or "records" for compact Tweet objects
+            max_items (Optional[int]): Maximum number of tweets to yield, default is None for all pages
+            prefetch (bool): Whether to prefetch the next page, default is True
+            state (Optional[Dict[str, Any]]): `paginator.state.to_dict()` of an earlier iteration to resume from
+            fields (Optional[List[str]]): Only keep these fields of each tweet, e.g. ["id", "text"]
+
+        Returns:
+            Paginator: Async iterator of tweets in the same format as get_user_tweets,
+                `error` is set if a page failed and `state` can be saved to resume later
+
+        Example:
+            paginator = client.twitter.iter_user_tweets(username="elonmusk", max_items=100)
+            async for tweet in paginator:
+                print(tweet["created_at"], tweet["text"])
+        """
+        return Paginator(
+            lambda cursor, **kwargs: self.get_user_tweets(
+                username, limit, user_id, include_replies, include_pinned, cursor, output, **kwargs
+            ),
+            "tweets",
+            lambda data, cursor: data.get("cursor"),
+            max_items=max_items,
+            prefetch=prefetch,
+            state=state,
+            fields=fields,
+        )
+
     def _format_date(self, date_str: Optional[str]) -> Optional[str]:
         """Format date string"""
         if not date_str:
@@ -460,7 +585,17 @@ class TwitterSource(BaseAPI):
             "bot": data.get("bot", False),
         }
 
-    def _parse_tweet_without_ref(self, result: dict[str, Any]) -> dict[str, Any]:
+    def _parse_public_metrics(self, result: dict[str, Any]) -> dict[str, Any]:
+        return {
+            "retweet_count": result.get("retweet_count", 0),
+            "reply_count": result.get("reply_count", 0),
+            "like_count": result.get("favorite_count", 0),
+            "quote_count": result.get("quote_count", 0),
+            "view_count": result.get("views", 0),
+            "bookmark_count": result.get("bookmark_count", 0),
+        }
+
+    def _parse_tweet_without_ref(self, result: dict[str, Any], projection: Optional[Projection] = None) -> dict[str, Any]:
         media_urls = []
         if result.get("media_url"):
             if isinstance(result["media_url"], list):
@@ -483,37 +618,36 @@ class TwitterSource(BaseAPI):
             "language": result.get("language"),
             "media_urls": media_urls,
             "video_urls": video_urls,
-            "public_metrics": {
-                "retweet_count": result.get("retweet_count", 0),
-                "reply_count": result.get("reply_count", 0),
-                "like_count": result.get("favorite_count", 0),
-                "quote_count": result.get("quote_count", 0),
-                "view_count": result.get("views", 0),
-                "bookmark_count": result.get("bookmark_count", 0),
-            },
-            "user": self._parse_user_info(result.get("user", {})),
         }
+        if wants(projection, "public_metrics"):
+            tweet["public_metrics"] = self._parse_public_metrics(result)
+        if wants(projection, "user"):
+            tweet["user"] = self._parse_user_info(result.get("user", {}))
 
         return tweet
 
-    def _parse_tweet_with_ref(self, result: dict[str, Any]) -> dict[str, Any]:
-        """Parse tweet data"""
+    def _parse_tweet_with_ref(self, result: dict[str, Any], projection: Optional[Projection] = None) -> dict[str, Any]:
+        """Parse tweet data, skipping sub-structures the projection does not request"""
 
-        tweet = self._parse_tweet_without_ref(result)
+        tweet = self._parse_tweet_without_ref(result, projection)
+        if not wants(projection, "referenced_tweets"):
+            return tweet
 
         # 处理引用推文
+        ref_projection = child(projection, "referenced_tweets")
+        ref_quoted_projection = child(ref_projection, "quoted_status")
         referenced_tweets: dict[str, Any] = {}
         if result.get("in_reply_to_status_id"):
             referenced_tweets = {"type": "reply", "id": str(result.get("in_reply_to_status_id", ""))}
         elif result.get("retweet_tweet_id") and result.get("retweet_status"):
             retweet = result.get("retweet_status", {})
-            referenced_tweets = {"type": "retweet", **self._parse_tweet_without_ref(retweet)}
-            if retweet.get("quoted_status"):
+            referenced_tweets = {"type": "retweet", **self._parse_tweet_without_ref(retweet, ref_projection)}
+            if retweet.get("quoted_status") and wants(ref_projection, "quoted_status"):
                 quoted = retweet.get("quoted_status", {})
-                referenced_tweets["quoted_status"] = {"type": "quote", **self._parse_tweet_without_ref(quoted)}
+                referenced_tweets["quoted_status"] = {"type": "quote", **self._parse_tweet_without_ref(quoted, ref_quoted_projection)}
         elif result.get("quoted_status_id") and result.get("quoted_status"):
             quoted = result.get("quoted_status", {})
-            referenced_tweets = {"type": "quote", **self._parse_tweet_without_ref(quoted)}
+            referenced_tweets = {"type": "quote", **self._parse_tweet_without_ref(quoted, ref_projection)}
 
         if referenced_tweets:
             tweet["referenced_tweets"] = referenced_tweets
@@ -0,0 +1,474 @@
+"""
+定时轮询与增量产出
+
+监控类场景(新闻、行情)通常是对一批股票定时重复调用同一个方法，每次都重新处理全部结果。
+这里按股票调度刷新，只把新出现的内容作为异步流产出:
+
+NewsPoller: 轮询 get_stock_news
+- 每个股票可以单独设置刷新间隔，所有股票共享一个并发上限
+- 已产出新闻的 uuid 保存在有界的 SeenStore 中(最近最少出现的先淘汰)，同一条新闻只产出一次
+- 新闻的 tickers 覆盖多个被监控股票时，只产出一次，symbols 中列出所有相关的被监控股票
+
+QuoteWatcher: 轮询 get_stock_info 和 get_stock_price 的最新K线
+- 调度和并发上限与 NewsPoller 相同
+- 保存每个股票最近一次的字段快照(latest)，只产出与上次相比发生变化的字段
+
+请求失败只记录在 errors 和统计中，该股票按原间隔继续轮询。
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger("data_sources_watch")
+
+_MISSING = object()
+
+
+class SeenStore:
+    """Bounded set of keys, the least recently seen key is dropped first"""
+
+    def __init__(self, max_size: int = 10000, keys: Iterable[str] = ()):
+        if max_size < 1:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self._keys: "OrderedDict[str, None]" = OrderedDict()
+        for key in keys:
+            self.add(key)
+
+    def add(self, key: str) -> bool:
+        """Record a key, return True if it was not seen before"""
+        if key in self._keys:
+            # 仍在出现的 key 保留更久，避免被淘汰后重复产出
+            self._keys.move_to_end(key)
+            return False
+        self._keys[key] = None
+        if len(self._keys) > self.max_size:
+            self._keys.popitem(last=False)
+        return True
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def keys(self) -> List[str]:
+        """Keys from least to most recently seen, to persist and pass back as `keys` later"""
+        return list(self._keys)
+
+
+class _Scheduler:
+    """Per-symbol refresh schedule shared by the pollers"""
+
+    def __init__(self, interval: float, intervals: Optional[Dict[str, float]], max_concurrency: int):
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be positive")
+        self.interval = interval
+        self.intervals: Dict[str, float] = {}
+        self.max_concurrency = max_concurrency
+        self._heap: List[Tuple[float, int, str]] = []
+        # 在堆中或正在刷新的股票，避免重复调度
+        self._scheduled: Set[str] = set()
+        self._sequence = itertools.count()
+        self._wake: Optional[asyncio.Event] = None
+        self._stopped = False
+        for symbol, symbol_interval in (intervals or {}).items():
+            self.add(symbol, symbol_interval)
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self.intervals)
+
+    def add(self, symbol: str, interval: Optional[float] = None) -> None:
+        """Watch a symbol (or change its interval), it is refreshed right away"""
+        if interval is not None and interval <= 0:
+            raise ValueError("interval must be positive")
+        self.intervals[symbol] = interval or self.interval
+        if symbol not in self._scheduled:
+            self._push(symbol, time.monotonic())
+
+    def remove(self, symbol: str) -> None:
+        """Stop watching a symbol, a refresh already running still completes"""
+        self.intervals.pop(symbol, None)
+
+    def stop(self) -> None:
+        """End the iteration after the refreshes already running"""
+        self._stopped = True
+        if self._wake is not None:
+            self._wake.set()
+
+    def _push(self, symbol: str, due: float) -> None:
+        self._scheduled.add(symbol)
+        heapq.heappush(self._heap, (due, next(self._sequence), symbol))
+        if self._wake is not None:
+            self._wake.set()
+
+    def _reschedule(self, symbol: str) -> None:
+        self._scheduled.discard(symbol)
+        if symbol in self.intervals:
+            self._push(symbol, time.monotonic() + self.intervals[symbol])
+
+    async def _run(self, refresh: Any) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield (symbol, result) of refresh(symbol) as refreshes complete, following the schedule"""
+        self._stopped = False
+        self._wake = asyncio.Event()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        running: Dict["asyncio.Future[Any]", str] = {}
+
+        async def guarded(symbol: str) -> Any:
+            async with semaphore:
+                return await refresh(symbol)
+
+        waker: Optional["asyncio.Future[Any]"] = None
+        try:
+            while not self._stopped or running:
+                now = time.monotonic()
+                while not self._stopped and self._heap and self._heap[0][0] <= now:
+                    _, _, symbol = heapq.heappop(self._heap)
+                    if symbol not in self.intervals:
+                        self._scheduled.discard(symbol)
+                        continue
+                    running[asyncio.ensure_future(guarded(symbol))] = symbol
+
+                self._wake.clear()
+                waker = asyncio.ensure_future(self._wake.wait())
+                timeout = max(self._heap[0][0] - now, 0.0) if self._heap and not self._stopped else None
+                done, _ = await asyncio.wait([*running, waker], timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                waker.cancel()
+                waker = None
+                for task in done:
+                    symbol = running.pop(task, None)
+                    if symbol is None:
+                        continue
+                    self._reschedule(symbol)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        logger.exception(e)
+                        result = {"success": False, "error": str(e)}
+                    yield symbol, result
+        finally:
+            if waker is not None:
+                waker.cancel()
+            self._wake = None
+            # 被中断的刷新在下次迭代时立即重新执行
+            for task, symbol in running.items():
+                task.cancel()
+                heapq.heappush(self._heap, (time.monotonic(), next(self._sequence), symbol))
+
+
+class NewsPoller:
+    """
+    Async iterator over news items not seen before, polling get_stock_news for each watched symbol
+
+    Args:
+        source: Data source with get_stock_news (YahooFinanceSource)
+        symbols: Symbols to watch at the default interval
+        interval: Seconds between refreshes of a symbol
+        intervals: Symbol -> interval overrides, these symbols are watched as well
+        max_concurrency: Maximum number of refreshes running at the same time
+        max_seen: Maximum number of news keys remembered
+        seen: Keys of an earlier run (`seen.keys()`) not to emit again
+        emit_initial: Whether news already present on a symbol's first refresh is emitted
+        region: Region passed to get_stock_news
+        snippet_count: Number of news items requested per refresh
+    """
+
+    def __init__(
+        self,
+        source: Any,
+        symbols: Iterable[str] = (),
+        interval: float = 60.0,
+        intervals: Optional[Dict[str, float]] = None,
+        max_concurrency: int = 4,
+        max_seen: int = 10000,
+        seen: Iterable[str] = (),
+        emit_initial: bool = True,
+        region: str = "US",
+        snippet_count: int = 10,
+    ):
+        self._source = source
+        self._schedule = _Scheduler(interval, intervals, max_concurrency)
+        for symbol in symbols:
+            if symbol not in self._schedule.intervals:
+                self._schedule.add(symbol)
+        self.seen = SeenStore(max_seen, seen)
+        self.emit_initial = emit_initial
+        self.region = region
+        self.snippet_count = snippet_count
+        self.errors: Dict[str, str] = {}
+        self._refreshed: Set[str] = set()
+        self._polls = 0
+        self._failures = 0
+        self._emitted = 0
+        self._duplicates = 0
+
+    @property
+    def symbols(self) -> List[str]:
+        return self._schedule.symbols
+
+    def add(self, symbol: str, interval: Optional[float] = None) -> None:
+        """Watch a symbol (or change its interval), it is refreshed right away"""
+        self._schedule.add(symbol, interval)
+
+    def remove(self, symbol: str) -> None:
+        """Stop watching a symbol"""
+        self._schedule.remove(symbol)
+
+    def stop(self) -> None:
+        """End the iteration, items of refreshes already running are still emitted"""
+        self._schedule.stop()
+
+    @staticmethod
+    def _key(item: Dict[str, Any]) -> str:
+        return item.get("uuid") or item.get("link") or item.get("title", "")
+
+    async def _refresh(self, symbol: str) -> Dict[str, Any]:
+        return await self._source.get_stock_news(symbol, region=self.region, snippet_count=self.snippet_count)
+
+    async def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields:
+            Dict[str, Any]: News item in the get_stock_news format, with "symbol" (the symbol whose refresh found it)
+                and "symbols" (all watched symbols among the polled symbol and the item's tickers)
+        """
+        refreshes = self._schedule._run(self._refresh)
+        try:
+            async for symbol, result in refreshes:
+                self._polls += 1
+                if not result.get("success"):
+                    self._failures += 1
+                    self.errors[symbol] = result.get("error", "Unknown error")
+                    logger.warning(f"轮询新闻失败({symbol}): {self.errors[symbol]}")
+                    continue
+                self.errors.pop(symbol, None)
+                initial = symbol not in self._refreshed
+                self._refreshed.add(symbol)
+                watched = self._schedule.intervals
+                for item in (result.get("data") or {}).get("simple_news") or []:
+                    if not self.seen.add(self._key(item)):
+                        self._duplicates += 1
+                        continue
+                    if initial and not self.emit_initial:
+                        continue
+                    tickers = [symbol] + [ticker for ticker in item.get("tickers") or [] if ticker != symbol]
+                    item["symbol"] = symbol
+                    item["symbols"] = [ticker for ticker in tickers if ticker in watched]
+                    self._emitted += 1
+                    yield item
+        finally:
+            await refreshes.aclose()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "symbols": len(self._schedule.intervals),
+            "polls": self._polls,
+            "failures": self._failures,
+            "emitted": self._emitted,
+            "duplicates": self._duplicates,
+            "seen": len(self.seen),
+            "errors": dict(self.errors),
+        }
+
+
+def _flatten(data: Dict[str, Any], prefix: str, fields: Dict[str, Any]) -> None:
+    """Add the fields of a nested result to fields as "prefix.key.subkey" """
+    for key, value in data.items():
+        name = f"{prefix}.{key}"
+        if isinstance(value, dict):
+            _flatten(value, name, fields)
+        else:
+            fields[name] = value
+
+
+def _latest_bar(columns: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields of the last bar with a close price in get_stock_price numpy columns, empty if there is none"""
+    closes = columns["close"]
+    for index in range(len(closes) - 1, -1, -1):
+        if closes[index] == closes[index]:
+            break
+    else:
+        return {}
+    bar: Dict[str, Any] = {"date": str(columns["date"][index]), "timestamp": int(columns["timestamp"][index])}
+    for field in ("open", "high", "low", "close"):
+        value = float(columns[field][index])
+        bar[field] = None if value != value else value
+    volume = float(columns["volume"][index])
+    bar["volume"] = None if volume != volume else int(volume)
+    return bar
+
+
+class QuoteWatcher:
+    """
+    Async iterator over changed quote fields, refreshing get_stock_info and the latest price bar of each watched symbol
+
+    Fields are flat names: "info.<field>" for get_stock_info data (nested fields joined with "."), and "price.date",
+    "price.timestamp", "price.open"/"high"/"low"/"close"/"volume" for the latest bar of get_stock_price.
+
+    Args:
+        source: Data source with get_stock_info and get_stock_price (YahooFinanceSource)
+        symbols: Symbols to watch at the default interval
+        interval: Seconds between refreshes of a symbol
+        intervals: Symbol -> interval overrides, these symbols are watched as well
+        max_concurrency: Maximum number of symbols refreshed at the same time
+        info: Whether to watch get_stock_info
+        price: Whether to watch the latest price bar
+        price_interval: Bar interval of the price, "1d" for the current day's bar, "1m" etc. for the latest intraday bar
+            (the last intraday_lookback_days days are requested, price_lookback_days for 1d/1wk/1mo)
+        emit_initial: Whether the full snapshot of a symbol's first refresh is emitted
+    """
+
+    # get_stock_price 请求最近几天的K线，覆盖周末和节假日。日内间隔只需最近一个交易日，
+    # 回看天数加上结束日期的一天不超过 1m 的单次请求跨度(7 天)，每次刷新只请求一次
+    price_lookback_days = 7
+    intraday_lookback_days = 4
+
+    def __init__(
+        self,
+        source: Any,
+        symbols: Iterable[str] = (),
+        interval: float = 5.0,
+        intervals: Optional[Dict[str, float]] = None,
+        max_concurrency: int = 8,
+        info: bool = True,
+        price: bool = True,
+        price_interval: str = "1d",
+        emit_initial: bool = True,
+    ):
+        if not info and not price:
+            raise ValueError("At least one of info and price must be watched")
+        self._source = source
+        self._schedule = _Scheduler(interval, intervals, max_concurrency)
+        for symbol in symbols:
+            if symbol not in self._schedule.intervals:
+                self._schedule.add(symbol)
+        self.modules = [module for module, enabled in (("info", info), ("price", price)) if enabled]
+        self.price_interval = price_interval
+        self.emit_initial = emit_initial
+        # 股票 -> 最近一次的字段快照
+        self.latest: Dict[str, Dict[str, Any]] = {}
+        self.errors: Dict[str, str] = {}
+        self._polls = 0
+        self._failures = 0
+        self._emitted = 0
+        self._unchanged = 0
+
+    @property
+    def symbols(self) -> List[str]:
+        return self._schedule.symbols
+
+    def add(self, symbol: str, interval: Optional[float] = None) -> None:
+        """Watch a symbol (or change its interval), it is refreshed right away"""
+        self._schedule.add(symbol, interval)
+
+    def remove(self, symbol: str) -> None:
+        """Stop watching a symbol and drop its snapshot"""
+        self._schedule.remove(symbol)
+        self.latest.pop(symbol, None)
+
+    def stop(self) -> None:
+        """End the iteration, changes of refreshes already running are still emitted"""
+        self._schedule.stop()
+
+    async def _refresh(self, symbol: str) -> Dict[str, Dict[str, Any]]:
+        calls = []
+        for module in self.modules:
+            if module == "info":
+                calls.append(self._source.get_stock_info(symbol))
+            else:
+                today = datetime.now()
+                if self.price_interval in ("1d", "1wk", "1mo"):
+                    lookback = self.price_lookback_days
+                else:
+                    lookback = self.intraday_lookback_days
+                calls.append(
+                    self._source.get_stock_price(
+                        symbol,
+                        (today - timedelta(days=lookback)).strftime("%Y-%m-%d"),
+                        (today + timedelta(days=1)).strftime("%Y-%m-%d"),
+                        self.price_interval,
+                        output="numpy",
+                    )
+                )
+        return dict(zip(self.modules, await asyncio.gather(*calls)))
+
+    def _fields(self, module: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        fields: Dict[str, Any] = {}
+        if module == "price":
+            _flatten(_latest_bar(data["prices"]), "price", fields)
+        else:
+            _flatten({key: value for key, value in data.items() if key != "symbol"}, module, fields)
+        return fields
+
+    async def __aiter__(self) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yields:
+            Dict[str, Any]: {"symbol": "AAPL", "changes": {"price.close": 187.5, "info.volume.current": 4567891},
+                "initial": False}; a field that disappeared has the value None, "initial" marks the first snapshot
+        """
+        refreshes = self._schedule._run(self._refresh)
+        try:
+            async for symbol, results in refreshes:
+                self._polls += 1
+                if "success" in results:
+                    # 刷新本身抛出异常
+                    results = dict.fromkeys(self.modules, results)
+                errors = []
+                initial = symbol not in self.latest
+                previous = self.latest.setdefault(symbol, {})
+                changes: Dict[str, Any] = {}
+                for module, result in results.items():
+                    if not result.get("success"):
+                        errors.append(f"{module}: {result.get('error', 'Unknown error')}")
+                        continue
+                    fields = self._fields(module, result["data"])
+                    for name, value in fields.items():
+                        if previous.get(name, _MISSING) != value:
+                            changes[name] = value
+                    prefix = f"{module}."
+                    for name in [name for name in previous if name.startswith(prefix) and name not in fields]:
+                        del previous[name]
+                        changes[name] = None
+                    previous.update(fields)
+
+                if errors:
+                    self._failures += 1
+                    self.errors[symbol] = "; ".join(errors)
+                    logger.warning(f"刷新行情失败({symbol}): {self.errors[symbol]}")
+                else:
+                    self.errors.pop(symbol, None)
+                if symbol not in self._schedule.intervals:
+                    # 刷新期间被移除
+                    self.latest.pop(symbol, None)
+                    continue
+                if not previous and initial:
+                    # 第一次刷新全部失败，下次仍视为第一次
+                    del self.latest[symbol]
+                    continue
+                if not changes:
+                    self._unchanged += 1
+                    continue
+                if initial and not self.emit_initial:
+                    continue
+                self._emitted += 1
+                yield {"symbol": symbol, "changes": changes, "initial": initial}
+        finally:
+            await refreshes.aclose()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "symbols": len(self._schedule.intervals),
+            "polls": self._polls,
+            "failures": self._failures,
+            "emitted": self._emitted,
+            "unchanged": self._unchanged,
+            "errors": dict(self.errors),
+        }
@@ -4,19 +4,56 @@ Yahoo Finance data source implementation
 
 import asyncio
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import aiohttp
 
+from .bar_store import INTERVAL_SECONDS, bar_store
 from .base import BaseAPI
+from .indicators import DEFAULT_INDICATORS, compute_indicators, indicator_frame, latest_values, parse_indicator
+from .price_bars import PRICE_OUTPUT_MODES, concat_price_columns, format_price_columns, parse_price_columns, with_dates
+from .records import PriceBar, check_output
+from .resample import base_interval, can_resample, resample_price_columns
+from .watch import NewsPoller, QuoteWatcher
 
 logger = logging.getLogger("yahoo_finance_source")
 
+# 日内间隔单次请求的最大时间跨度(秒)，更长的范围拆分为多个窗口并发请求，避免超时或被上游截断
+CHART_WINDOW_SECONDS = {
+    "1m": 7 * 86400,
+    "2m": 60 * 86400,
+    "5m": 60 * 86400,
+    "15m": 60 * 86400,
+    "30m": 60 * 86400,
+    "90m": 60 * 86400,
+    "60m": 730 * 86400,
+    "1h": 730 * 86400,
+}
+
+# get_fundamentals_table 可选的模块及对应的方法
+FUNDAMENTAL_MODULES = {
+    "info": "get_stock_info",
+    "statistics": "get_stock_statistics",
+    "financials": "get_financial_data",
+    "insights": "get_stock_insights",
+}
+
+# /market/v2/get-quotes 单次请求的最大股票数
+QUOTES_CHUNK_SIZE = 50
+
 
 class YahooFinanceSource(BaseAPI):
     """Yahoo Finance API data source implementation"""
 
+    # Maximum number of windows of one long range requested at the same time
+    chart_window_concurrency = 4
+    # Seconds get_fundamentals_table reuses a symbol's module result, and the most results kept
+    fundamentals_cache_ttl = 300.0
+    fundamentals_cache_size = 4096
+
     def __init__(self, config: Dict[str, Any], proxy_url: Optional[str] = None):
         """Initialize Yahoo Finance data source
 
@@ -32,6 +69,8 @@ class YahooFinanceSource(BaseAPI):
             "X-Biz-Id": "matrix-agent",
             "X-Request-Timeout": str(config["timeout"] - 5),
         }
+        # (module, symbol) -> (expiry, data), least recently used first
+        self._fundamentals_cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
 
     @property
     def source_name(self) -> str:
@@ -60,9 +99,13 @@ class YahooFinanceSource(BaseAPI):
         end_date: str,
         interval: str = "1d",
         events: str = "",
+        output: str = "dicts",
     ) -> Dict[str, Any]:
         """Get stock price data. Please set start_date, end_date, interval reasonably to avoid getting too much data,
-        which could cause request timeout or performance issues.
+        which could cause request timeout or performance issues. Long intraday ranges are split into windows the
+        upstream accepts (e.g. 7 days for 1m) and fetched concurrently. When the local bar store is enabled
+        (config "bar_store"), intraday and daily ranges fetched before are served locally and only the missing parts
+        are requested.
 
         Args:
             symbol: Stock code
@@ -70,6 +113,10 @@ class YahooFinanceSource(BaseAPI):
             end_date: End date in YYYY-MM-DD format
             interval: Time interval, options: 1m|2m|5m|15m|30m|60m|1d|1wk|1mo, default: 1d
             events: Event type, options: capitalGain|div|split|earn|history, default: empty
+            output: Format of the price list, "dicts" (default), "records" for compact PriceBar objects
+                (attribute access, convert with to_dict()), or columnar "numpy" (dict of arrays: date, timestamp,
+                open, high, low, close, volume) / "pandas" (DataFrame with these columns), recommended for long
+                or intraday ranges; missing bars have None (NaN in columnar output) prices and volume
 
         Returns:
             Dict[str, Any]: Dictionary containing stock price data, e.g.
@@ -99,6 +146,8 @@ class YahooFinanceSource(BaseAPI):
             }
         """
         try:
+            check_output(output, PRICE_OUTPUT_MODES)
+
             # Convert date string to timestamp
             start_timestamp = int(datetime.strptime(start_date, "%Y-%m-%d").timestamp())
             end_timestamp = int(datetime.strptime(end_date, "%Y-%m-%d").timestamp())
@@ -106,54 +155,17 @@ class YahooFinanceSource(BaseAPI):
             if start_timestamp > end_timestamp:
                 raise ValueError("start_date cannot be greater than end_date")
 
-            # Build request parameters
-            params = {
-                "symbol": symbol,
-                "period1": start_timestamp,
-                "period2": end_timestamp,
-                "interval": interval,
-                "region": "US",  # Default use US area
-                "includePrePost": "false",
-                "useYfid": "true",
-                "includeAdjustedClose": "true",
-            }
-
-            # If events parameter is provided, add to request
-            if events:
-                params["events"] = events
-
-            request_url = f"{self.proxy_url}/stock/v3/get-chart"
-
-            # Send request using aiohttp
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                    response.raise_for_status()
-                    # Parse the response
-                    data = await response.json()
-
-            # Check if there is an error in API response
-            if data.get("chart", {}).get("error"):
-                return {"success": False, "error": str(data["chart"]["error"])}
+            if bar_store.supports(interval, events):
+                return await self._get_stored_price(symbol, start_timestamp, end_timestamp, interval, output)
 
-            # Parse response data
-            chart_data = data["chart"]["result"][0]
-            timestamps = chart_data["timestamp"]
-            quote = chart_data["indicators"]["quote"][0]
-
-            # Build price data list
-            prices = []
-            for i, timestamp in enumerate(timestamps):
-                price_data = {
-                    "date": datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d"),
-                    "open": quote["open"][i],
-                    "high": quote["high"][i],
-                    "low": quote["low"][i],
-                    "close": quote["close"][i],
-                    "volume": int(quote["volume"][i]),
-                }
-                prices.append(price_data)
+            window = CHART_WINDOW_SECONDS.get(interval)
+            if window and end_timestamp - start_timestamp > window:
+                result = await self._fetch_chart_windows(symbol, start_timestamp, end_timestamp, interval, events)
+                if result["success"]:
+                    result["data"]["prices"] = format_price_columns(result["data"]["prices"], output)
+                return result
 
-            return {"success": True, "data": {"symbol": symbol, "prices": prices}}
+            return await self._fetch_chart(symbol, start_timestamp, end_timestamp, interval, events, output)
 
         except asyncio.TimeoutError:
             error_msg = f"Request timeout (timeout={self._timeout}s)"
@@ -168,6 +180,112 @@ class YahooFinanceSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": f"Unknown error: {str(e)}"}
 
+    async def _fetch_chart(self, symbol: str, start: int, end: int, interval: str, events: str, output: str) -> Dict[str, Any]:
+        """Request get-chart for [start, end) and parse it into the get_stock_price result"""
+        # Build request parameters
+        params = {
+            "symbol": symbol,
+            "period1": start,
+            "period2": end,
+            "interval": interval,
+            "region": "US",  # Default use US area
+            "includePrePost": "false",
+            "useYfid": "true",
+            "includeAdjustedClose": "true",
+        }
+
+        # If events parameter is provided, add to request
+        if events:
+            params["events"] = events
+
+        request_url = f"{self.proxy_url}/stock/v3/get-chart"
+
+        # Send request
+        return await self._fetch_json(
+            "get_stock_price",
+            "GET",
+            request_url,
+            headers=self.headers,
+            params=params,
+            timeout=self._timeout,
+            parse="_parse_price_response",
+            parse_args=(symbol, output),
+        )
+
+    async def _fetch_chart_windows(self, symbol: str, start: int, end: int, interval: str, events: str) -> Dict[str, Any]:
+        """Request [start, end) in windows no longer than the interval allows, concurrently,
+        and merge them into numpy columns deduplicated by timestamp"""
+        window = CHART_WINDOW_SECONDS.get(interval) or max(end - start, 1)
+        bounds = [(window_start, min(window_start + window, end)) for window_start in range(start, end, window)]
+        semaphore = asyncio.Semaphore(self.chart_window_concurrency)
+
+        async def fetch(window_start: int, window_end: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._fetch_chart(symbol, window_start, window_end, interval, events, "numpy")
+
+        results = await asyncio.gather(*(fetch(*bound) for bound in bounds))
+        for result in results:
+            # A missing window would silently leave a hole in the history
+            if not result["success"]:
+                return result
+        return {"success": True, "data": {"symbol": symbol, "prices": concat_price_columns([result["data"]["prices"] for result in results])}}
+
+    async def _get_stored_price(self, symbol: str, start: int, end: int, interval: str, output: str) -> Dict[str, Any]:
+        """get_stock_price through the local bar store, only the missing ranges are requested"""
+        for gap_start, gap_end in await asyncio.to_thread(bar_store.missing, symbol, interval, start, end):
+            fetched_at = int(time.time())
+            result = await self._fetch_chart_windows(symbol, gap_start, gap_end, interval, "")
+            if not result["success"]:
+                return result
+            # The latest bar may still change, so it is fetched again next time
+            covered_end = min(gap_end, fetched_at - INTERVAL_SECONDS[interval])
+            await asyncio.to_thread(bar_store.merge, symbol, interval, result["data"]["prices"], gap_start, gap_end, covered_end)
+        timestamps, fields = await asyncio.to_thread(bar_store.read, symbol, interval, start, end)
+        return {"success": True, "data": {"symbol": symbol, "prices": format_price_columns(with_dates(timestamps, fields), output)}}
+
+    def _parse_price_response(self, data: Dict[str, Any], symbol: str, output: str = "dicts") -> Dict[str, Any]:
+        """Parse a full get-chart response, run in the parse process pool for large bodies"""
+        # Check if there is an error in API response
+        if data.get("chart", {}).get("error"):
+            return {"success": False, "error": str(data["chart"]["error"])}
+
+        # Parse response data
+        chart_data = data["chart"]["result"][0]
+        if output in ("numpy", "pandas"):
+            prices = parse_price_columns(chart_data, output)
+        else:
+            prices = self._parse_price_bars(chart_data, output == "records")
+
+        return {"success": True, "data": {"symbol": symbol, "prices": prices}}
+
+    def _parse_price_bars(self, chart_data: Dict[str, Any], records: bool = False) -> List[Any]:
+        """Convert a get-chart result into the get_stock_price bar list, PriceBar records if `records`"""
+        # A range without trading has no timestamp
+        timestamps = chart_data.get("timestamp") or []
+        quote = chart_data["indicators"]["quote"][0]
+
+        # Build price data list
+        prices: List[Any] = []
+        for i, timestamp in enumerate(timestamps):
+            date = datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d")
+            # Missing bars come back as None
+            volume = quote["volume"][i]
+            if volume is not None:
+                volume = int(volume)
+            if records:
+                prices.append(PriceBar(date, quote["open"][i], quote["high"][i], quote["low"][i], quote["close"][i], volume))
+                continue
+            price_data = {
+                "date": date,
+                "open": quote["open"][i],
+                "high": quote["high"][i],
+                "low": quote["low"][i],
+                "close": quote["close"][i],
+                "volume": volume,
+            }
+            prices.append(price_data)
+        return prices
+
     async def get_stock_news(self, symbol: str, region: str = "US", snippet_count: int = 10) -> Dict[str, Any]:
         """获取股票相关的新闻数据
         Args:
@@ -204,57 +322,56 @@ class YahooFinanceSource(BaseAPI):
 
             # 发送POST请求
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
-                    # 使用POST请求，并设置空数据体
-                    async with session.post(
-                        request_url,
-                        headers=self.headers,
-                        params=params,
-                        data="",  # load_more 逻辑，先不适配
-                        timeout=self._timeout,
-                    ) as response:
-                        response.raise_for_status()
-                        data = await response.json()
-
-                        # 提取并处理新闻数据 - 根据实际响应格式调整
-                        stream_items = []
-                        # 检查响应结构中的main.stream路径
-                        if data.get("data") and data["data"].get("main") and data["data"]["main"].get("stream"):
-                            stream_items = data["data"]["main"]["stream"]
-
-                        # 转换为简化的新闻对象列表
-                        simple_news = []
-                        for stream_item in stream_items:
-                            content = stream_item.get("content", {})
-                            if not content:
-                                continue
-
-                            # 获取链接
-                            link = ""
-                            click_through_url = content.get("clickThroughUrl", {})
-                            if click_through_url and click_through_url.get("url"):
-                                link = click_through_url["url"]
-
-                            # 获取发布者
-                            publisher = ""
-                            if content.get("provider") and content["provider"].get("displayName"):
-                                publisher = content["provider"]["displayName"]
-
-                            # 创建简化的新闻项
-                            news_item = {
-                                "title": content.get("title", ""),
-                                "publisher": publisher,
-                                "publish_date": content.get("pubDate", ""),
-                                "link": link,
-                                "uuid": content.get("id", ""),
-                                "content_type": content.get("contentType", ""),
-                                "thumbnail": self._extract_thumbnail(content.get("thumbnail", {})),
-                                "tickers": self._extract_tickers(content.get("finance", {})),
-                            }
-                            simple_news.append(news_item)
-
-                        # 返回结构化的新闻列表
-                        return {"success": True, "data": {"symbol": symbol, "simple_news": simple_news}}
+                # 使用POST请求，并设置空数据体
+                data = await self._fetch_json(
+                    "get_stock_news",
+                    "POST",
+                    request_url,
+                    headers=self.headers,
+                    params=params,
+                    data="",  # load_more 逻辑，先不适配
+                    timeout=self._timeout,
+                )
+
+                # 提取并处理新闻数据 - 根据实际响应格式调整
+                stream_items = []
+                # 检查响应结构中的main.stream路径
+                if data.get("data") and data["data"].get("main") and data["data"]["main"].get("stream"):
+                    stream_items = data["data"]["main"]["stream"]
+
+                # 转换为简化的新闻对象列表
+                simple_news = []
+                for stream_item in stream_items:
+                    content = stream_item.get("content", {})
+                    if not content:
+                        continue
+
+                    # 获取链接
+                    link = ""
+                    click_through_url = content.get("clickThroughUrl", {})
+                    if click_through_url and click_through_url.get("url"):
+                        link = click_through_url["url"]
+
+                    # 获取发布者
+                    publisher = ""
+                    if content.get("provider") and content["provider"].get("displayName"):
+                        publisher = content["provider"]["displayName"]
+
+                    # 创建简化的新闻项
+                    news_item = {
+                        "title": content.get("title", ""),
+                        "publisher": publisher,
+                        "publish_date": content.get("pubDate", ""),
+                        "link": link,
+                        "uuid": content.get("id", ""),
+                        "content_type": content.get("contentType", ""),
+                        "thumbnail": self._extract_thumbnail(content.get("thumbnail", {})),
+                        "tickers": self._extract_tickers(content.get("finance", {})),
+                    }
+                    simple_news.append(news_item)
+
+                # 返回结构化的新闻列表
+                return {"success": True, "data": {"symbol": symbol, "simple_news": simple_news}}
 
             except asyncio.TimeoutError:
                 error_msg = f"请求超时 (timeout={self._timeout}秒)"
@@ -276,6 +393,101 @@ class YahooFinanceSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
+    def watch_news(
+        self,
+        symbols: List[str],
+        interval: float = 60.0,
+        intervals: Optional[Dict[str, float]] = None,
+        max_concurrency: int = 4,
+        max_seen: int = 10000,
+        seen: Optional[List[str]] = None,
+        emit_initial: bool = True,
+        region: str = "US",
+        snippet_count: int = 10,
+    ) -> NewsPoller:
+        """Poll news of many stocks and yield only items not seen before. Use with `async for`.
+
+        Each symbol is refreshed every `interval` seconds (or its own entry in `intervals`), at most max_concurrency
+        refreshes at a time. An item is yielded once even if it shows up for several watched symbols.
+
+        Args:
+            symbols(List[str]): Stock codes to watch
+            interval(float): Seconds between refreshes of a symbol, default: 60
+            intervals(Dict[str, float]): Per-symbol intervals, these symbols are watched as well
+            max_concurrency(int): Maximum number of get_stock_news requests at the same time, default: 4
+            max_seen(int): Maximum number of item uuids remembered, default: 10000
+            seen(List[str]): `poller.seen.keys()` of an earlier run, items not to yield again
+            emit_initial(bool): Whether items already present on the first refresh of a symbol are yielded, default: True
+            region(str): Region code, defaults to US
+            snippet_count(int): Number of news items requested per refresh, defaults to 10
+
+        Returns:
+            NewsPoller: Async iterator of news items in the get_stock_news format with "symbol" (symbol that found it)
+                and "symbols" (watched symbols it concerns); add()/remove() change the watchlist, stop() ends it
+
+        Example:
+            poller = client.yahoo_finance.watch_news(["AAPL", "MSFT"], interval=30)
+            async for item in poller:
+                print(item["symbols"], item["title"])
+        """
+        return NewsPoller(
+            self,
+            symbols,
+            interval=interval,
+            intervals=intervals,
+            max_concurrency=max_concurrency,
+            max_seen=max_seen,
+            seen=seen or (),
+            emit_initial=emit_initial,
+            region=region,
+            snippet_count=snippet_count,
+        )
+
+    def watch_quotes(
+        self,
+        symbols: List[str],
+        interval: float = 5.0,
+        intervals: Optional[Dict[str, float]] = None,
+        max_concurrency: int = 8,
+        info: bool = True,
+        price: bool = True,
+        price_interval: str = "1d",
+        emit_initial: bool = True,
+    ) -> QuoteWatcher:
+        """Refresh stock info and the latest price bar of a watchlist and yield only the fields that changed.
+        Use with `async for`.
+
+        Args:
+            symbols(List[str]): Stock codes to watch
+            interval(float): Seconds between refreshes of a symbol, default: 5
+            intervals(Dict[str, float]): Per-symbol intervals, these symbols are watched as well
+            max_concurrency(int): Maximum number of symbols refreshed at the same time, default: 8
+            info(bool): Whether to watch get_stock_info fields, default: True
+            price(bool): Whether to watch the latest get_stock_price bar, default: True
+            price_interval(str): Bar interval of the price, "1d" (default) for the current day's bar or e.g. "1m"
+            emit_initial(bool): Whether the full first snapshot of each symbol is yielded, default: True
+
+        Returns:
+            QuoteWatcher: Async iterator of {"symbol", "changes", "initial"} with changed fields such as
+                "info.market_cap" or "price.close"; `latest` holds the last snapshot per symbol
+
+        Example:
+            watcher = client.yahoo_finance.watch_quotes(["AAPL", "MSFT"], interval=2)
+            async for update in watcher:
+                print(update["symbol"], update["changes"])
+        """
+        return QuoteWatcher(
+            self,
+            symbols,
+            interval=interval,
+            intervals=intervals,
+            max_concurrency=max_concurrency,
+            info=info,
+            price=price,
+            price_interval=price_interval,
+            emit_initial=emit_initial,
+        )
+
     def _extract_thumbnail(self, thumbnail_data: Dict[str, Any]) -> str:
         """从缩略图数据中提取第一个可用的URL
 
@@ -356,10 +568,15 @@ class YahooFinanceSource(BaseAPI):
 
             # Send request
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
-                    async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                        response.raise_for_status()
-                        data = await response.json()
+                data = await self._fetch_json(
+                    "get_stock_info",
+                    "GET",
+                    request_url,
+                    headers=self.headers,
+                    params=params,
+                    timeout=self._timeout,
+                    hedge=True,  # 只读查询，可以安全地对冲
+                )
 
             except asyncio.TimeoutError:
                 error_msg = f"Request timeout (timeout={self._timeout}s)"
@@ -409,6 +626,190 @@ class YahooFinanceSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": error_msg}
 
+    async def get_stock_quotes(self, symbols: List[str], region: str = "US", max_concurrency: int = 4) -> Dict[str, Any]:
+        """Get the get_stock_info fields of many stocks with one request per QUOTES_CHUNK_SIZE symbols
+
+        Uses the multi-symbol quote endpoint instead of one get-fundamentals request per symbol. The quote endpoint
+        has no beta, which is 0 as for a missing value in get_stock_info; dividend_yield is the forward yield as a
+        fraction, falling back to the trailing yield.
+
+        Args:
+            symbols(List[str]): Stock code list, duplicates are requested and returned once
+            region(str): Region code, options: US, HK, CN, etc., default: US
+            max_concurrency(int): Maximum number of chunks requested at the same time, default: 4
+
+        Returns:
+            Dict[str, Any]: Dictionary containing quote data, e.g.
+            {
+                "success": True,
+                "data": {
+                    "count": 2,                # Number of stocks returned
+                    "quotes": [                # Same fields as get_stock_info data, in the order of symbols
+                        {"symbol": "AAPL", "market_cap": 2850000000000, "pe_ratio": 31.25, ...},
+                        {"symbol": "MSFT", "market_cap": 3090000000000, "pe_ratio": 36.1, ...}
+                    ],
+                    "failed_symbols": []       # Symbols not returned or whose chunk failed, with the error
+                }
+            }
+        """
+        try:
+            if max_concurrency < 1:
+                raise ValueError("max_concurrency must be positive")
+            unique_symbols = list(dict.fromkeys(symbols))
+            chunks = [unique_symbols[i : i + QUOTES_CHUNK_SIZE] for i in range(0, len(unique_symbols), QUOTES_CHUNK_SIZE)]
+            semaphore = asyncio.Semaphore(max_concurrency)
+            request_url = f"{self.proxy_url}/market/v2/get-quotes"
+
+            async def fetch(chunk: List[str]) -> Dict[str, Any]:
+                async with semaphore:
+                    try:
+                        return await self._fetch_json(
+                            "get_stock_quotes",
+                            "GET",
+                            request_url,
+                            headers=self.headers,
+                            params={"region": region, "symbols": ",".join(chunk)},
+                            timeout=self._timeout,
+                            hedge=True,  # 只读查询，可以安全地对冲
+                            parse="_parse_quotes_response",
+                        )
+                    except asyncio.TimeoutError:
+                        return {"success": False, "error": f"Request timeout (timeout={self._timeout}s)"}
+                    except aiohttp.ClientError as e:
+                        return {"success": False, "error": f"HTTP request error: {str(e)}"}
+
+            results = await asyncio.gather(*(fetch(chunk) for chunk in chunks))
+            quotes: Dict[str, Dict[str, Any]] = {}
+            errors: Dict[str, str] = {}
+            for chunk, result in zip(chunks, results):
+                if not result["success"]:
+                    logger.warning(f"Failed to get quotes for {len(chunk)} stocks: {result['error']}")
+                    errors.update(dict.fromkeys(chunk, result["error"]))
+                    continue
+                # The endpoint may return symbols in another case or order
+                returned = {quote["symbol"].upper(): quote for quote in result["data"]}
+                for symbol in chunk:
+                    quote = returned.get(symbol.upper())
+                    if quote is None:
+                        errors[symbol] = "Symbol not found"
+                    else:
+                        quotes[symbol] = dict(quote, symbol=symbol)
+
+            if unique_symbols and len(errors) == len(unique_symbols):
+                error_msg = "All stock quote retrieval failed:\n" + "\n".join(f"{symbol}: {error}" for symbol, error in errors.items())
+                return {"success": False, "error": error_msg}
+
+            return {
+                "success": True,
+                "data": {
+                    "count": len(quotes),
+                    "quotes": [quotes[symbol] for symbol in unique_symbols if symbol in quotes],
+                    "failed_symbols": [{"symbol": symbol, "error": error} for symbol, error in errors.items()],
+                },
+            }
+
+        except Exception as e:
+            logger.error(f"Error occurred while batch getting stock quotes: {str(e)}")
+            logger.exception(e)
+            return {"success": False, "error": str(e)}
+
+    def _parse_quotes_response(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse a get-quotes response into get_stock_info data per returned symbol"""
+        quote_response = data.get("quoteResponse", {})
+        if quote_response.get("error"):
+            return {"success": False, "error": str(quote_response["error"])}
+
+        quotes = []
+        for quote in quote_response.get("result") or []:
+            # 报价接口的 dividendYield 为百分数
+            dividend_yield = quote.get("dividendYield")
+            dividend_yield = dividend_yield / 100 if dividend_yield is not None else quote.get("trailingAnnualDividendYield", 0)
+            quotes.append(
+                {
+                    "symbol": quote.get("symbol", ""),
+                    "market_cap": float(quote.get("marketCap", 0)),
+                    "pe_ratio": float(quote.get("trailingPE", 0)),
+                    "forward_pe": float(quote.get("forwardPE", 0)),
+                    "dividend_yield": float(dividend_yield),
+                    "beta": float(quote.get("beta", 0)),
+                    "fifty_two_week": {
+                        "low": float(quote.get("fiftyTwoWeekLow", 0)),
+                        "high": float(quote.get("fiftyTwoWeekHigh", 0)),
+                    },
+                    "moving_averages": {
+                        "fifty_day": float(quote.get("fiftyDayAverage", 0)),
+                        "two_hundred_day": float(quote.get("twoHundredDayAverage", 0)),
+                    },
+                    "volume": {
+                        "current": int(quote.get("regularMarketVolume", 0)),
+                        "average": int(quote.get("averageDailyVolume3Month", 0)),
+                    },
+                }
+            )
+        return {"success": True, "data": quotes}
+
+    async def get_stock_price_intervals(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        intervals: List[str],
+        output: str = "dicts",
+        base: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Get stock price data of one symbol at several intervals with a single price request
+
+        The finest needed interval is requested once (through get_stock_price, so the bar store and range chunking
+        apply) and the coarser intervals are aggregated from it locally. Intraday bars are only available upstream for
+        recent periods (about 30 days for 1m, 60 days for other minute intervals), which also limits how far back
+        coarser intervals derived from them reach.
+
+        Args:
+            symbol(str): Stock code
+            start_date(str): Start date in YYYY-MM-DD format
+            end_date(str): End date in YYYY-MM-DD format
+            intervals(List[str]): Intervals to return, options: 1m|2m|5m|15m|30m|60m|90m|1h|1d|1wk|1mo
+            output(str): Format of each price list, same options as get_stock_price, default: dicts
+            base(str): Interval to request instead of the coarsest one all intervals can be derived from, e.g. "1m"
+                to reuse bars already in the bar store
+
+        Returns:
+            Dict[str, Any]: Dictionary containing stock price data, e.g.
+            {
+                "success": True,
+                "data": {
+                    "symbol": "AAPL",
+                    "base_interval": "5m",             # Interval requested upstream
+                    "intervals": {                     # Interval -> price list in the get_stock_price format
+                        "5m": [{"date": "2024-01-02", "open": 187.15, "high": 187.40, "low": 186.90, "close": 187.02, "volume": 1523400}],
+                        "1d": [{"date": "2024-01-02", "open": 187.15, "high": 188.44, "low": 183.89, "close": 185.64, "volume": 81964874}]
+                    }
+                }
+            }
+        """
+        try:
+            check_output(output, PRICE_OUTPUT_MODES)
+            intervals = list(dict.fromkeys(intervals))
+            base = base or base_interval(intervals)
+            for interval in intervals:
+                if not can_resample(base, interval):
+                    raise ValueError(f"Interval {interval} cannot be derived from {base}")
+
+            result = await self.get_stock_price(symbol, start_date, end_date, base, output="numpy")
+            if not result["success"]:
+                return result
+
+            columns = result["data"]["prices"]
+            prices = {
+                interval: format_price_columns(resample_price_columns(columns, base, interval), output) for interval in intervals
+            }
+            return {"success": True, "data": {"symbol": symbol, "base_interval": base, "intervals": prices}}
+
+        except Exception as e:
+            logger.error(f"Error occurred while getting multi-interval stock price data: {str(e)}")
+            logger.exception(e)
+            return {"success": False, "error": str(e)}
+
     async def get_multiple_stocks_price(
         self,
         symbols: List[str],
@@ -416,15 +817,21 @@ class YahooFinanceSource(BaseAPI):
         end_date: str,
         interval: str = "1d",
         events: str = "",
+        max_concurrency: int = 8,
+        output: str = "dicts",
     ) -> Dict[str, Any]:
         """Get price data for multiple stocks
 
+        Symbols are fetched concurrently; duplicate symbols are fetched and returned once.
+
         Args:
             symbols(List[str]): Stock code list
             start_date(str): Start date in YYYY-MM-DD format
             end_date(str): End date in YYYY-MM-DD format
             interval(str): Time interval, options: 1m|2m|5m|15m|30m|60m|1d|1wk|1mo, default: 1d
             events(str): Event type, options: capitalGain|div|split|earn|history, default: empty
+            max_concurrency(int): Maximum number of symbols requested at the same time, default: 8
+            output(str): Format of each price list, same options as get_stock_price, default: dicts
 
         Returns:
             Dict[str, Any]: Dictionary containing stock price data, e.g.
@@ -466,27 +873,35 @@ class YahooFinanceSource(BaseAPI):
         """
 
         try:
+            if max_concurrency < 1:
+                raise ValueError("max_concurrency must be positive")
             stocks_data = []
             failed_symbols = []
-
-            # Iterate over stock code list to get data for each stock
-            for symbol in symbols:
-                try:
-                    result = await self.get_stock_price(
-                        symbol=symbol, start_date=start_date, end_date=end_date, interval=interval, events=events
-                    )
-                    if result["success"]:
-                        stocks_data.append(result["data"])
-                    else:
-                        failed_symbols.append((symbol, result["error"]))
-                        logger.warning(f"Failed to get data for stock {symbol}: {result['error']}")
-                except Exception as e:
-                    failed_symbols.append((symbol, str(e)))
-                    logger.error(f"Error occurred while getting data for stock {symbol}: {str(e)}")
-                    logger.exception(e)
+            # Duplicate symbols are requested once, results keep the order of first appearance
+            unique_symbols = list(dict.fromkeys(symbols))
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def fetch(symbol: str) -> Dict[str, Any]:
+                async with semaphore:
+                    try:
+                        return await self.get_stock_price(
+                            symbol=symbol, start_date=start_date, end_date=end_date, interval=interval, events=events, output=output
+                        )
+                    except Exception as e:
+                        logger.error(f"Error occurred while getting data for stock {symbol}: {str(e)}")
+                        logger.exception(e)
+                        return {"success": False, "error": str(e)}
+
+            results = await asyncio.gather(*(fetch(symbol) for symbol in unique_symbols))
+            for symbol, result in zip(unique_symbols, results):
+                if result["success"]:
+                    stocks_data.append(result["data"])
+                else:
+                    failed_symbols.append((symbol, result["error"]))
+                    logger.warning(f"Failed to get data for stock {symbol}: {result['error']}")
 
             # If all stocks fail to get data
-            if len(failed_symbols) == len(symbols):
+            if len(failed_symbols) == len(unique_symbols):
                 error_msg = "All stock data retrieval failed:\n" + "\n".join([f"{symbol}: {error}" for symbol, error in failed_symbols])
                 return {"success": False, "error": error_msg}
 
@@ -505,6 +920,76 @@ class YahooFinanceSource(BaseAPI):
             logger.exception(e)
             return {"success": False, "error": str(e)}
 
+    async def get_technical_indicators(
+        self,
+        symbols: List[str],
+        start_date: str,
+        end_date: str,
+        interval: str = "1d",
+        indicators: Optional[List[str]] = None,
+        output: str = "numpy",
+        max_concurrency: int = 8,
+    ) -> Dict[str, Any]:
+        """Compute technical indicators (SMA, EMA, RSI, returns, volatility) of several stocks from their price history
+
+        All symbols are computed together with vectorized NumPy code. Leave room before the period of interest for the
+        longest window, e.g. 200+ trading days for sma_200. Prices come from get_stock_price, so the local bar store
+        and range chunking apply.
+
+        Args:
+            symbols(List[str]): Stock code list
+            start_date(str): Start date in YYYY-MM-DD format
+            end_date(str): End date in YYYY-MM-DD format
+            interval(str): Time interval, options: 1m|2m|5m|15m|30m|60m|1d|1wk|1mo, default: 1d
+            indicators(List[str]): Indicator names, "<kind>_<window>" with kind sma|ema|rsi|returns|log_returns|volatility,
+                e.g. ["sma_50", "ema_12", "rsi_14"], default: sma_20, sma_50, ema_12, ema_26, rsi_14, returns_1, volatility_20
+            output(str): "numpy" (default) for arrays per symbol or "pandas" for one DataFrame with a symbol column
+            max_concurrency(int): Maximum number of symbols requested at the same time, default: 8
+
+        Returns:
+            Dict[str, Any]: Dictionary containing indicator data, e.g.
+            {
+                "success": True,
+                "data": {
+                    "indicators": {            # output="numpy": per symbol, one array per column, NaN before a window is full
+                        "AAPL": {"date": [...], "timestamp": [...], "close": [...], "sma_20": [...], "rsi_14": [...]}
+                    },
+                    "latest": {                # Values of the last bar per symbol, None if not available
+                        "AAPL": {"date": "2024-03-01", "timestamp": 1709303400, "close": 179.66, "sma_20": 182.1, "rsi_14": 41.3}
+                    },
+                    "failed_symbols": []       # Symbols whose prices could not be fetched, with the error
+                }
+            }
+        """
+        try:
+            check_output(output, ("numpy", "pandas"))
+            names = list(indicators or DEFAULT_INDICATORS)
+            # Validate before requesting any prices
+            for name in names:
+                parse_indicator(name)
+
+            result = await self.get_multiple_stocks_price(
+                symbols, start_date, end_date, interval, max_concurrency=max_concurrency, output="numpy"
+            )
+            if not result["success"]:
+                return result
+
+            prices = {stock["symbol"]: stock["prices"] for stock in result["data"]["stocks"]}
+            computed = compute_indicators(prices, names)
+            return {
+                "success": True,
+                "data": {
+                    "indicators": indicator_frame(computed) if output == "pandas" else computed,
+                    "latest": latest_values(computed),
+                    "failed_symbols": result["data"]["failed_symbols"],
+                },
+            }
+
+        except Exception as e:
+            logger.error(f"Error occurred while computing technical indicators: {str(e)}")
+            logger.exception(e)
+            return {"success": False, "error": str(e)}
+
     async def get_stock_insights(self, symbol: str) -> Dict[str, Any]:
         """Get stock insight data, including technical analysis, valuation, and company snapshot
 
@@ -568,16 +1053,14 @@ class YahooFinanceSource(BaseAPI):
             params = {"symbol": symbol}
 
             # Send request
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                try:
-                    async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                        # Check response status
-                        response.raise_for_status()
-                        data = await response.json()
-                except asyncio.TimeoutError:
-                    return {"success": False, "error": f"Request timeout (timeout={self._timeout}s)"}
-                except aiohttp.ClientError as e:
-                    return {"success": False, "error": f"HTTP request error: {str(e)}"}
+            try:
+                data = await self._fetch_json(
+                    "get_stock_insights", "GET", request_url, headers=self.headers, params=params, timeout=self._timeout
+                )
+            except asyncio.TimeoutError:
+                return {"success": False, "error": f"Request timeout (timeout={self._timeout}s)"}
+            except aiohttp.ClientError as e:
+                return {"success": False, "error": f"HTTP request error: {str(e)}"}
 
             # Check if there is an error in API response
             if data.get("finance", {}).get("error"):
@@ -709,16 +1192,14 @@ class YahooFinanceSource(BaseAPI):
                 params["lang"] = lang
 
             # Send request
-            async with aiohttp.ClientSession(trust_env=True) as session:
-                try:
-                    async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                        # Check response status
-                        response.raise_for_status()
-                        data = await response.json()
-                except asyncio.TimeoutError:
-                    return {"success": False, "error": f"Request timeout (timeout={self._timeout}s)"}
-                except aiohttp.ClientError as e:
-                    return {"success": False, "error": f"HTTP request error: {str(e)}"}
+            try:
+                data = await self._fetch_json(
+                    "get_stock_statistics", "GET", request_url, headers=self.headers, params=params, timeout=self._timeout
+                )
+            except asyncio.TimeoutError:
+                return {"success": False, "error": f"Request timeout (timeout={self._timeout}s)"}
+            except aiohttp.ClientError as e:
+                return {"success": False, "error": f"HTTP request error: {str(e)}"}
 
             # Check if there is an error in API response
             if data.get("quoteSummary", {}).get("error"):
@@ -852,10 +1333,16 @@ class YahooFinanceSource(BaseAPI):
 
             # Send request
             try:
-                async with aiohttp.ClientSession(trust_env=True) as session:
-                    async with session.get(request_url, headers=self.headers, params=params, timeout=self._timeout) as response:
-                        response.raise_for_status()
-                        data = await response.json()
+                result = await self._fetch_json(
+                    "get_financial_data",
+                    "GET",
+                    request_url,
+                    headers=self.headers,
+                    params=params,
+                    timeout=self._timeout,
+                    parse="_parse_financial_response",
+                    parse_args=(symbol,),
+                )
 
             except asyncio.TimeoutError:
                 error_msg = f"Request timeout (timeout={self._timeout}s)"
@@ -866,65 +1353,198 @@ class YahooFinanceSource(BaseAPI):
                 logger.error(error_msg)
                 return {"success": False, "error": error_msg}
 
-            # Check if there is an error in API response
-            if data.get("quoteSummary", {}).get("error"):
-                error_msg = str(data["quoteSummary"]["error"])
-                logger.error(f"API returned error: {error_msg}")
-                return {"success": False, "error": error_msg}
+            if not result["success"]:
+                logger.error(f"API returned error: {result['error']}")
+            return result
 
-            # Parse response data
-            financial_data = data["quoteSummary"]["result"][0]["financialData"]
+        except Exception as e:
+            error_msg = f"Error occurred while getting stock financial data: {str(e)}"
+            logger.error(error_msg)
+            logger.exception(e)
+            return {"success": False, "error": error_msg}
 
-            return {
+    def _parse_financial_response(self, data: Dict[str, Any], symbol: str) -> Dict[str, Any]:
+        """Parse a full get-fundamentals response, run in the parse process pool for large bodies"""
+        # Check if there is an error in API response
+        if data.get("quoteSummary", {}).get("error"):
+            return {"success": False, "error": str(data["quoteSummary"]["error"])}
+
+        # Parse response data
+        financial_data = data["quoteSummary"]["result"][0]["financialData"]
+
+        return {
+            "success": True,
+            "data": {
+                "symbol": symbol,
+                "price": {
+                    "current": float(financial_data.get("currentPrice", {}).get("raw", 0)),
+                    "target": {
+                        "low": float(financial_data.get("targetLowPrice", {}).get("raw", 0)),
+                        "high": float(financial_data.get("targetHighPrice", {}).get("raw", 0)),
+                        "mean": float(financial_data.get("targetMeanPrice", {}).get("raw", 0)),
+                        "median": float(financial_data.get("targetMedianPrice", {}).get("raw", 0)),
+                    },
+                },
+                "recommendation": {
+                    "mean": float(financial_data.get("recommendationMean", {}).get("raw", 0)),
+                    "key": financial_data.get("recommendationKey", ""),
+                    "analysts_count": int(financial_data.get("numberOfAnalystOpinions", {}).get("raw", 0)),
+                },
+                "financial_metrics": {
+                    "total_cash": float(financial_data.get("totalCash", {}).get("raw", 0)),
+                    "cash_per_share": float(financial_data.get("totalCashPerShare", {}).get("raw", 0)),
+                    "total_debt": float(financial_data.get("totalDebt", {}).get("raw", 0)),
+                    "debt_to_equity": float(financial_data.get("debtToEquity", {}).get("raw", 0)),
+                    "current_ratio": float(financial_data.get("currentRatio", {}).get("raw", 0)),
+                    "quick_ratio": float(financial_data.get("quickRatio", {}).get("raw", 0)),
+                },
+                "profitability": {
+                    "gross_margin": float(financial_data.get("grossMargins", {}).get("raw", 0)),
+                    "operating_margin": float(financial_data.get("operatingMargins", {}).get("raw", 0)),
+                    "profit_margin": float(financial_data.get("profitMargins", {}).get("raw", 0)),
+                    "ebitda_margin": float(financial_data.get("ebitdaMargins", {}).get("raw", 0)),
+                },
+                "growth": {
+                    "revenue_growth": float(financial_data.get("revenueGrowth", {}).get("raw", 0)),
+                    "earnings_growth": float(financial_data.get("earningsGrowth", {}).get("raw", 0)),
+                },
+                "returns": {
+                    "return_on_assets": float(financial_data.get("returnOnAssets", {}).get("raw", 0)),
+                    "return_on_equity": float(financial_data.get("returnOnEquity", {}).get("raw", 0)),
+                },
+                "cash_flow": {
+                    "operating": float(financial_data.get("operatingCashflow", {}).get("raw", 0)),
+                    "free": float(financial_data.get("freeCashflow", {}).get("raw", 0)),
+                },
+                "currency": financial_data.get("financialCurrency", "USD"),
+            },
+        }
+
+    async def get_fundamentals_table(
+        self,
+        symbols: List[str],
+        modules: Optional[List[str]] = None,
+        max_concurrency: int = 16,
+        output: str = "dicts",
+        cache_ttl: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Get fundamentals of many stocks as one table with one row per symbol
+
+        The chosen modules of all symbols are requested concurrently, at most max_concurrency requests at a time.
+        Successful module results are reused for fundamentals_cache_ttl seconds, so repeated screens of overlapping
+        symbol lists only request what is new or expired.
+
+        Args:
+            symbols(List[str]): Stock code list, duplicates are requested and returned once
+            modules(List[str]): Modules to include, options: info (get_stock_info), statistics (get_stock_statistics),
+                financials (get_financial_data), insights (get_stock_insights), default: info, statistics, financials
+            max_concurrency(int): Maximum number of requests at the same time, default: 16
+            output(str): "dicts" (default) for a list of row dicts or "pandas" for a DataFrame
+            cache_ttl(float): Seconds a cached module result stays valid, default: fundamentals_cache_ttl, 0 to refetch
+
+        Returns:
+            Dict[str, Any]: Dictionary containing the table, e.g.
+            {
                 "success": True,
                 "data": {
-                    "symbol": symbol,
-                    "price": {
-                        "current": float(financial_data.get("currentPrice", {}).get("raw", 0)),
-                        "target": {
-                            "low": float(financial_data.get("targetLowPrice", {}).get("raw", 0)),
-                            "high": float(financial_data.get("targetHighPrice", {}).get("raw", 0)),
-                            "mean": float(financial_data.get("targetMeanPrice", {}).get("raw", 0)),
-                            "median": float(financial_data.get("targetMedianPrice", {}).get("raw", 0)),
+                    "columns": ["symbol", "info.market_cap", "info.pe_ratio", ..., "errors"],
+                    "rows": [                          # One row per symbol, in the order of symbols
+                        {
+                            "symbol": "AAPL",
+                            "info.market_cap": 2850000000000,      # Nested fields joined with "."
+                            "info.fifty_two_week.low": 148.5,
+                            "statistics.valuation_metrics.forward_pe": 28.4,
+                            "financials.price.current": 187.45,
+                            "errors": {}                           # Module -> error of the modules that failed
                         },
-                    },
-                    "recommendation": {
-                        "mean": float(financial_data.get("recommendationMean", {}).get("raw", 0)),
-                        "key": financial_data.get("recommendationKey", ""),
-                        "analysts_count": int(financial_data.get("numberOfAnalystOpinions", {}).get("raw", 0)),
-                    },
-                    "financial_metrics": {
-                        "total_cash": float(financial_data.get("totalCash", {}).get("raw", 0)),
-                        "cash_per_share": float(financial_data.get("totalCashPerShare", {}).get("raw", 0)),
-                        "total_debt": float(financial_data.get("totalDebt", {}).get("raw", 0)),
-                        "debt_to_equity": float(financial_data.get("debtToEquity", {}).get("raw", 0)),
-                        "current_ratio": float(financial_data.get("currentRatio", {}).get("raw", 0)),
-                        "quick_ratio": float(financial_data.get("quickRatio", {}).get("raw", 0)),
-                    },
-                    "profitability": {
-                        "gross_margin": float(financial_data.get("grossMargins", {}).get("raw", 0)),
-                        "operating_margin": float(financial_data.get("operatingMargins", {}).get("raw", 0)),
-                        "profit_margin": float(financial_data.get("profitMargins", {}).get("raw", 0)),
-                        "ebitda_margin": float(financial_data.get("ebitdaMargins", {}).get("raw", 0)),
-                    },
-                    "growth": {
-                        "revenue_growth": float(financial_data.get("revenueGrowth", {}).get("raw", 0)),
-                        "earnings_growth": float(financial_data.get("earningsGrowth", {}).get("raw", 0)),
-                    },
-                    "returns": {
-                        "return_on_assets": float(financial_data.get("returnOnAssets", {}).get("raw", 0)),
-                        "return_on_equity": float(financial_data.get("returnOnEquity", {}).get("raw", 0)),
-                    },
-                    "cash_flow": {
-                        "operating": float(financial_data.get("operatingCashflow", {}).get("raw", 0)),
-                        "free": float(financial_data.get("freeCashflow", {}).get("raw", 0)),
-                    },
-                    "currency": financial_data.get("financialCurrency", "USD"),
-                },
+                        {"symbol": "XXXX", "errors": {"info": "...", "statistics": "...", "financials": "..."}}
+                    ],
+                    "failed_symbols": [                # Symbols for which every module failed, with the errors
+                        {"symbol": "XXXX", "error": "info: ...; statistics: ...; financials: ..."}
+                    ]
+                }
             }
+            With output="pandas", "rows" is a DataFrame with these columns and missing fields as NaN.
+        """
+        try:
+            check_output(output, ("dicts", "pandas"))
+            modules = list(dict.fromkeys(modules or ("info", "statistics", "financials")))
+            for module in modules:
+                if module not in FUNDAMENTAL_MODULES:
+                    raise ValueError(f"Unsupported module: {module}, options: {', '.join(FUNDAMENTAL_MODULES)}")
+            if max_concurrency < 1:
+                raise ValueError("max_concurrency must be positive")
+            ttl = self.fundamentals_cache_ttl if cache_ttl is None else cache_ttl
+
+            unique_symbols = list(dict.fromkeys(symbols))
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            async def fetch(module: str, symbol: str) -> Dict[str, Any]:
+                key = (module, symbol)
+                cached = self._fundamentals_cache.get(key)
+                if cached is not None and ttl > 0 and cached[0] > time.monotonic():
+                    self._fundamentals_cache.move_to_end(key)
+                    return {"success": True, "data": cached[1]}
+                async with semaphore:
+                    try:
+                        result = await getattr(self, FUNDAMENTAL_MODULES[module])(symbol)
+                    except Exception as e:
+                        logger.error(f"Error occurred while getting {module} of stock {symbol}: {str(e)}")
+                        return {"success": False, "error": str(e)}
+                if result["success"] and ttl > 0:
+                    self._fundamentals_cache[key] = (time.monotonic() + ttl, result["data"])
+                    self._fundamentals_cache.move_to_end(key)
+                    while len(self._fundamentals_cache) > self.fundamentals_cache_size:
+                        self._fundamentals_cache.popitem(last=False)
+                return result
+
+            pairs = [(module, symbol) for symbol in unique_symbols for module in modules]
+            results = await asyncio.gather(*(fetch(module, symbol) for module, symbol in pairs))
+
+            rows: Dict[str, Dict[str, Any]] = {symbol: {"symbol": symbol} for symbol in unique_symbols}
+            errors: Dict[str, Dict[str, str]] = {symbol: {} for symbol in unique_symbols}
+            for (module, symbol), result in zip(pairs, results):
+                if result["success"]:
+                    _flatten(result["data"], module, rows[symbol])
+                else:
+                    errors[symbol][module] = result["error"]
+            for symbol, row in rows.items():
+                row["errors"] = errors[symbol]
+
+            failed_symbols = [
+                {"symbol": symbol, "error": "; ".join(f"{module}: {error}" for module, error in errors[symbol].items())}
+                for symbol in unique_symbols
+                if len(errors[symbol]) == len(modules)
+            ]
+            if unique_symbols and len(failed_symbols) == len(unique_symbols):
+                error_msg = "All stock fundamentals retrieval failed:\n" + "\n".join(
+                    f"{failed['symbol']}: {failed['error']}" for failed in failed_symbols
+                )
+                return {"success": False, "error": error_msg}
+
+            # Columns in order of first appearance, errors last
+            columns = list(dict.fromkeys(name for row in rows.values() for name in row if name != "errors")) + ["errors"]
+            table: Any = list(rows.values())
+            if output == "pandas":
+                # pandas 导入较慢，只在使用时导入
+                import pandas as pd
+
+                table = pd.DataFrame(table, columns=columns)
+            return {"success": True, "data": {"columns": columns, "rows": table, "failed_symbols": failed_symbols}}
 
         except Exception as e:
-            error_msg = f"Error occurred while getting stock financial data: {str(e)}"
-            logger.error(error_msg)
+            logger.error(f"Error occurred while batch getting stock fundamentals: {str(e)}")
             logger.exception(e)
-            return {"success": False, "error": error_msg}
+            return {"success": False, "error": str(e)}
+
+
+def _flatten(data: Dict[str, Any], prefix: str, row: Dict[str, Any]) -> None:
+    """Add the fields of a nested result to row as "prefix.key.subkey" columns, skipping its symbol"""
+    for key, value in data.items():
+        if key == "symbol" and prefix in FUNDAMENTAL_MODULES:
+            continue
+        name = f"{prefix}.{key}"
+        if isinstance(value, dict):
+            _flatten(value, name, row)
+        else:
+            row[name] = value